@@ -6,8 +6,11 @@ import random
 def add_sample_data(user_id):
     """Add sample transaction data for testing"""
     
-    transaction_model = TransactionModel(user_id=user_id)
-    category_model = CategoryModel(user_id=user_id)
+    # set_user_id converts to ObjectId (the constructors keep the raw string)
+    transaction_model = TransactionModel()
+    transaction_model.set_user_id(user_id)
+    category_model = CategoryModel()
+    category_model.set_user_id(user_id)
     
     # Categories for expenses and income
     expense_categories = [
@@ -45,6 +48,7 @@ def add_sample_data(user_id):
     
     # Add 50 sample transactions over the last 3 months
     today = datetime.now()
+    rows = []
     
     for i in range(50):
         # Random date in the last 90 days
@@ -83,24 +87,25 @@ def add_sample_data(user_id):
         
         description = random.choice(descriptions)
         
-        # Add transaction with error handling
-        try:
-            result = transaction_model.add_transaction(
-                transaction_type=transaction_type,
-                category=category,
-                amount=amount,
-                transaction_date=transaction_date,
-                description=description
-            )
-            
-            if result:
-                print(f"  ✓ Added {transaction_type}: ${amount} - {category}")
-        except ValueError as e:
-            print(f"  ❌ Error: {e}")
-        except Exception as e:
-            print(f"  ❌ Unexpected error: {e}")
+        rows.append({
+            "type": transaction_type,
+            "category": category,
+            "amount": amount,
+            "date": transaction_date,
+            "description": description
+        })
     
-    print(f"\n✅ Successfully added 50 sample transactions!")
+    # ✅ Add all transactions in one bulk call (1 validation query + insert_many)
+    results = transaction_model.add_transactions_bulk(rows)
+    
+    for row, result in zip(rows, results):
+        if result['success']:
+            print(f"  ✓ Added {row['type']}: ${row['amount']} - {row['category']}")
+        else:
+            print(f"  ❌ Error: {result['error']}")
+    
+    added = sum(1 for result in results if result['success'])
+    print(f"\n✅ Successfully added {added} sample transactions!")
     
     # Show statistics
     stats = transaction_model.get_statistics()
@@ -1,11 +1,19 @@
 import pandas as pd
 from datetime import datetime, timedelta
 from dataset import TransactionModel
+import config
 
 class FinanceAnalyzer:
     def __init__(self, 
-                 transaction_model: TransactionModel):
+                 transaction_model: TransactionModel,
+                 use_aggregation: bool = None):
         self.transaction_model = transaction_model
+
+        # aggregation mode: push filtering/grouping down to MongoDB
+        # instead of pulling every transaction into pandas
+        if use_aggregation is None:
+            use_aggregation = config.ANALYTICS_USE_AGGREGATION
+        self.use_aggregation = use_aggregation
     
     def get_transactions_dataframe(self):
         """Convert transactions to pandas DataFrame"""
@@ -20,6 +28,9 @@ class FinanceAnalyzer:
     
     def calculate_total_by_type(self, transaction_type, start_date=None, end_date=None):
         """Calculate total amount by transaction type"""
+        if self.use_aggregation:
+            return self._agg_total_by_type(transaction_type, start_date, end_date)
+
         if start_date and end_date:
             transactions = self.transaction_model.get_transactions_by_date_range(
                 start_date, end_date
@@ -32,6 +43,9 @@ class FinanceAnalyzer:
     
     def get_spending_by_category(self, start_date=None, end_date=None):
         """Get spending grouped by category"""
+        if self.use_aggregation:
+            return self._agg_spending_by_category(start_date, end_date)
+
         if start_date and end_date:
             transactions = self.transaction_model.get_transactions_by_date_range(
                 start_date, end_date
@@ -60,6 +74,9 @@ class FinanceAnalyzer:
         """Get monthly spending and income trend"""
         end_date = datetime.now()
         start_date = end_date - timedelta(days=months*30)
+
+        if self.use_aggregation:
+            return self._agg_monthly_trend(start_date, end_date)
         
         transactions = self.transaction_model.get_transactions_by_date_range(
             start_date, end_date
@@ -80,6 +97,8 @@ class FinanceAnalyzer:
     
     def get_daily_average(self):
         """Calculate daily average spending"""
+        if self.use_aggregation:
+            return self._agg_daily_average()
 
         # approach 1:
         transactions = self.transaction_model.get_transactions()
@@ -139,6 +158,9 @@ class FinanceAnalyzer:
     
     def get_statistics_summary(self):
         """Get comprehensive statistics summary"""
+        if self.use_aggregation:
+            return self._agg_statistics_summary()
+
         df = self.get_transactions_dataframe()
         
         if df.empty:
@@ -160,4 +182,165 @@ class FinanceAnalyzer:
         
         summary['net_balance'] = summary['total_income'] - summary['total_expenses']
         
-        return summary
\ No newline at end of file
+        return summary
+
+    # =============================================
+    # Aggregation mode (server-side $match/$group)
+    # =============================================
+
+    def _match_stage(self, start_date=None, end_date=None, transaction_type=None) -> dict:
+        """Build the $match stage, reusing TransactionModel query rules"""
+        filters = {}
+        if start_date and end_date:
+            filters["start_date"] = start_date
+            filters["end_date"] = end_date
+        if transaction_type:
+            filters["transaction_type"] = transaction_type
+        return {"$match": self.transaction_model._build_query(filters)}
+
+    def _aggregate(self, pipeline: list) -> list[dict]:
+        return list(self.transaction_model.collection.aggregate(pipeline))
+
+    def _agg_total_by_type(self, transaction_type, start_date=None, end_date=None):
+        pipeline = [
+            self._match_stage(start_date, end_date, transaction_type),
+            {"$group": {"_id": None, "total": {"$sum": "$amount"}}}
+        ]
+        result = self._aggregate(pipeline)
+        return result[0]["total"] if result else 0
+
+    def _agg_spending_by_category(self, start_date=None, end_date=None):
+        pipeline = [
+            self._match_stage(start_date, end_date, "Expense"),
+            {"$group": {
+                "_id": "$category",
+                "Total": {"$sum": "$amount"},
+                "Count": {"$sum": 1},
+                "Average": {"$avg": "$amount"}
+            }},
+            {"$sort": {"Total": -1}}
+        ]
+        result = self._aggregate(pipeline)
+
+        if not result:
+            return pd.DataFrame()
+
+        category_spending = pd.DataFrame(result).rename(columns={"_id": "Category"})
+        return category_spending[['Category', 'Total', 'Count', 'Average']]
+
+    @staticmethod
+    def _full_month_bounds(start_date, end_date):
+        """First day of the first whole month and of the (partial) month of end_date"""
+        first_full = datetime(start_date.year, start_date.month, 1)
+        if first_full < start_date:
+            first_full = datetime(first_full.year + first_full.month // 12, first_full.month % 12 + 1, 1)
+        after_last_full = datetime(end_date.year, end_date.month, 1)
+        return first_full, after_last_full
+
+    def _agg_monthly_trend(self, start_date, end_date):
+        rows = []
+        match_stage = self._match_stage(start_date, end_date)
+
+        # Whole months come from the monthly_rollups collection,
+        # only the partial months at both ends are aggregated from raw transactions
+        first_full, after_last_full = self._full_month_bounds(start_date, end_date)
+        if config.USE_MONTHLY_ROLLUPS and first_full < after_last_full:
+            rows.extend(self.transaction_model.rollup_model.get_monthly_totals(
+                self.transaction_model.user_id, first_full, after_last_full
+            ))
+            match_stage["$match"]["$and"].append({
+                "$or": [
+                    {"date": {"$lt": first_full}},
+                    {"date": {"$gte": after_last_full}}
+                ]
+            })
+
+        pipeline = [
+            match_stage,
+            {"$group": {
+                "_id": {
+                    "month": {"$dateTrunc": {"date": "$date", "unit": "month"}},
+                    "type": "$type"
+                },
+                "amount": {"$sum": "$amount"}
+            }}
+        ]
+        rows.extend(
+            {"month": row["_id"]["month"], "type": row["_id"]["type"], "amount": row["amount"]}
+            for row in self._aggregate(pipeline)
+        )
+
+        if not rows:
+            return pd.DataFrame()
+
+        df = pd.DataFrame(rows)[['month', 'type', 'amount']]
+        df['month'] = pd.to_datetime(df['month'])
+
+        # same shape as the pandas path: month index, one column per type
+        monthly_data = df.groupby(['month', 'type'])['amount'].sum().unstack(fill_value=0)
+        return monthly_data
+
+    def _agg_daily_average(self):
+        pipeline = [
+            self._match_stage(transaction_type="Expense"),
+            {"$group": {
+                "_id": None,
+                "total": {"$sum": "$amount"},
+                "first_date": {"$min": "$date"},
+                "last_date": {"$max": "$date"}
+            }}
+        ]
+        result = self._aggregate(pipeline)
+
+        if not result:
+            return 0
+
+        row = result[0]
+        date_range = (row["last_date"] - row["first_date"]).days + 1
+        return row["total"] / date_range if date_range > 0 else 0
+
+    def _agg_median_expense(self, expense_count: int) -> float:
+        """Exact median via sort + skip on the server ($median needs MongoDB 7)"""
+        pipeline = [
+            self._match_stage(transaction_type="Expense"),
+            {"$sort": {"amount": 1}},
+            {"$skip": (expense_count - 1) // 2},
+            {"$limit": 2 - expense_count % 2},
+            {"$project": {"_id": 0, "amount": 1}}
+        ]
+        middle = [row["amount"] for row in self._aggregate(pipeline)]
+        return sum(middle) / len(middle) if middle else 0
+
+    def _agg_statistics_summary(self):
+        pipeline = [
+            self._match_stage(),
+            {"$group": {
+                "_id": "$type",
+                "total": {"$sum": "$amount"},
+                "average": {"$avg": "$amount"},
+                "count": {"$sum": 1}
+            }}
+        ]
+        by_type = {row["_id"]: row for row in self._aggregate(pipeline)}
+
+        if not by_type:
+            return {}
+
+        expenses = by_type.get('Expense', {})
+        income = by_type.get('Income', {})
+        expense_count = expenses.get("count", 0)
+
+        summary = {
+            'total_expenses': expenses.get("total", 0),
+            'total_income': income.get("total", 0),
+            'avg_expense': expenses.get("average", 0),
+            'avg_income': income.get("average", 0),
+            'median_expense': self._agg_median_expense(expense_count) if expense_count else 0,
+            'transaction_count': sum(row["count"] for row in by_type.values()),
+            'expense_count': expense_count,
+            'income_count': income.get("count", 0),
+        }
+
+        summary['net_balance'] = summary['total_income'] - summary['total_expenses']
+
+        return summary
@@ -7,12 +7,13 @@ import config
 from language_manager import LanguageManager, t
 
 # import model
-from dataset import (
-    CategoryModel,
-    TransactionModel
-)
 from dataset.user_model import UserModel
-from dataset.budget_model import BudgetModel
+from dataset.model_context import ModelContext
+from dataset import request_memo
+from dataset.index_manager import IndexManager
+from metrics import MetricsRegistry, start_metrics_server
+import profiler
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 
 # import view module
 from view import (
@@ -22,28 +23,64 @@ from view import (
     render_budgets
 )
 from view.user_view_simple import render_user_profile
+from view.admin_view import render_admin
+from view.profile_view import render_profile_overlay
 from view.dashboard_view import render_dashboard
 from analytics.analyzer import FinanceAnalyzer
 
 # Initialize language
 LanguageManager.initialize()
 
-# initialize models
+# the user model has no per-user state -> one instance per process
 @st.cache_resource
-def init_models():
-    """Initialize and cached models"""
-    return {
-        "category": CategoryModel(),
-        "transaction": TransactionModel(),
-        "user": UserModel(),
-        "budget": BudgetModel()
-    }
+def init_user_model():
+    """Initialize and cache the user model"""
+    return UserModel()
+
+def get_session_models(user_id: str) -> ModelContext:
+    """
+    Models bound to the logged-in user, kept in this session only.
+    Never cached across sessions: a shared model's user_id could be
+    overwritten by another session's rerun in the middle of a query.
+    """
+    context = st.session_state.get('model_context')
+    if context is None or not context.is_for(user_id):
+        context = ModelContext(user_id)
+        st.session_state['model_context'] = context
+    return context
+
+# create missing indexes once per process
+@st.cache_resource
+def init_indexes():
+    """Apply the declarative index spec"""
+    if config.AUTO_APPLY_INDEXES:
+        IndexManager().apply()
+    return True
+
+init_indexes()
+
+# Prometheus /metrics endpoint, one background thread per process
+@st.cache_resource
+def init_metrics_server():
+    """Start the metrics HTTP endpoint"""
+    if config.METRICS_ENABLED:
+        start_metrics_server()
+    return True
+
+init_metrics_server()
+
+# count this session for finance_active_sessions
+script_ctx = get_script_run_ctx()
+if script_ctx is not None:
+    MetricsRegistry().touch_session(script_ctx.session_id)
+
+# wrap model / analyzer / visualizer methods with timers (once per process)
+profiler.install()
 
-# initialize session per user
-if "models" not in st.session_state:
-    st.session_state['models'] = init_models()
+# identical model reads within this rerun hit MongoDB once (writes clear the memo)
+request_memo.start_run()
 
-models = st.session_state['models']
+user_model: UserModel = init_user_model()
 
 # Page configuration
 st.set_page_config(
@@ -164,17 +201,14 @@ else:
         st.rerun()
     
     # Login to MongoDB
-    user_model: UserModel = models['user']
     try:
         mongo_user_id = user_model.login(email)
     except Exception as e:
         st.error(f"Error during user login: {e}")
         st.stop()
 
-    # set user_id for models
-    models['category'].set_user_id(mongo_user_id)
-    models['budget'].set_user_id(mongo_user_id)
-    models['transaction'].set_user_id(mongo_user_id)
+    # models bound to this user for this session only
+    models = get_session_models(mongo_user_id)
 
     # Create user dict for display
     user = {
@@ -188,7 +222,7 @@ else:
     render_user_profile(user_model, user)
 
     # init analyzer
-    analyzer_model = FinanceAnalyzer(models['transaction'])
+    analyzer_model = FinanceAnalyzer(models.transaction)
 
     # =============================================
     # 2. Navigation
@@ -202,6 +236,11 @@ else:
         t("nav_budgets")
     ]
     
+    # monitoring page only for config.ADMIN_EMAILS
+    is_admin = email in config.ADMIN_EMAILS
+    if is_admin:
+        nav_options.append(t("nav_admin"))
+    
     page = st.sidebar.radio(
         "Navigation",
         nav_options,
@@ -213,7 +252,8 @@ else:
         t("nav_home"): "Home",
         t("nav_categories"): "Category",
         t("nav_transactions"): "Transaction",
-        t("nav_budgets"): "Budget"
+        t("nav_budgets"): "Budget",
+        t("nav_admin"): "Admin"
     }
     page = page_map.get(page, "Home")
     
@@ -246,28 +286,46 @@ else:
         </style>
     """, unsafe_allow_html=True)
 
-    # =============================================
-    # 3. Router
-    # =============================================
+    # Render profiler: PROFILER_MODE=on or ?profile=1
+    if profiler.is_requested(st.query_params):
+        profiler.start_rerun(page)
     
-    if page == "Home":
-        render_home(transaction_model=models['transaction'], 
-                   category_model=models['category'])
-
-    elif page == "Category":
-        category_model = models['category']
-        render_categories(category_model=category_model)
-
-    elif page == "Transaction":
-        category_model = models['category']
-        transaction_model = models['transaction']
-        render_transactions(transaction_model=transaction_model, category_model=category_model)
-
-    elif page == "Budget":
-        budget_model = models['budget']
-        transaction_model = models['transaction']
-        category_model = models['category']
-        render_budgets(budget_model=budget_model, 
-                      transaction_model=transaction_model,
-                      category_model=category_model)
+    try:
+        # =============================================
+        # 3. Router
+        # =============================================
+    
+        if page == "Home":
+            render_home(transaction_model=models.transaction, 
+                       category_model=models.category)
+
+        elif page == "Category":
+            category_model = models.category
+            render_categories(category_model=category_model)
+
+        elif page == "Transaction":
+            category_model = models.category
+            transaction_model = models.transaction
+            render_transactions(transaction_model=transaction_model, category_model=category_model)
+
+        elif page == "Budget":
+            budget_model = models.budget
+            transaction_model = models.transaction
+            category_model = models.category
+            render_budgets(budget_model=budget_model, 
+                          transaction_model=transaction_model,
+                          category_model=category_model)
+
+        elif page == "Admin" and is_admin:
+            render_admin()
+
+    finally:
+        # st.rerun()/st.stop() raise through the router: always stop the profiler
+        # so an interrupted rerun does not leave cProfile attached to this thread
+        memo_stats = request_memo.finish_run()
+        profile_summary = profiler.finish_rerun()
+
+    # DB / pandas / Plotly breakdown of this rerun
+    if profile_summary:
+        render_profile_overlay(profile_summary, memo_stats)
 
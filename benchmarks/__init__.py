@@ -0,0 +1 @@
+# Benchmarks (run against a local mongod, e.g. MONGO_URI=mongodb://localhost:27017/)
@@ -0,0 +1,104 @@
+"""
+Benchmark peak RSS of exporting a large transaction history:
+get_transactions() + csv (whole list in memory) vs the streaming
+TransactionExporter (CSV and, if pyarrow is installed, Parquet).
+
+Each mode runs in a fresh child process so ru_maxrss is the peak of that
+mode alone.
+
+Usage:
+    python -m benchmarks.bench_export
+    python -m benchmarks.bench_export --size 100000 --batch-size 2000
+"""
+
+import argparse
+import csv
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from bson.objectid import ObjectId
+from dataset.transaction_model import TransactionModel
+from dataset.transaction_exporter import TransactionExporter, EXPORT_FIELDS, parquet_available
+from benchmarks.bench_statistics import seed_transactions
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (ru_maxrss is KB on Linux, bytes on macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _export_list(transaction_model, path, batch_size):
+    """The pre-export way: materialize everything, then write"""
+    transactions = transaction_model.get_transactions()
+    with open(path, "w", encoding="utf-8", newline="") as stream:
+        writer = csv.writer(stream)
+        writer.writerow(EXPORT_FIELDS)
+        for trans in transactions:
+            writer.writerow([trans.get(field) for field in EXPORT_FIELDS])
+    return len(transactions)
+
+
+def _export_csv(transaction_model, path, batch_size):
+    with open(path, "w", encoding="utf-8", newline="") as stream:
+        return TransactionExporter(transaction_model, batch_size).write_csv(stream)
+
+
+def _export_parquet(transaction_model, path, batch_size):
+    return TransactionExporter(transaction_model, batch_size).write_parquet(path)
+
+
+MODES = {
+    "list + csv": _export_list,
+    "stream csv": _export_csv,
+    "stream parquet": _export_parquet,
+}
+
+
+def _run_mode(mode, user_id, batch_size, queue):
+    transaction_model = TransactionModel()
+    transaction_model.set_user_id(user_id)
+    baseline = _peak_rss_mb()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "export")
+        start = time.perf_counter()
+        count = MODES[mode](transaction_model, path, batch_size)
+        elapsed = time.perf_counter() - start
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+
+    queue.put((count, elapsed, baseline, _peak_rss_mb(), size_mb))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark export peak memory")
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    modes = [mode for mode in MODES if mode != "stream parquet" or parquet_available()]
+    user_id = ObjectId()
+    transaction_model = TransactionModel()
+    transaction_model.set_user_id(str(user_id))
+
+    try:
+        print(f"Seeding {args.size:,} transactions...")
+        seed_transactions(transaction_model, user_id, args.size)
+
+        print(f"{'mode':>15} | {'rows':>10} | {'time (s)':>9} | {'peak RSS (MB)':>14} | {'export RSS (MB)':>16} | {'file (MB)':>10}")
+        print("-" * 90)
+
+        context = multiprocessing.get_context("spawn")
+        for mode in modes:
+            queue = context.Queue()
+            process = context.Process(target=_run_mode, args=(mode, str(user_id), args.batch_size, queue))
+            process.start()
+            count, elapsed, baseline, peak, size_mb = queue.get()
+            process.join()
+
+            print(f"{mode:>15} | {count:>10,} | {elapsed:>9.1f} | {peak:>14,.1f} | {peak - baseline:>16,.1f} | {size_mb:>10,.1f}")
+    finally:
+        transaction_model.collection.delete_many({"user_id": user_id})
@@ -0,0 +1,96 @@
+"""
+Benchmark TransactionModel.get_statistics: $group pipeline vs the old
+"load every transaction and loop in Python" implementation.
+
+Seeds a throwaway user at each size, times both paths and removes the data.
+
+Usage:
+    python -m benchmarks.bench_statistics
+    python -m benchmarks.bench_statistics --sizes 10000 100000 --repeat 3
+"""
+
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from bson.objectid import ObjectId
+from dataset.transaction_model import TransactionModel
+
+
+def seed_transactions(transaction_model: TransactionModel, user_id: ObjectId, count: int, chunk_size: int = 10000):
+    """Insert `count` synthetic transactions for one user with insert_many"""
+    now = datetime.now()
+    for offset in range(0, count, chunk_size):
+        docs = []
+        for _ in range(min(chunk_size, count - offset)):
+            trans_type = random.choice(["Expense", "Income"])
+            created_at = now - timedelta(minutes=random.randint(0, 5 * 365 * 24 * 60))
+            docs.append({
+                "type": trans_type,
+                "category": "Food & Dining" if trans_type == "Expense" else "Salary",
+                "amount": round(random.uniform(1, 5000), 2),
+                "date": created_at,
+                "description": "benchmark",
+                "created_at": created_at,
+                "last_modified": created_at,
+                "user_id": user_id
+            })
+        transaction_model.collection.insert_many(docs, ordered=False)
+
+
+def legacy_get_statistics(transaction_model: TransactionModel) -> dict:
+    """The previous implementation: fetch everything, sum in Python"""
+    all_trans = transaction_model.get_all_transactions()
+    stats = {'total_income': 0.0, 'total_expense': 0.0, 'income_count': 0,
+             'expense_count': 0, 'total_transactions': len(all_trans), 'balance': 0.0}
+    for trans in all_trans:
+        if trans.get('type') == 'Income':
+            stats['total_income'] += trans.get('amount', 0)
+            stats['income_count'] += 1
+        elif trans.get('type') == 'Expense':
+            stats['total_expense'] += trans.get('amount', 0)
+            stats['expense_count'] += 1
+    stats['balance'] = stats['total_income'] - stats['total_expense']
+    return stats
+
+
+def time_call(func, repeat: int) -> float:
+    """Median wall time of `repeat` calls, in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark get_statistics")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'transactions':>14} | {'python loop (ms)':>17} | {'$group (ms)':>12} | {'speedup':>8}")
+    print("-" * 62)
+
+    for size in args.sizes:
+        user_id = ObjectId()
+        transaction_model = TransactionModel()
+        transaction_model.set_user_id(str(user_id))
+
+        try:
+            seed_transactions(transaction_model, user_id, size)
+
+            # same numbers from both paths
+            new_stats = transaction_model.get_statistics()
+            old_stats = legacy_get_statistics(transaction_model)
+            assert new_stats['total_transactions'] == old_stats['total_transactions']
+            assert abs(new_stats['balance'] - old_stats['balance']) < 0.01
+
+            legacy_ms = time_call(lambda: legacy_get_statistics(transaction_model), args.repeat)
+            group_ms = time_call(transaction_model.get_statistics, args.repeat)
+
+            print(f"{size:>14,} | {legacy_ms:>17,.1f} | {group_ms:>12,.1f} | {legacy_ms / group_ms:>7.1f}x")
+        finally:
+            transaction_model.collection.delete_many({"user_id": user_id})
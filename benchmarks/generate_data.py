@@ -0,0 +1,364 @@
+"""
+Synthetic data generator for benchmarks.
+
+Builds realistic finance data with vectorized NumPy sampling and bulk-loads
+it with insert_many:
+    - N users (email user000000@<domain>), default categories plus a long
+      tail of custom expense categories
+    - M transactions per user over the last `months` months: a monthly
+      salary, occasional other income, and expenses whose frequency follows
+      a seasonal curve (December / summer peaks) and whose categories follow
+      a Zipf-like distribution
+    - one budget per month for each user's top expense categories, with the
+      'spent' counter computed from the generated transactions
+
+Writes go straight to the collections (no per-row validation); budget
+counters are filled in here and monthly rollups are rebuilt at the end.
+The same seed and --end month produce the same data (ObjectIds aside).
+
+Usage:
+    python -m benchmarks.generate_data --users 100 --transactions 1000
+    python -m benchmarks.generate_data --users 10000 --transactions 1000 --seed 7
+    python -m benchmarks.generate_data --purge
+"""
+
+import argparse
+import re
+import time
+from datetime import datetime
+import numpy as np
+import config
+from dataset.database_manager import DatabaseManager
+from dataset.category_model import DEFAULT_CATEGORIES_VERSION
+from dataset.category_cache import CategoryCache
+from dataset.request_memo import bump_data_version
+from dataset.rollup_model import MonthlyRollupModel
+
+
+DEFAULT_DOMAIN = "synthetic.local"
+
+# Relative number of expenses per calendar month (Jan..Dec)
+SEASONALITY = np.array([0.9, 0.85, 0.95, 1.0, 1.0, 1.05, 1.15, 1.15, 0.95, 1.0, 1.1, 1.4])
+
+# Typical expense amount per default category (median of a lognormal)
+EXPENSE_BASE_AMOUNTS = {
+    "Food & Dining": 25,
+    "Transportation": 15,
+    "Utilities": 120,
+    "Entertainment": 40,
+    "Healthcare": 80,
+    "Shopping": 60,
+    "Education": 150,
+    "Travel": 300,
+    "Personal Care": 30,
+    "Gifts & Donations": 50,
+}
+CUSTOM_BASE_AMOUNT = 40
+
+# Income other than the monthly salary, as a share of non-salary transactions
+OTHER_INCOME_SHARE = 0.05
+
+
+class SyntheticDataGenerator:
+    """
+    Generates and bulk-loads synthetic users, categories, transactions and budgets.
+
+    Args:
+        seed: Seed of the NumPy generator
+        months: Months of history per user
+        end: Last month of the history (default: current month)
+        custom_categories: Extra expense categories per user (long tail)
+        budgets_per_month: Budgets per user per month (top expense categories)
+        chunk_size: Documents per insert_many call
+        domain: Email domain of the generated users (used by purge)
+    """
+
+    def __init__(
+        self,
+        seed: int = 42,
+        months: int = 24,
+        end: datetime = None,
+        custom_categories: int = 20,
+        budgets_per_month: int = 5,
+        chunk_size: int = 10000,
+        domain: str = DEFAULT_DOMAIN
+    ):
+        self.rng = np.random.default_rng(seed)
+        self.db_manager = DatabaseManager()
+        self.chunk_size = chunk_size
+        self.domain = domain
+
+        end = end or datetime.now()
+        end_month = np.datetime64(f"{end.year:04d}-{end.month:02d}", "M")
+        self.month_starts = np.arange(end_month - months + 1, end_month + 1)
+        self.month_seconds = (
+            (self.month_starts + 1).astype("datetime64[s]") - self.month_starts.astype("datetime64[s]")
+        ).astype(np.int64)
+        # dates sampled in the current month must not be in the future
+        self.now = np.datetime64(datetime.now(), "s")
+
+        self.expense_categories = config.DEFAULT_CATEGORIES_EXPENSE + \
+            [f"Custom {i + 1:02d}" for i in range(custom_categories)]
+        self.income_categories = list(config.DEFAULT_CATEGORIES_INCOME)
+        self.base_amounts = np.array(
+            [EXPENSE_BASE_AMOUNTS.get(name, CUSTOM_BASE_AMOUNT) for name in self.expense_categories],
+            dtype=float
+        )
+        self.budgets_per_month = min(budgets_per_month, len(self.expense_categories))
+
+        # Zipf-like weights; each user gets its own ranking of the categories
+        ranks = np.arange(1, len(self.expense_categories) + 1)
+        self.rank_weights = 1.0 / ranks ** 1.1
+        self.rank_weights /= self.rank_weights.sum()
+
+        # expense month weights follow the calendar month of each month start
+        calendar_months = self.month_starts.astype(int) % 12
+        self.month_weights = SEASONALITY[calendar_months] / SEASONALITY[calendar_months].sum()
+
+    # =============================================
+    # Sampling
+    # =============================================
+
+    def _sample_dates(self, month_index: np.ndarray) -> np.ndarray:
+        """Uniform instant inside each given month (clipped to now)"""
+        offsets = (self.rng.random(len(month_index)) * self.month_seconds[month_index]).astype(np.int64)
+        dates = self.month_starts[month_index].astype("datetime64[s]") + offsets.astype("timedelta64[s]")
+        return np.minimum(dates, self.now)
+
+    def _user_transactions(self, user_id, count: int):
+        """
+        Sample one user's transactions.
+
+        Returns:
+            (documents, budget documents)
+        """
+        n_months = len(self.month_starts)
+
+        # salary on the 25th of each month (most recent months if count is small)
+        n_salary = min(count, n_months)
+        salary_months = np.arange(n_months - n_salary, n_months)
+        salary = self.rng.lognormal(np.log(3000), 0.4)
+        salary_amounts = salary * self.rng.normal(1.0, 0.02, n_salary)
+        salary_dates = np.minimum(
+            self.month_starts[salary_months].astype("datetime64[s]") + np.timedelta64(24 * 86400 + 9 * 3600, "s"),
+            self.now
+        )
+
+        # other income and expenses
+        n_rest = count - n_salary
+        is_income = self.rng.random(n_rest) < OTHER_INCOME_SHARE
+        n_income = int(is_income.sum())
+        n_expense = n_rest - n_income
+
+        income_months = self.rng.integers(0, n_months, n_income)
+        income_categories = self.rng.integers(1, len(self.income_categories), n_income)  # not Salary
+        income_amounts = self.rng.lognormal(np.log(400), 0.9, n_income)
+
+        category_order = self.rng.permutation(len(self.expense_categories))
+        probabilities = np.empty(len(self.expense_categories))
+        probabilities[category_order] = self.rank_weights
+        expense_months = self.rng.choice(n_months, n_expense, p=self.month_weights)
+        expense_categories = self.rng.choice(len(self.expense_categories), n_expense, p=probabilities)
+        # rounded before the budgets' spent is summed from them, as stored
+        expense_amounts = np.round(self.base_amounts[expense_categories] * self.rng.lognormal(0, 0.6, n_expense), 2)
+
+        dates = np.concatenate([
+            salary_dates,
+            self._sample_dates(income_months),
+            self._sample_dates(expense_months)
+        ]).astype("datetime64[ms]").tolist()
+        amounts = np.concatenate([np.round(salary_amounts, 2), np.round(income_amounts, 2), expense_amounts]).tolist()
+        types = ["Income"] * (n_salary + n_income) + ["Expense"] * n_expense
+        categories = ["Salary"] * n_salary + \
+            [self.income_categories[i] for i in income_categories] + \
+            [self.expense_categories[i] for i in expense_categories]
+
+        documents = [
+            {
+                "type": trans_type,
+                "category": category,
+                "amount": amount,
+                "date": date,
+                "description": "synthetic",
+                "created_at": date,
+                "last_modified": date,
+                "user_id": user_id
+            }
+            for trans_type, category, amount, date in zip(types, categories, amounts, dates)
+        ]
+
+        # budgets: top categories every month, amount around the expected monthly spend
+        n_categories = len(self.expense_categories)
+        spent = np.bincount(
+            expense_months * n_categories + expense_categories,
+            weights=expense_amounts,
+            minlength=n_months * n_categories
+        ).reshape(n_months, n_categories)
+        top = category_order[:self.budgets_per_month]
+        expected = n_expense * probabilities[top] * self.base_amounts[top] * np.exp(0.18) / n_months
+        budget_amounts = np.round(expected * self.rng.uniform(0.8, 1.3, len(top)), -1)
+
+        now = datetime.now()
+        budgets = []
+        for month_index, month_start in enumerate(self.month_starts.astype(object)):
+            for category_index, amount in zip(top, budget_amounts):
+                budgets.append({
+                    "user_id": user_id,
+                    "category": self.expense_categories[category_index],
+                    "amount": max(float(amount), 10.0),
+                    "month": month_start.month,
+                    "year": month_start.year,
+                    "is_active": True,
+                    "spent": round(float(spent[month_index, category_index]), 2),
+                    "created_at": now,
+                    "last_modified": now
+                })
+
+        return documents, budgets
+
+    # =============================================
+    # Loading
+    # =============================================
+
+    def _insert(self, collection_key: str, documents: list):
+        collection = self.db_manager.get_collection(config.COLLECTIONS[collection_key])
+        for offset in range(0, len(documents), self.chunk_size):
+            collection.insert_many(documents[offset:offset + self.chunk_size], ordered=False)
+
+    def _category_documents(self, user_id, now: datetime) -> list:
+        defaults = [("Expense", name) for name in self.expense_categories] + \
+                   [("Income", name) for name in self.income_categories]
+        return [
+            {"type": category_type, "name": name, "user_id": user_id, "created_at": now, "last_modified": now}
+            for category_type, name in defaults
+        ]
+
+    def generate(self, users: int, transactions_per_user: int, user_batch: int = 100,
+                 start_index: int = 0, rebuild_rollups: bool = True) -> dict:
+        """
+        Generate and insert users with their categories, transactions and budgets.
+
+        Args:
+            users: Number of users
+            transactions_per_user: Transactions per user
+            user_batch: Users generated and inserted together
+            start_index: First email number (to add users to an existing set)
+            rebuild_rollups: Rebuild monthly_rollups of the generated users (other users are untouched)
+
+        Returns:
+            dict with users, transactions, budgets, categories, seconds and user_ids
+        """
+        started = time.perf_counter()
+        totals = {"users": 0, "transactions": 0, "budgets": 0, "categories": 0}
+        user_ids = []
+
+        for batch_start in range(0, users, user_batch):
+            now = datetime.now()
+            batch = range(start_index + batch_start, start_index + min(batch_start + user_batch, users))
+            user_docs = [
+                {
+                    "email": f"user{i:06d}@{self.domain}",
+                    "created_at": now,
+                    "last_modified": now,
+                    "is_activate": True,
+                    "defaults_version": DEFAULT_CATEGORIES_VERSION
+                }
+                for i in batch
+            ]
+            self._insert("user", user_docs)
+            user_ids.extend(user["_id"] for user in user_docs)
+
+            transactions, budgets, categories = [], [], []
+            for user in user_docs:
+                user_transactions, user_budgets = self._user_transactions(user["_id"], transactions_per_user)
+                transactions.extend(user_transactions)
+                budgets.extend(user_budgets)
+                categories.extend(self._category_documents(user["_id"], now))
+
+            self._insert("category", categories)
+            self._insert("transaction", transactions)
+            self._insert("budget", budgets)
+
+            totals["users"] += len(user_docs)
+            totals["transactions"] += len(transactions)
+            totals["budgets"] += len(budgets)
+            totals["categories"] += len(categories)
+            print(f"  {totals['users']:,}/{users:,} users, {totals['transactions']:,} transactions")
+
+        # raw inserts bypass the model writes that bump data_version
+        bump_data_version(user_ids)
+
+        if rebuild_rollups:
+            rollup_model = MonthlyRollupModel()
+            for user_id in user_ids:
+                rollup_model.rebuild(user_id=user_id)
+
+        totals["seconds"] = time.perf_counter() - started
+        totals["user_ids"] = user_ids
+        return totals
+
+    def purge(self) -> dict:
+        """Delete every generated user (by email domain) and all their data"""
+        users = self.db_manager.get_collection(config.COLLECTIONS["user"])
+        user_ids = [user["_id"] for user in users.find({"email": {"$regex": f"@{re.escape(self.domain)}$"}}, {"_id": 1})]
+
+        counts = {}
+        for collection_key in ("transaction", "budget", "category", "monthly_rollup"):
+            collection = self.db_manager.get_collection(config.COLLECTIONS[collection_key])
+            counts[collection_key] = 0
+            for offset in range(0, len(user_ids), 1000):
+                result = collection.delete_many({"user_id": {"$in": user_ids[offset:offset + 1000]}})
+                counts[collection_key] += result.deleted_count
+        counts["user"] = users.delete_many({"_id": {"$in": user_ids}}).deleted_count if user_ids else 0
+
+        for user_id in user_ids:
+            CategoryCache().invalidate(user_id)
+        return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic users and transactions")
+    parser.add_argument("--users", type=int, default=100, help="Number of users")
+    parser.add_argument("--transactions", type=int, default=1000, help="Transactions per user")
+    parser.add_argument("--months", type=int, default=24, help="Months of history")
+    parser.add_argument("--end", help="Last month of history, YYYY-MM (default: current month)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--custom-categories", type=int, default=20, help="Extra expense categories per user")
+    parser.add_argument("--budgets-per-month", type=int, default=5, help="Budgets per user per month")
+    parser.add_argument("--user-batch", type=int, default=100, help="Users generated per batch")
+    parser.add_argument("--start-index", type=int, default=0, help="First user number")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="Documents per insert_many")
+    parser.add_argument("--domain", default=DEFAULT_DOMAIN, help="Email domain of generated users")
+    parser.add_argument("--skip-rollups", action="store_true", help="Do not rebuild monthly rollups")
+    parser.add_argument("--purge", action="store_true", help="Delete previously generated users and exit")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🧪 SYNTHETIC DATA GENERATOR")
+    print("=" * 60)
+
+    generator = SyntheticDataGenerator(
+        seed=args.seed,
+        months=args.months,
+        end=datetime.strptime(args.end, "%Y-%m") if args.end else None,
+        custom_categories=args.custom_categories,
+        budgets_per_month=args.budgets_per_month,
+        chunk_size=args.chunk_size,
+        domain=args.domain
+    )
+
+    if args.purge:
+        counts = generator.purge()
+        print("🗑️  Deleted: " + ", ".join(f"{count:,} {name}" for name, count in counts.items()))
+    else:
+        totals = generator.generate(
+            users=args.users,
+            transactions_per_user=args.transactions,
+            user_batch=args.user_batch,
+            start_index=args.start_index,
+            rebuild_rollups=not args.skip_rollups
+        )
+        rate = totals["transactions"] / totals["seconds"] if totals["seconds"] else 0
+        print(f"✅ {totals['users']:,} users, {totals['transactions']:,} transactions, "
+              f"{totals['budgets']:,} budgets in {totals['seconds']:.1f}s ({rate:,.0f} transactions/s)")
+    print("=" * 60)
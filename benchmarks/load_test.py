@@ -0,0 +1,412 @@
+"""
+Concurrent-session load test for the Streamlit app.
+
+Starts `streamlit run app.py` (or targets --url) and drives N simulated
+browser sessions over the Streamlit websocket protocol: each session logs
+in, then loops home -> transactions -> add transaction -> budgets ->
+categories -> rename category. Every step is one rerun request; its latency
+is measured from sending the BackMsg until script_finished (add transaction
+includes the view's 1.5s success pause before st.rerun()).
+
+For each N it reports throughput (reruns/s), rerun latency percentiles,
+the app process RSS, pooled connections (from the /metrics endpoint) and
+MongoDB's connections.current.
+
+Session users are seeded with benchmarks.generate_data (so pages render
+real histories) and purged at the end.
+
+Usage:
+    python -m benchmarks.load_test --sessions 1 5 10 25 50
+    python -m benchmarks.load_test --sessions 10 --iterations 5 --json load.json
+    python -m benchmarks.load_test --url ws://127.0.0.1:8501 --sessions 10   # running app
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from tornado.websocket import websocket_connect
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+import config
+from dataset.database_manager import DatabaseManager
+from dataset.rollup_model import MonthlyRollupModel
+from benchmarks.generate_data import SyntheticDataGenerator
+
+
+LOADTEST_DOMAIN = "loadtest.local"
+
+# Order of the sidebar navigation radio in app.py
+NAV_HOME, NAV_CATEGORIES, NAV_TRANSACTIONS, NAV_BUDGETS = range(4)
+
+
+def percentile(values: list, fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+# =============================================
+# Simulated browser session
+# =============================================
+
+class StreamlitSession:
+    """
+    Minimal Streamlit websocket client: sends rerun requests with widget
+    states and collects the elements of each run, like the frontend does.
+    Widget values persist across reruns; button triggers are sent once.
+    """
+
+    def __init__(self, url: str, timeout: float):
+        self.url = url.rstrip("/") + "/_stcore/stream"
+        self.timeout = timeout
+        self.connection = None
+        self.widget_values = {}   # widget id -> (value field, value)
+        self.elements = []        # elements of the last run
+        self.message_cache = {}   # ForwardMsg hash -> message (for ref_hash messages)
+        self.exceptions = 0
+
+    async def connect(self) -> float:
+        self.connection = await websocket_connect(self.url)
+        return await self.rerun()
+
+    async def close(self):
+        if self.connection is not None:
+            self.connection.close()
+
+    async def rerun(self, values: dict = None, trigger: str = None) -> float:
+        """
+        Send a rerun with the persisted widget values (+ `values` and a one-shot
+        `trigger` button id) and wait until the script finishes.
+
+        Returns:
+            Seconds until script_finished (including reruns started by st.rerun())
+        """
+        self.widget_values.update(values or {})
+
+        message = BackMsg()
+        client_state = message.rerun_script
+        client_state.query_string = ""
+        client_state.page_script_hash = ""
+        for widget_id, (field, value) in self.widget_values.items():
+            state = client_state.widget_states.widgets.add()
+            state.id = widget_id
+            setattr(state, field, value)
+        if trigger:
+            state = client_state.widget_states.widgets.add()
+            state.id = trigger
+            state.trigger_value = True
+
+        start = time.perf_counter()
+        await self.connection.write_message(message.SerializeToString(), binary=True)
+        await asyncio.wait_for(self._read_run(), self.timeout)
+        return time.perf_counter() - start
+
+    async def _read_run(self):
+        self.elements = []
+        while True:
+            data = await self.connection.read_message()
+            if data is None:
+                raise ConnectionError("websocket closed by the server")
+
+            msg = ForwardMsg()
+            msg.ParseFromString(data)
+            if msg.hash:
+                self.message_cache[msg.hash] = msg
+
+            kind = msg.WhichOneof("type")
+            if kind == "ref_hash":
+                msg = self.message_cache.get(msg.ref_hash)
+                kind = msg.WhichOneof("type") if msg is not None else None
+
+            if kind == "delta" and msg.delta.WhichOneof("type") == "new_element":
+                element = msg.delta.new_element
+                self.elements.append(element)
+                if element.WhichOneof("type") == "exception":
+                    self.exceptions += 1
+            elif kind == "script_finished":
+                # st.rerun() ends the run early and the server starts the next one
+                if msg.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    return
+
+    # -- element lookup --
+
+    def find(self, element_type: str, predicate=lambda widget: True):
+        """First widget of the last run with this element type matching `predicate`"""
+        for element in self.elements:
+            if element.WhichOneof("type") == element_type:
+                widget = getattr(element, element_type)
+                if predicate(widget):
+                    return widget
+        raise LookupError(f"no matching {element_type} in the last run")
+
+
+class SessionScenario:
+    """The steps of one simulated user"""
+
+    def __init__(self, session: StreamlitSession, email: str):
+        self.session = session
+        self.email = email
+        self.iteration = 0
+
+    async def login(self) -> float:
+        email_input = self.session.find("text_input", lambda w: w.label == "Email")
+        submit = self.session.find("button", lambda w: w.is_form_submitter)
+        return await self.session.rerun({email_input.id: ("string_value", self.email)}, trigger=submit.id)
+
+    async def navigate(self, index: int) -> float:
+        radio = self.session.find("radio", lambda w: w.label == "Navigation")
+        return await self.session.rerun({radio.id: ("int_value", index)})
+
+    async def add_transaction(self) -> float:
+        amount = self.session.find("number_input", lambda w: w.form_id == "add_new_transaction")
+        submit = self.session.find(
+            "button", lambda w: w.is_form_submitter and w.form_id == "add_new_transaction"
+        )
+        return await self.session.rerun({amount.id: ("double_value", 12.5)}, trigger=submit.id)
+
+    async def rename_category(self) -> float:
+        # edit button -> form -> save (two reruns)
+        edit = self.session.find("button", lambda w: "-edit_" in w.id)
+        elapsed = await self.session.rerun(trigger=edit.id)
+
+        self.iteration += 1
+        new_name = self.session.find("text_input", lambda w: "-new_name_" in w.id)
+        save = self.session.find(
+            "button", lambda w: w.is_form_submitter and w.form_id.startswith("edit_form_") and "💾" in w.label
+        )
+        elapsed += await self.session.rerun(
+            {new_name.id: ("string_value", f"{new_name.default} {self.iteration}")}, trigger=save.id
+        )
+        return elapsed
+
+    def steps(self) -> list:
+        return [
+            ("home", lambda: self.navigate(NAV_HOME)),
+            ("transactions", lambda: self.navigate(NAV_TRANSACTIONS)),
+            ("add_transaction", self.add_transaction),
+            ("budgets", lambda: self.navigate(NAV_BUDGETS)),
+            ("categories", lambda: self.navigate(NAV_CATEGORIES)),
+            ("rename_category", self.rename_category),
+        ]
+
+
+async def run_session(url: str, email: str, iterations: int, timeout: float, samples: list):
+    """Log in and loop the scenario; appends (step, seconds, ok) to samples"""
+    session = StreamlitSession(url, timeout)
+    scenario = SessionScenario(session, email)
+    try:
+        samples.append(("open", await session.connect(), True))
+        samples.append(("login", await scenario.login(), True))
+        for _ in range(iterations):
+            for step, action in scenario.steps():
+                start = time.perf_counter()
+                try:
+                    samples.append((step, await action(), True))
+                except (LookupError, asyncio.TimeoutError) as e:
+                    print(f"  ⚠️  {email} {step}: {e}")
+                    samples.append((step, time.perf_counter() - start, False))
+    except (ConnectionError, LookupError, asyncio.TimeoutError, OSError) as e:
+        print(f"  ❌ {email}: {e}")
+        samples.append(("session", 0.0, False))
+    finally:
+        await session.close()
+    return session.exceptions
+
+
+# =============================================
+# Resource sampling
+# =============================================
+
+def process_rss_mb(pid: int) -> float:
+    """Resident set size of a process from /proc (0 where unavailable)"""
+    try:
+        with open(f"/proc/{pid}/status", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def scrape_pool_gauges(metrics_url: str) -> dict:
+    """finance_mongo_pool_* gauges of the app's sync client from /metrics"""
+    gauges = {}
+    try:
+        with urllib.request.urlopen(metrics_url, timeout=2) as response:
+            for line in response.read().decode().splitlines():
+                for name in ("finance_mongo_pool_in_use", "finance_mongo_pool_open_connections"):
+                    if line.startswith(name + '{client="sync"}'):
+                        gauges[name] = float(line.rsplit(" ", 1)[1])
+    except OSError:
+        pass
+    return gauges
+
+
+class ResourceSampler(threading.Thread):
+    """Samples app RSS, pool gauges and mongod connections until stopped"""
+
+    def __init__(self, pid: int, metrics_url: str, interval: float = 0.5):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.metrics_url = metrics_url
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.rss_mb = []
+        self.pool_in_use = []
+        self.pool_open = []
+        self.mongod_connections = []
+
+    def run(self):
+        admin = DatabaseManager().client.admin
+        while not self.stopped.is_set():
+            if self.pid:
+                self.rss_mb.append(process_rss_mb(self.pid))
+            gauges = scrape_pool_gauges(self.metrics_url)
+            if gauges:
+                self.pool_in_use.append(gauges.get("finance_mongo_pool_in_use", 0))
+                self.pool_open.append(gauges.get("finance_mongo_pool_open_connections", 0))
+            try:
+                self.mongod_connections.append(admin.command("serverStatus")["connections"]["current"])
+            except Exception as e:
+                print(f"Error reading serverStatus: {e}")
+            self.stopped.wait(self.interval)
+
+    def stop(self) -> dict:
+        self.stopped.set()
+        self.join()
+        return {
+            "rss_mb_peak": max(self.rss_mb, default=0.0),
+            "rss_mb_end": self.rss_mb[-1] if self.rss_mb else 0.0,
+            "pool_in_use_peak": max(self.pool_in_use, default=0),
+            "pool_open_peak": max(self.pool_open, default=0),
+            "mongod_connections_peak": max(self.mongod_connections, default=0),
+        }
+
+
+# =============================================
+# Driver
+# =============================================
+
+def start_app(port: int) -> subprocess.Popen:
+    """streamlit run app.py in headless mode, waiting for /_stcore/health"""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", "app.py",
+         "--server.headless", "true", "--server.port", str(port),
+         "--browser.gatherUsageStats", "false"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.STDOUT,
+        env={**os.environ, "METRICS_ENABLED": "true"}
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1):
+                return process
+        except OSError:
+            time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError("Streamlit app did not become healthy within 60s")
+
+
+async def run_level(url: str, sessions: int, iterations: int, timeout: float, ramp: float) -> dict:
+    samples = []
+
+    async def delayed(i):
+        await asyncio.sleep(i * ramp)
+        return await run_session(url, f"user{i:06d}@{LOADTEST_DOMAIN}", iterations, timeout, samples)
+
+    start = time.perf_counter()
+    exceptions = await asyncio.gather(*(delayed(i) for i in range(sessions)))
+    wall = time.perf_counter() - start
+
+    ok = [seconds * 1000 for step, seconds, success in samples if success and step != "open"]
+    by_step = {}
+    for step, seconds, success in samples:
+        if success:
+            by_step.setdefault(step, []).append(seconds * 1000)
+
+    return {
+        "sessions": sessions,
+        "reruns": len(ok),
+        "errors": sum(1 for sample in samples if not sample[2]),
+        "script_exceptions": sum(exceptions),
+        "seconds": wall,
+        "throughput": len(ok) / wall if wall else 0.0,
+        "p50_ms": percentile(ok, 0.50),
+        "p95_ms": percentile(ok, 0.95),
+        "p99_ms": percentile(ok, 0.99),
+        "steps": {
+            step: {"count": len(values), "median_ms": statistics.median(values), "p95_ms": percentile(values, 0.95)}
+            for step, values in by_step.items()
+        }
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test the Streamlit app with concurrent sessions")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 5, 10, 25])
+    parser.add_argument("--iterations", type=int, default=3, help="Scenario loops per session")
+    parser.add_argument("--transactions", type=int, default=500, help="Seeded transactions per session user")
+    parser.add_argument("--ramp", type=float, default=0.1, help="Seconds between session starts")
+    parser.add_argument("--timeout", type=float, default=60, help="Seconds to wait for one rerun")
+    parser.add_argument("--url", help="Target a running app (ws://host:port) instead of starting one")
+    parser.add_argument("--pid", type=int, help="PID of the running app (for RSS with --url)")
+    parser.add_argument("--port", type=int, default=8599, help="Port of the started app")
+    parser.add_argument("--json", help="Write the report to this file")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🚦 STREAMLIT LOAD TEST")
+    print("=" * 60)
+
+    generator = SyntheticDataGenerator(domain=LOADTEST_DOMAIN)
+    generator.purge()
+    totals = generator.generate(users=max(args.sessions), transactions_per_user=args.transactions,
+                                rebuild_rollups=False)
+    for user_id in totals["user_ids"]:
+        MonthlyRollupModel().rebuild(user_id=str(user_id))
+    print(f"🌱 {totals['users']} users × {args.transactions:,} transactions")
+
+    process = None
+    if args.url:
+        url, pid = args.url, args.pid
+    else:
+        process = start_app(args.port)
+        url, pid = f"ws://127.0.0.1:{args.port}", process.pid
+    metrics_url = f"http://{config.METRICS_HOST}:{config.METRICS_PORT}/metrics"
+
+    report = []
+    try:
+        print(f"\n{'sessions':>8} | {'reruns/s':>9} | {'p50 ms':>8} | {'p95 ms':>8} | {'errors':>6} | "
+              f"{'RSS MB':>7} | {'pool':>5} | {'mongod':>6}")
+        print("-" * 80)
+        for sessions in sorted(args.sessions):
+            sampler = ResourceSampler(pid, metrics_url)
+            sampler.start()
+            level = asyncio.run(run_level(url, sessions, args.iterations, args.timeout, args.ramp))
+            level.update(sampler.stop())
+            report.append(level)
+
+            print(f"{sessions:>8} | {level['throughput']:>9.1f} | {level['p50_ms']:>8,.0f} | "
+                  f"{level['p95_ms']:>8,.0f} | {level['errors']:>6} | {level['rss_mb_peak']:>7,.0f} | "
+                  f"{level['pool_in_use_peak']:>5.0f} | {level['mongod_connections_peak']:>6}")
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+        generator.purge()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"transactions_per_user": args.transactions, "levels": report}, f, indent=2)
+        print(f"\n📄 {args.json}")
+    print("=" * 60)
@@ -0,0 +1,174 @@
+"""
+Query-count budget check for every page.
+
+Seeds a throwaway user, renders each page with Streamlit's AppTest and
+counts the MongoDB commands and documents returned during the render
+(from the QueryMetrics command listener). Exits with status 1 when a page
+goes over its budget. tests/test_query_budget.py runs the same check in the
+pytest suite against PAGE_BUDGETS.
+
+Each page is rendered twice; the second (warm) render is checked, since the
+first one also pays for cold caches (category cache, default categories).
+
+Usage:
+    python -m benchmarks.query_budget
+    python -m benchmarks.query_budget --size 5000 --budgets my_budgets.json --json report.json
+"""
+
+import argparse
+import json
+import sys
+from datetime import datetime
+from bson.objectid import ObjectId
+from streamlit.testing.v1 import AppTest
+import config
+from dataset.database_manager import DatabaseManager
+from dataset.transaction_model import TransactionModel
+from dataset.category_model import CategoryModel
+from dataset.budget_model import BudgetModel
+from dataset.rollup_model import MonthlyRollupModel
+from dataset.category_cache import CategoryCache
+from benchmarks.bench_statistics import seed_transactions
+
+
+# Budgets for the default seeded size (2,000 transactions over 5 years).
+# 'docs' is far below the seeded size, so any page that pulls the whole
+# history into Python fails the check.
+PAGE_BUDGETS = {
+    "home": {"commands": 5, "docs": 100},
+    "transactions": {"commands": 6, "docs": 100},
+    "categories": {"commands": 4, "docs": 100},
+    "budgets": {"commands": 8, "docs": 100},
+    "dashboard": {"commands": 8, "docs": 100},
+}
+
+# Builds the models for USER_ID, snapshots the command counters around the
+# render call and leaves the delta in st.session_state["query_budget"]
+SCRIPT_HEADER = '''
+import streamlit as st
+from dataset.database_manager import DatabaseManager
+from dataset.transaction_model import TransactionModel
+from dataset.category_model import CategoryModel
+from dataset.budget_model import BudgetModel
+from analytics.analyzer import FinanceAnalyzer
+
+user_id = "{user_id}"
+transaction_model = TransactionModel()
+transaction_model.set_user_id(user_id)
+category_model = CategoryModel()
+category_model.set_user_id(user_id)
+budget_model = BudgetModel()
+budget_model.set_user_id(user_id)
+
+def command_totals():
+    shapes = DatabaseManager().get_query_stats()["shapes"]
+    return sum(s["count"] for s in shapes), sum(s["docs"] for s in shapes)
+
+before = command_totals()
+'''
+
+SCRIPT_FOOTER = '''
+after = command_totals()
+st.session_state["query_budget"] = {{"commands": after[0] - before[0], "docs": after[1] - before[1]}}
+'''
+
+PAGE_CALLS = {
+    "home": "from view import render_home\n"
+            "render_home(transaction_model=transaction_model, category_model=category_model)",
+    "transactions": "from view import render_transactions\n"
+                    "render_transactions(transaction_model=transaction_model, category_model=category_model)",
+    "categories": "from view import render_categories\n"
+                  "render_categories(category_model=category_model)",
+    "budgets": "from view import render_budgets\n"
+               "render_budgets(budget_model=budget_model, transaction_model=transaction_model, "
+               "category_model=category_model)",
+    "dashboard": "from view.dashboard_view import render_dashboard\n"
+                 "render_dashboard(FinanceAnalyzer(transaction_model), transaction_model)",
+}
+
+
+def seed_user(size: int) -> ObjectId:
+    """User with default categories, `size` transactions, this month's budgets and rollups"""
+    user_id = ObjectId()
+
+    transaction_model = TransactionModel()
+    transaction_model.set_user_id(str(user_id))
+    category_model = CategoryModel()
+    category_model.set_user_id(str(user_id))
+    budget_model = BudgetModel()
+    budget_model.set_user_id(str(user_id))
+
+    seed_transactions(transaction_model, user_id, size)
+    MonthlyRollupModel().rebuild(user_id=str(user_id))
+
+    now = datetime.now()
+    for category in ["Food & Dining", "Transportation", "Entertainment"]:
+        budget_model.create_budget(category=category, amount=500, month=now.month, year=now.year)
+
+    return user_id
+
+
+def remove_user(user_id: ObjectId):
+    """Delete everything seeded for the throwaway user (it has no users document)"""
+    db_manager = DatabaseManager()
+    for name in ("transaction", "category", "budget", "monthly_rollup"):
+        db_manager.get_collection(config.COLLECTIONS[name]).delete_many({"user_id": user_id})
+    CategoryCache().invalidate(user_id)
+
+
+def measure_page(page: str, user_id: ObjectId, timeout: float) -> dict:
+    """Render a page twice, return the warm render's {commands, docs} (or {error})"""
+    script = SCRIPT_HEADER.format(user_id=user_id) + PAGE_CALLS[page] + SCRIPT_FOOTER.format()
+
+    result = {}
+    for _ in range(2):
+        app = AppTest.from_string(script, default_timeout=timeout)
+        app.run()
+        if app.exception:
+            return {"error": app.exception[0].message}
+        result = app.session_state["query_budget"]
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check per-page query budgets")
+    parser.add_argument("--size", type=int, default=2000, help="Seeded transactions")
+    parser.add_argument("--budgets", help="JSON file overriding PAGE_BUDGETS")
+    parser.add_argument("--json", help="Write the report to this file")
+    parser.add_argument("--timeout", type=float, default=60, help="Seconds per render")
+    args = parser.parse_args()
+
+    budgets = dict(PAGE_BUDGETS)
+    if args.budgets:
+        with open(args.budgets, encoding="utf-8") as f:
+            budgets.update(json.load(f))
+
+    user_id = seed_user(args.size)
+    report = []
+    try:
+        print(f"{'page':>14} | {'commands':>12} | {'docs':>12} | status")
+        print("-" * 56)
+
+        for page in PAGE_CALLS:
+            measured = measure_page(page, user_id, args.timeout)
+            budget = budgets[page]
+
+            if "error" in measured:
+                status = f"ERROR {measured['error']}"
+            elif measured["commands"] > budget["commands"] or measured["docs"] > budget["docs"]:
+                status = "OVER BUDGET"
+            else:
+                status = "ok"
+
+            report.append({"page": page, "budget": budget, "measured": measured, "status": status})
+            commands = f"{measured.get('commands', '-')}/{budget['commands']}"
+            docs = f"{measured.get('docs', '-')}/{budget['docs']}"
+            print(f"{page:>14} | {commands:>12} | {docs:>12} | {status}")
+    finally:
+        remove_user(user_id)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"size": args.size, "pages": report}, f, indent=2)
+
+    sys.exit(0 if all(row["status"] == "ok" for row in report) else 1)
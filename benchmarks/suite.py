@@ -0,0 +1,310 @@
+"""
+Model-layer benchmark suite with scaling curves.
+
+For each size, seeds one synthetic user (benchmarks.generate_data) with that
+many transactions, times every public read path of the model layer and the
+FinanceAnalyzer (both aggregation and pandas modes), then the write paths
+that rewrite many documents (update_category, delete_category_with_handling,
+delete_user_completely).
+
+Every run is compared against the stored baseline (benchmarks/baseline.json,
+recorded with --save-baseline on the reference machine): the script exits 1
+when a case got slower than --threshold times its baseline median, and 2 when
+there is no baseline or a measured case/size is missing from it (re-record
+the baseline after adding cases).
+
+Usage:
+    python -m benchmarks.suite --sizes 1000 100000 --save-baseline        # record the baseline
+    python -m benchmarks.suite --sizes 1000 100000 --json report.json     # run and check
+    python -m benchmarks.suite --report report.json --threshold 1.25      # check a stored report
+    python -m benchmarks.suite --cases get_statistics analyzer            # only matching cases
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from dataset.transaction_model import TransactionModel
+from dataset.category_model import CategoryModel
+from dataset.budget_model import BudgetModel
+from dataset.user_model import UserModel
+from dataset.rollup_model import MonthlyRollupModel
+from analytics.analyzer import FinanceAnalyzer
+from benchmarks.generate_data import SyntheticDataGenerator
+
+
+SUITE_DOMAIN = "bench-suite.local"
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+ANALYZER_METHODS = [
+    "get_transactions_dataframe",
+    "calculate_total_by_type",
+    "get_spending_by_category",
+    "get_monthly_trend",
+    "get_daily_average",
+    "detect_anomalies",
+    "predict_next_month_spending",
+    "get_statistics_summary",
+]
+
+
+def measure(func, repeat: int, setup=None, teardown=None) -> dict:
+    """Time `repeat` calls (setup/teardown run untimed around each call), in milliseconds"""
+    timings = []
+    for i in range(repeat):
+        if setup:
+            setup(i)
+        start = time.perf_counter()
+        func(i)
+        timings.append((time.perf_counter() - start) * 1000)
+        if teardown:
+            teardown(i)
+    return {
+        "median_ms": statistics.median(timings),
+        "min_ms": min(timings),
+        "max_ms": max(timings),
+        "runs": repeat
+    }
+
+
+def read_cases(user_id: str) -> dict:
+    """Read-only cases: name -> callable(run index)"""
+    transaction_model = TransactionModel()
+    transaction_model.set_user_id(user_id)
+    budget_model = BudgetModel()
+    budget_model.set_user_id(user_id)
+    category_model = CategoryModel()
+    category_model.set_user_id(user_id)
+
+    now = datetime.now()
+    last_90_days = {"start_date": now - timedelta(days=90), "end_date": now}
+    filters = {
+        "none": None,
+        "type": {"transaction_type": "Expense"},
+        "category": {"category": "Food & Dining"},
+        "amount": {"min_amount": 50, "max_amount": 500},
+        "date": last_90_days,
+        "search": {"search_text": "synth"},
+        "type+category+date": {"transaction_type": "Expense", "category": "Food & Dining", **last_90_days},
+        "all": {"transaction_type": "Expense", "category": "Food & Dining", "min_amount": 10,
+                "max_amount": 1000, "search_text": "synth", **last_90_days},
+    }
+
+    cases = {}
+    for name, advanced_filters in filters.items():
+        cases[f"TransactionModel.get_transactions[{name}]"] = \
+            lambda i, f=advanced_filters: transaction_model.get_transactions(f)
+        cases[f"TransactionModel.get_transactions_page[{name}]"] = \
+            lambda i, f=advanced_filters: transaction_model.get_transactions_page(f)
+
+    cases.update({
+        "TransactionModel.get_statistics": lambda i: transaction_model.get_statistics(),
+        "TransactionModel.get_statistics[date]": lambda i: transaction_model.get_statistics(
+            last_90_days["start_date"], last_90_days["end_date"]),
+        "TransactionModel.get_dashboard_snapshot": lambda i: transaction_model.get_dashboard_snapshot(),
+        "BudgetModel.get_all_budgets": lambda i: budget_model.get_all_budgets(),
+        "BudgetModel.get_budget_summary": lambda i: budget_model.get_budget_summary(transaction_model),
+        "BudgetModel.reconcile_spent[dry-run]": lambda i: budget_model.reconcile_spent(fix=False),
+        "CategoryModel.get_total": lambda i: category_model.get_total(),
+    })
+
+    for use_aggregation, mode in [(True, "agg"), (False, "pandas")]:
+        analyzer = FinanceAnalyzer(transaction_model, use_aggregation=use_aggregation)
+        for method in ANALYZER_METHODS:
+            args = ("Expense",) if method == "calculate_total_by_type" else ()
+            cases[f"FinanceAnalyzer[{mode}].{method}"] = \
+                lambda i, m=getattr(analyzer, method), a=args: m(*a)
+
+    return cases
+
+
+def write_cases(user_id: str, repeat: int) -> dict:
+    """
+    Cases that rewrite many documents: name -> (callable, setup, teardown, runs).
+    Each run of delete_category_with_handling consumes a different long-tail
+    category; delete_user_completely runs once and removes the seeded user.
+    """
+    category_model = CategoryModel()
+    category_model.set_user_id(user_id)
+    renamed = "Food & Dining (renamed)"
+
+    return {
+        "CategoryModel.update_category": (
+            lambda i: category_model.update_category("Food & Dining", renamed, "Expense"),
+            None,
+            lambda i: category_model.update_category(renamed, "Food & Dining", "Expense"),
+            repeat
+        ),
+        "CategoryModel.delete_category_with_handling[move_to_others]": (
+            lambda i: category_model.delete_category_with_handling("Expense", f"Custom {2 * i + 1:02d}",
+                                                                   "move_to_others"),
+            None, None, repeat
+        ),
+        "CategoryModel.delete_category_with_handling[delete_all]": (
+            lambda i: category_model.delete_category_with_handling("Expense", f"Custom {2 * i + 2:02d}",
+                                                                   "delete_all"),
+            None, None, repeat
+        ),
+        "UserModel.delete_user_completely": (
+            lambda i: UserModel().delete_user_completely(user_id),
+            None, None, 1
+        ),
+    }
+
+
+def selected(name: str, patterns: list) -> bool:
+    return not patterns or any(pattern.lower() in name.lower() for pattern in patterns)
+
+
+def run_size(size: int, repeat: int, patterns: list, seed: int) -> dict:
+    """Seed one user with `size` transactions and run every case"""
+    # long-tail categories consumed by the delete cases
+    generator = SyntheticDataGenerator(seed=seed, custom_categories=max(20, 2 * repeat), domain=SUITE_DOMAIN)
+    try:
+        totals = generator.generate(users=1, transactions_per_user=size, rebuild_rollups=False)
+        user_id = str(totals["user_ids"][0])
+        MonthlyRollupModel().rebuild(user_id=user_id)
+
+        results = {}
+        for name, func in read_cases(user_id).items():
+            if selected(name, patterns):
+                func(0)  # warm-up (connection, caches, plan cache)
+                results[name] = measure(func, repeat)
+                print(f"  {name:<62} {results[name]['median_ms']:>10,.1f} ms")
+
+        for name, (func, setup, teardown, runs) in write_cases(user_id, repeat).items():
+            if selected(name, patterns):
+                results[name] = measure(func, runs, setup, teardown)
+                print(f"  {name:<62} {results[name]['median_ms']:>10,.1f} ms")
+        return results
+    finally:
+        generator.purge()
+
+
+def scaling(results: dict, sizes: list) -> dict:
+    """
+    Log-log slope of median time vs size between consecutive sizes
+    (~0 = constant, ~1 = linear in the user's history).
+    """
+    curves = {}
+    names = {name for size in sizes for name in results.get(str(size), {})}
+    for name in sorted(names):
+        slopes = []
+        for small, large in zip(sizes, sizes[1:]):
+            a = results[str(small)].get(name)
+            b = results[str(large)].get(name)
+            if a and b and a["median_ms"] > 0 and b["median_ms"] > 0:
+                slopes.append(math.log(b["median_ms"] / a["median_ms"]) / math.log(large / small))
+        if slopes:
+            curves[name] = slopes
+    return curves
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> list:
+    """Cases slower than threshold x baseline median: [(size, name, baseline ms, current ms)]"""
+    regressions = []
+    for size, cases in report["results"].items():
+        for name, current in cases.items():
+            previous = baseline.get("results", {}).get(size, {}).get(name)
+            if previous and current["median_ms"] > previous["median_ms"] * threshold:
+                regressions.append((size, name, previous["median_ms"], current["median_ms"]))
+    return regressions
+
+
+def uncovered(report: dict, baseline: dict) -> list:
+    """Measured cases the baseline has no timing for: [(size, name)]"""
+    return [
+        (size, name)
+        for size, cases in report["results"].items()
+        for name in cases
+        if name not in baseline.get("results", {}).get(size, {})
+    ]
+
+
+def check(report: dict, baseline_path: str, threshold: float) -> int:
+    """Compare a report against the baseline file; returns the exit code (0 ok, 1 regression, 2 no baseline)"""
+    if not os.path.exists(baseline_path):
+        print(f"\n❌ No baseline at {baseline_path} (record one with --save-baseline)")
+        return 2
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    missing = uncovered(report, baseline)
+    if missing:
+        print(f"\n❌ {len(missing)} case(s) not in {baseline_path} (re-record it with --save-baseline)")
+        for size, name in missing:
+            print(f"  {int(size):>10,} {name}")
+        return 2
+
+    regressions = compare(report, baseline, threshold)
+    if regressions:
+        print(f"\n⚠️  {len(regressions)} regression(s) vs {baseline_path} (threshold {threshold}x)")
+        for size, name, previous, current in regressions:
+            print(f"  {int(size):>10,} {name:<62} {previous:>9,.1f} -> {current:>9,.1f} ms")
+        return 1
+    print(f"\n✅ No regressions vs {baseline_path} (threshold {threshold}x)")
+    return 0
+
+
+def run(sizes: list, repeat: int, patterns: list, seed: int) -> dict:
+    """Run every size and return the report"""
+    report = {
+        "created_at": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "sizes": sizes,
+        "repeat": repeat,
+        "results": {}
+    }
+
+    for size in sizes:
+        print(f"\n📊 {size:,} transactions")
+        report["results"][str(size)] = run_size(size, repeat, patterns, seed)
+
+    report["scaling"] = scaling(report["results"], sizes)
+    if len(sizes) > 1:
+        print("\n📈 Scaling (log-log slope between sizes, 1.0 = linear)")
+        for name, slopes in report["scaling"].items():
+            print(f"  {name:<62} " + " ".join(f"{slope:>6.2f}" for slope in slopes))
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the model layer at several sizes")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--cases", nargs="*", default=[], help="Only cases containing one of these strings")
+    parser.add_argument("--json", help="Write the report to this file")
+    parser.add_argument("--report", help="Check this stored report instead of running the suite")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline report to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Allowed slowdown vs the baseline")
+    parser.add_argument("--save-baseline", action="store_true", help="Write the run to --baseline, no comparison")
+    args = parser.parse_args()
+
+    if args.threshold < 1:
+        parser.error("--threshold must be >= 1")
+    if args.report and args.save_baseline:
+        parser.error("--report checks an existing report; run the suite to --save-baseline")
+
+    if args.report:
+        with open(args.report, encoding="utf-8") as f:
+            report = json.load(f)
+    else:
+        report = run(sorted(args.sizes), args.repeat, args.cases, args.seed)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📄 {args.json}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📌 Baseline saved to {args.baseline}")
+    else:
+        sys.exit(check(report, args.baseline, args.threshold))
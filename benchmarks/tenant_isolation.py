@@ -0,0 +1,141 @@
+"""
+Concurrency stress test for tenant isolation of the model layer.
+
+Seeds N users (each with a different number of transactions), then runs N
+threads in parallel, one per simulated session. Each thread reads through
+its own ModelContext: transactions (list and page), statistics, categories
+and budgets. Every returned document must belong to the thread's user and
+every count must match that user's seeded total; anything else is a
+cross-tenant read. Exits 1 if one is found. tests/test_tenant_isolation.py
+runs the same checks in the pytest suite, with the request memo and the
+ReadCache active.
+
+--shared runs the old pattern instead (one model set shared by all
+sessions, set_user_id before every read) to show the race it replaces.
+
+Usage:
+    python -m benchmarks.tenant_isolation
+    python -m benchmarks.tenant_isolation --sessions 100 --rounds 50
+    python -m benchmarks.tenant_isolation --shared
+"""
+
+import argparse
+import sys
+import threading
+import time
+from dataset.transaction_model import TransactionModel
+from dataset.category_model import CategoryModel
+from dataset.budget_model import BudgetModel
+from dataset.model_context import ModelContext
+from benchmarks.generate_data import SyntheticDataGenerator
+
+
+ISOLATION_DOMAIN = "isolation.local"
+
+
+class SharedModels:
+    """The previous app.py pattern: one cached model set rebound on every rerun"""
+
+    def __init__(self):
+        self.transaction = TransactionModel()
+        self.category = CategoryModel()
+        self.budget = BudgetModel()
+
+    def bind(self, user_id: str):
+        self.category.set_user_id(user_id)
+        self.budget.set_user_id(user_id)
+        self.transaction.set_user_id(user_id)
+        return self
+
+
+def check_session(models, user_id: str, expected: int) -> list:
+    """One 'rerun' worth of reads; returns descriptions of foreign data seen"""
+    leaks = []
+
+    foreign = [t for t in models.transaction.get_transactions() if str(t["user_id"]) != user_id]
+    if foreign:
+        leaks.append(f"get_transactions: {len(foreign)} foreign documents")
+
+    page = models.transaction.get_transactions_page(limit=20)["transactions"]
+    if any(str(t["user_id"]) != user_id for t in page):
+        leaks.append("get_transactions_page: foreign documents")
+
+    total = models.transaction.get_statistics()["total_transactions"]
+    if total != expected:
+        leaks.append(f"get_statistics: {total} transactions, expected {expected}")
+
+    if any(str(c["user_id"]) != user_id for c in models.category.get_total()):
+        leaks.append("get_total: foreign categories")
+
+    if any(str(b["user_id"]) != user_id for b in models.budget.get_all_budgets()):
+        leaks.append("get_all_budgets: foreign budgets")
+
+    return leaks
+
+
+def run_sessions(users: dict, rounds: int, shared: bool) -> list:
+    """One thread per user, all released together; returns (user_id, leak) pairs"""
+    barrier = threading.Barrier(len(users))
+    shared_models = SharedModels() if shared else None
+    found = []
+    found_lock = threading.Lock()
+
+    def session(user_id: str, expected: int):
+        # each session builds its context once, like get_session_models()
+        context = None if shared else ModelContext(user_id)
+        barrier.wait()
+        for _ in range(rounds):
+            models = shared_models.bind(user_id) if shared else context
+            time.sleep(0)  # yield between "set user" and the reads, as a rerun does
+            leaks = check_session(models, user_id, expected)
+            if leaks:
+                with found_lock:
+                    found.extend((user_id, leak) for leak in leaks)
+
+    threads = [threading.Thread(target=session, args=(user_id, expected)) for user_id, expected in users.items()]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return found
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check for cross-tenant reads under parallel sessions")
+    parser.add_argument("--sessions", type=int, default=100, help="Parallel sessions (one user each)")
+    parser.add_argument("--rounds", type=int, default=20, help="Reruns per session")
+    parser.add_argument("--transactions", type=int, default=50, help="Base transactions per user (+ index)")
+    parser.add_argument("--shared", action="store_true", help="Use one shared, rebound model set")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🔒 TENANT ISOLATION STRESS TEST" + (" (shared models)" if args.shared else ""))
+    print("=" * 60)
+
+    generator = SyntheticDataGenerator(domain=ISOLATION_DOMAIN)
+    generator.purge()
+    try:
+        # a different transaction count per user makes a foreign get_statistics visible
+        users = {}
+        for i in range(args.sessions):
+            totals = generator.generate(users=1, transactions_per_user=args.transactions + i,
+                                        start_index=i, rebuild_rollups=False)
+            users[str(totals["user_ids"][0])] = args.transactions + i
+
+        start = time.perf_counter()
+        leaks = run_sessions(users, args.rounds, args.shared)
+        elapsed = time.perf_counter() - start
+    finally:
+        generator.purge()
+
+    reads = args.sessions * args.rounds
+    print(f"\n{reads:,} session reruns in {elapsed:.1f}s")
+    if leaks:
+        print(f"❌ {len(leaks)} cross-tenant read(s)")
+        for user_id, leak in leaks[:20]:
+            print(f"  {user_id}: {leak}")
+    else:
+        print("✅ No cross-tenant reads")
+    print("=" * 60)
+
+    sys.exit(1 if leaks else 0)
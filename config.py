@@ -17,7 +17,7 @@ def get_mongo_uri():
         if hasattr(st, 'secrets') and st.secrets is not None:
             if 'MONGO_URI' in st.secrets:
                 return st.secrets['MONGO_URI']
-    except (ImportError, AttributeError, RuntimeError, KeyError):
+    except (ImportError, AttributeError, RuntimeError, KeyError, FileNotFoundError):
         # Not running in Streamlit or secrets not available
         pass
     
@@ -25,7 +25,80 @@ def get_mongo_uri():
     return os.getenv("MONGO_URI", "mongodb://localhost:27017/")
 
 MONGO_URI = get_mongo_uri()
-DATABASE_NAME = "finance_tracker"
+DATABASE_NAME = os.getenv("DATABASE_NAME", "finance_tracker")
+
+# Connection pool / timeouts
+# Every concurrent Streamlit session borrows a connection per in-flight query,
+# so maxPoolSize bounds the concurrency; waitQueueTimeoutMS fails fast instead
+# of hanging when the pool is exhausted.
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "300000"))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "10000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "10000"))
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "10000"))
+MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "30000"))
+# comma separated: zstd (needs zstandard), snappy (needs python-snappy), zlib; empty = off
+MONGO_COMPRESSORS = os.getenv("MONGO_COMPRESSORS", "")
+
+MONGO_CLIENT_OPTIONS = {
+    "maxPoolSize": MONGO_MAX_POOL_SIZE,
+    "minPoolSize": MONGO_MIN_POOL_SIZE,
+    "maxIdleTimeMS": MONGO_MAX_IDLE_TIME_MS,
+    "waitQueueTimeoutMS": MONGO_WAIT_QUEUE_TIMEOUT_MS,
+    "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+    "connectTimeoutMS": MONGO_CONNECT_TIMEOUT_MS,
+    "socketTimeoutMS": MONGO_SOCKET_TIMEOUT_MS,
+}
+if MONGO_COMPRESSORS:
+    MONGO_CLIENT_OPTIONS["compressors"] = MONGO_COMPRESSORS
+
+# Query monitoring (dataset/query_monitor.py): commands slower than this are logged
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "100"))
+# number of slow queries kept in memory
+SLOW_QUERY_LOG_SIZE = int(os.getenv("SLOW_QUERY_LOG_SIZE", "200"))
+# re-encode every reply to measure its BSON size (costs CPU proportional to the result size);
+# off by default, slow queries are always measured
+QUERY_MONITOR_MEASURE_BYTES = os.getenv("QUERY_MONITOR_MEASURE_BYTES", "false").lower() == "true"
+
+# Prometheus endpoint (metrics.py): GET http://METRICS_HOST:METRICS_PORT/metrics
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9464"))
+# a session counts as active if it reran within this window
+METRICS_SESSION_WINDOW_SECONDS = int(os.getenv("METRICS_SESSION_WINDOW_SECONDS", "300"))
+
+# Render profiler (profiler.py): 'on' = every rerun, 'query' = only with ?profile=1, 'off' = disabled
+PROFILER_MODE = os.getenv("PROFILER_MODE", "query").lower()
+# write a cProfile (.prof) or pyinstrument (.html) dump of each profiled rerun here (empty = no dump)
+PROFILER_DUMP_DIR = os.getenv("PROFILER_DUMP_DIR", "")
+PROFILER_DUMP_FORMAT = os.getenv("PROFILER_DUMP_FORMAT", "cprofile").lower()
+
+# comma separated emails allowed to open the admin (monitoring) page
+ADMIN_EMAILS = [email.strip() for email in os.getenv("ADMIN_EMAILS", "").split(",") if email.strip()]
+
+
+# ANALYTICS CONFIGURATION
+# Run FinanceAnalyzer with MongoDB aggregation pipelines instead of pandas
+# ($dateTrunc requires MongoDB 5.0+)
+ANALYTICS_USE_AGGREGATION = os.getenv("ANALYTICS_USE_AGGREGATION", "true").lower() == "true"
+
+
+# Create missing indexes (dataset/index_manager.py) once per process at app startup
+AUTO_APPLY_INDEXES = os.getenv("AUTO_APPLY_INDEXES", "true").lower() == "true"
+
+
+# Read whole-month sums from the monthly_rollups collection instead of raw transactions
+# (users whose transactions predate the rollups are rebuilt once on first read)
+USE_MONTHLY_ROLLUPS = os.getenv("USE_MONTHLY_ROLLUPS", "true").lower() == "true"
+
+
+# Per-user category cache (dataset/category_cache.py): max age of an entry, in seconds
+CATEGORY_CACHE_TTL_SECONDS = int(os.getenv("CATEGORY_CACHE_TTL_SECONDS", "60"))
+
+# Cross-rerun cache of model reads (dataset/read_cache.py): size ceiling, in MB
+READ_CACHE_ENABLED = os.getenv("READ_CACHE_ENABLED", "true").lower() == "true"
+READ_CACHE_MAX_MB = int(os.getenv("READ_CACHE_MAX_MB", "64"))
 
 
 #collection names
@@ -34,11 +107,21 @@ COLLECTIONS = {
     "transaction": "transactions",
     "category": "categories",
     "budget": "budgets",
+    "monthly_rollup": "monthly_rollups",
 }
 
 #transaction types
 TRANSACTION_TYPES = ['Expense', 'Income']
 
+# number of transactions per page in the transaction list
+TRANSACTIONS_PAGE_SIZE = 20
+
+# documents per insert_many call in TransactionModel.add_transactions_bulk
+BULK_INSERT_CHUNK_SIZE = 1000
+
+# documents per server round trip (and per Parquet row group) when exporting
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "5000"))
+
 # DEFAULT_CATEGORIES_EXPENSE:
 DEFAULT_CATEGORIES_EXPENSE = [
     "Food & Dining",
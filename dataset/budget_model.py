@@ -1,8 +1,12 @@
 from dataset.database_manager import DatabaseManager
+from dataset.rollup_model import MonthlyRollupModel
+from dataset.category_cache import CategoryCache
+from dataset.request_memo import memoized_read, invalidates_reads, bump_data_version
 import config
 from datetime import datetime
 from typing import Optional, List
 from bson.objectid import ObjectId
+from pymongo import UpdateOne, UpdateMany
 
 
 collection_name = config.COLLECTIONS['budget']
@@ -18,6 +22,7 @@ class BudgetModel:
         """Set the current user id for scoped queries"""
         self.user_id = ObjectId(user_id) if user_id is not None else None
 
+    @invalidates_reads
     def create_budget(
         self,
         category: str,
@@ -41,14 +46,7 @@ class BudgetModel:
             raise ValueError("User ID must be set before creating budget")
 
         # ✅ VALIDATION: Category phải tồn tại và phải là Expense
-        category_collection = self.db_manager.get_collection(config.COLLECTIONS['category'])
-        existing_category = category_collection.find_one({
-            'user_id': self.user_id,
-            'name': category,
-            'type': 'Expense'
-        })
-        
-        if not existing_category:
+        if not CategoryCache().has_category(self.user_id, category, 'Expense'):
             raise ValueError(f"Category '{category}' không tồn tại hoặc không phải là Expense category")
 
         # Check if budget already exists for this user-category-month (UNIQUE CONSTRAINT)
@@ -71,17 +69,22 @@ class BudgetModel:
             'month': month,
             'year': year,
             'is_active': True,
+            # spent counter, kept in sync by TransactionModel writes
+            # (counted once the budget exists, see _recount_spent)
+            'spent': 0.0,
             'created_at': datetime.now(),
             'last_modified': datetime.now()
         }
 
         try:
             result = self.collection.insert_one(budget)
+            self._recount_spent(result.inserted_id)
             return str(result.inserted_id)
         except Exception as e:
             print(f"Error creating budget: {e}")
             return None
 
+    @invalidates_reads
     def update_budget(
         self,
         budget_id: str,
@@ -106,11 +109,38 @@ class BudgetModel:
             }
             
             result = self.collection.update_one(filter_, {'$set': kwargs})
+            
+            # the budget now covers other transactions -> count them again
+            if result.modified_count > 0 and kwargs.keys() & {'category', 'month', 'year', 'is_active'}:
+                self._recount_spent(budget_id)
             return result.modified_count > 0
         except Exception as e:
             print(f"Error updating budget: {e}")
             return False
 
+    def _recount_spent(self, budget_id):
+        """
+        Set a budget's spent counter from its expense transactions.
+        
+        The read and the write run in one transaction that writes the budget:
+        a concurrent transaction write that $inc's the same budget conflicts
+        with it and is retried (see DatabaseManager.run_transaction), so an
+        amount is never counted twice or missed.
+        """
+        def recount(session):
+            budget = self.collection.find_one(
+                {'_id': ObjectId(budget_id)},
+                {'category': 1, 'month': 1, 'year': 1},
+                session=session
+            )
+            if budget is None:
+                return
+            spent = self._sum_expenses(budget['category'], budget['month'], budget['year'], session=session)
+            self.collection.update_one({'_id': budget['_id']}, {'$set': {'spent': spent}}, session=session)
+        
+        self.db_manager.run_transaction(recount)
+
+    @invalidates_reads
     def delete_budget(self, budget_id: str) -> bool:
         """
         Delete a budget (soft delete by setting is_active=False)
@@ -123,6 +153,7 @@ class BudgetModel:
         """
         return self.update_budget(budget_id, is_active=False)
 
+    @memoized_read
     def get_budget_by_id(self, budget_id: str) -> Optional[dict]:
         """Get a single budget by ID"""
         try:
@@ -135,6 +166,7 @@ class BudgetModel:
             print(f"Error getting budget: {e}")
             return None
 
+    @memoized_read
     def get_all_budgets(self, include_inactive: bool = False) -> List[dict]:
         """
         Get all budgets for current user
@@ -153,6 +185,7 @@ class BudgetModel:
         cursor = self.collection.find(query).sort([('year', -1), ('month', -1)])
         return list(cursor)
 
+    @memoized_read
     def get_budget_by_category_month(self, category: str, month: int, year: int) -> Optional[dict]:
         """Get active budget for a specific category and month"""
         query = {
@@ -164,6 +197,7 @@ class BudgetModel:
         }
         return self.collection.find_one(query)
 
+    @memoized_read
     def get_budgets_by_month(self, month: int, year: int) -> List[dict]:
         """Get all active budgets for a specific month"""
         query = {
@@ -175,6 +209,7 @@ class BudgetModel:
         cursor = self.collection.find(query).sort('created_at', -1)
         return list(cursor)
     
+    @memoized_read
     def get_budgets_by_category(self, category_name: str) -> List[dict]:
         """Get all budgets for a specific category"""
         query = {
@@ -185,6 +220,7 @@ class BudgetModel:
         cursor = self.collection.find(query).sort('created_at', -1)
         return list(cursor)
     
+    @memoized_read
     def get_budgets_by_user_id(self, user_id: str) -> List[dict]:
         """Get all budgets for a specific user (admin function)"""
         query = {
@@ -194,6 +230,7 @@ class BudgetModel:
         cursor = self.collection.find(query).sort('created_at', -1)
         return list(cursor)
     
+    @memoized_read
     def calculate_spent_amount(self, category: str, month: int, year: int) -> float:
         """
         ✅ Tính tổng tiền đã chi cho category trong tháng bằng MongoDB aggregation
@@ -207,8 +244,14 @@ class BudgetModel:
         Returns:
             Total spent amount
         """
-        from datetime import date
+        # ✅ Whole month -> 1 indexed read on the monthly rollup
+        if config.USE_MONTHLY_ROLLUPS:
+            return MonthlyRollupModel().get_bucket_sum(self.user_id, category, 'Expense', month, year)
         
+        return self._sum_expenses(category, month, year)
+
+    def _sum_expenses(self, category: str, month: int, year: int, session=None) -> float:
+        """Sum of a category's expense transactions in a month, from the raw transactions"""
         # Tạo date range cho tháng
         start_date = datetime(year, month, 1)
         if month == 12:
@@ -239,16 +282,17 @@ class BudgetModel:
             }
         ]
         
-        result = list(transaction_collection.aggregate(pipeline))
+        result = list(transaction_collection.aggregate(pipeline, session=session))
         
         if result:
             return float(result[0].get('total_spent', 0))
         return 0.0
 
+    @memoized_read
     def check_budget_status(self, category: str, month: int, year: int) -> dict:
         """
         Check budget status for a category in a specific month
-        ✅ Tự động tính spent_amount bằng aggregation
+        ✅ Đọc spent counter trên budget (1 indexed read), chỉ aggregation khi chưa có budget
         
         Args:
             category: Category name
@@ -260,8 +304,11 @@ class BudgetModel:
         """
         budget = self.get_budget_by_category_month(category, month, year)
         
-        # ✅ Tính spent bằng aggregation
-        spent_amount = self.calculate_spent_amount(category, month, year)
+        # ✅ Spent counter maintained by transaction writes; aggregate only if missing
+        if budget and 'spent' in budget:
+            spent_amount = float(budget['spent'])
+        else:
+            spent_amount = self.calculate_spent_amount(category, month, year)
         
         if not budget:
             return {
@@ -301,15 +348,173 @@ class BudgetModel:
             'year': year
         }
 
+    def move_budgets(self, from_category: str, to_category: str, session=None) -> dict:
+        """
+        Move a category's budgets to another category (category delete/merge).
+        Months where the target already has an active budget are merged into
+        it: the amounts are added and the moved budget is deactivated, keeping
+        one active budget per category and month (unique index).
+        Spent counters are not touched; reconcile the target category after.
+        
+        Args:
+            from_category: Category whose budgets are moved
+            to_category: Category receiving the budgets
+            session: Optional session of the surrounding transaction
+        
+        Returns:
+            dict with moved and merged counts
+        """
+        counts = {'moved': 0, 'merged': 0}
+        now = datetime.now()
+        
+        targets = {
+            (budget['month'], budget['year']): budget['_id']
+            for budget in self.collection.find(
+                {'user_id': self.user_id, 'category': to_category, 'is_active': True},
+                {'month': 1, 'year': 1},
+                session=session
+            )
+        }
+        
+        requests = []
+        for budget in self.collection.find(
+            {'user_id': self.user_id, 'category': from_category, 'is_active': True},
+            {'month': 1, 'year': 1, 'amount': 1},
+            session=session
+        ):
+            target_id = targets.get((budget['month'], budget['year']))
+            if target_id is None:
+                requests.append(UpdateOne(
+                    {'_id': budget['_id']},
+                    {'$set': {'category': to_category, 'last_modified': now}}
+                ))
+                counts['moved'] += 1
+            else:
+                requests.append(UpdateOne(
+                    {'_id': target_id},
+                    {'$inc': {'amount': budget.get('amount', 0)}, '$set': {'last_modified': now}}
+                ))
+                requests.append(UpdateOne(
+                    {'_id': budget['_id']},
+                    {'$set': {'is_active': False, 'last_modified': now}}
+                ))
+                counts['merged'] += 1
+        
+        # inactive budgets are outside the unique index: they simply follow
+        requests.append(UpdateMany(
+            {'user_id': self.user_id, 'category': from_category, 'is_active': False},
+            {'$set': {'category': to_category}}
+        ))
+        self.collection.bulk_write(requests, ordered=True, session=session)
+        
+        return counts
+
+    @invalidates_reads
+    def reconcile_spent(
+        self,
+        category: Optional[str] = None,
+        all_users: bool = False,
+        fix: bool = True,
+        session=None
+    ) -> List[dict]:
+        """
+        Recompute budget spent counters from transactions and report drift
+        
+        Args:
+            category: Only reconcile budgets of this category (default: all)
+            all_users: Reconcile every user's budgets instead of the current user
+            fix: Write the recomputed value back to drifted budgets
+            session: Optional session of the surrounding transaction
+        
+        Returns:
+            List of drifted budgets: budget_id, user_id, category, month, year,
+            stored (None if missing) and actual
+        """
+        match = {'is_active': True}
+        if not all_users:
+            match['user_id'] = self.user_id
+        if category is not None:
+            match['category'] = category
+        
+        pipeline = [
+            {"$match": match},
+            {
+                "$lookup": {
+                    "from": config.COLLECTIONS['transaction'],
+                    "localField": "category",
+                    "foreignField": "category",
+                    "let": {"user_id": "$user_id", "month": "$month", "year": "$year"},
+                    "pipeline": [
+                        {
+                            "$match": {
+                                "type": "Expense",
+                                "$expr": {
+                                    "$and": [
+                                        {"$eq": ["$user_id", "$$user_id"]},
+                                        {"$eq": [{"$month": "$date"}, "$$month"]},
+                                        {"$eq": [{"$year": "$date"}, "$$year"]}
+                                    ]
+                                }
+                            }
+                        },
+                        {"$group": {"_id": None, "total_spent": {"$sum": "$amount"}}}
+                    ],
+                    "as": "actual"
+                }
+            },
+            {
+                "$project": {
+                    "user_id": 1,
+                    "category": 1,
+                    "month": 1,
+                    "year": 1,
+                    "spent": 1,
+                    "actual": {"$ifNull": [{"$arrayElemAt": ["$actual.total_spent", 0]}, 0]}
+                }
+            }
+        ]
+        
+        drifted = []
+        for budget in self.collection.aggregate(pipeline, session=session):
+            stored = budget.get('spent')
+            actual = float(budget['actual'])
+            if stored is not None and abs(stored - actual) < 1e-6:
+                continue
+            
+            drifted.append({
+                'budget_id': str(budget['_id']),
+                'user_id': str(budget['user_id']),
+                'category': budget['category'],
+                'month': budget['month'],
+                'year': budget['year'],
+                'stored': stored,
+                'actual': actual
+            })
+        
+        if fix and drifted:
+            self.collection.bulk_write(
+                [
+                    UpdateOne({'_id': ObjectId(item['budget_id'])}, {'$set': {'spent': item['actual']}})
+                    for item in drifted
+                ],
+                ordered=False,
+                session=session
+            )
+        
+        return drifted
+
+    @memoized_read
     def get_budget_summary(self, transaction_model, month: int = None, year: int = None) -> List[dict]:
         """
         Get comprehensive budget summary with spending data for a specific month
-        
+        ✅ 1 aggregation duy nhất trên budgets: spent đọc từ spent counter,
+        remaining/percentage/status tính trên MongoDB (không N+1 query)
+
         Args:
             transaction_model: TransactionModel instance to get spending data
             month: Month to get summary for (default: current month)
             year: Year to get summary for (default: current year)
-        
+
         Returns:
             List of budget summaries with actual spending
         """
@@ -318,33 +523,84 @@ class BudgetModel:
             now = datetime.now()
             month = month or now.month
             year = year or now.year
-        
-        # Get budgets for this month
-        budgets = self.get_budgets_by_month(month, year)
-        summary = []
 
-        for budget in budgets:
-            category = budget.get('category')
-            budget_amount = budget.get('amount', 0)
-            budget_month = budget.get('month')
-            budget_year = budget.get('year')
+        pipeline = self._budget_summary_pipeline(month, year)
+        summary = list(self.collection.aggregate(pipeline))
 
-            # ✅ Tính spent bằng MongoDB aggregation (KHÔNG dùng Python loop)
-            spent_amount = self.calculate_spent_amount(category, budget_month, budget_year)
-            
-            status = self.check_budget_status(category, budget_month, budget_year)
+        # budgets created before the spent counter existed: count them once, then re-read
+        uncounted = [row['budget_id'] for row in summary if not row['has_spent']]
+        if uncounted:
+            for budget_id in uncounted:
+                self._recount_spent(budget_id)
+            # the recount is a write: cached budget reads (get_all_budgets, ...) hold the old spent
+            bump_data_version(self.user_id)
+            summary = list(self.collection.aggregate(pipeline))
 
-            summary.append({
-                'budget_id': str(budget['_id']),
-                'category': category,
-                'budget_amount': budget_amount,
-                'spent_amount': spent_amount,
-                'remaining': status['remaining'],
-                'percentage': status['percentage'],
-                'status': status['status'],
-                'month': budget_month,
-                'year': budget_year,
-                'created_at': budget.get('created_at')
-            })
+        for budget_info in summary:
+            del budget_info['has_spent']
+            budget_info['spent_amount'] = float(budget_info['spent_amount'])
 
         return summary
+
+    def _budget_summary_pipeline(self, month: int, year: int) -> List[dict]:
+        """Budgets pipeline of get_budget_summary (run again after a recount)"""
+        spent = {"$ifNull": ["$spent", 0]}
+
+        return [
+            # Budgets for this month (same as get_budgets_by_month)
+            {
+                "$match": {
+                    "user_id": self.user_id,
+                    "month": month,
+                    "year": year,
+                    "is_active": True
+                }
+            },
+            {"$sort": {"created_at": -1}},
+            # spent counter maintained by transaction writes
+            {
+                "$addFields": {
+                    "has_spent": {"$ne": [{"$type": "$spent"}, "missing"]},
+                    "spent_amount": spent,
+                    "remaining": {"$subtract": ["$amount", spent]},
+                    "percentage": {
+                        "$cond": [
+                            {"$gt": ["$amount", 0]},
+                            {"$multiply": [{"$divide": [spent, "$amount"]}, 100]},
+                            0
+                        ]
+                    }
+                }
+            },
+            # Same thresholds as check_budget_status
+            {
+                "$addFields": {
+                    "status": {
+                        "$switch": {
+                            "branches": [
+                                {"case": {"$lt": ["$percentage", 50]}, "then": "safe"},
+                                {"case": {"$lt": ["$percentage", 80]}, "then": "warning"},
+                                {"case": {"$lt": ["$percentage", 100]}, "then": "danger"}
+                            ],
+                            "default": "exceeded"
+                        }
+                    }
+                }
+            },
+            {
+                "$project": {
+                    "_id": 0,
+                    "budget_id": {"$toString": "$_id"},
+                    "category": 1,
+                    "budget_amount": {"$ifNull": ["$amount", 0]},
+                    "spent_amount": 1,
+                    "has_spent": 1,
+                    "remaining": 1,
+                    "percentage": 1,
+                    "status": 1,
+                    "month": 1,
+                    "year": 1,
+                    "created_at": 1
+                }
+            }
+        ]
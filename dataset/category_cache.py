@@ -0,0 +1,129 @@
+from dataset.database_manager import DatabaseManager
+import config
+import threading
+import time
+from bson.objectid import ObjectId
+from metrics import MetricsRegistry
+
+
+class CategoryCache:
+    """
+    Process-wide per-user cache of category documents (name -> types).
+    Shared by every session of the process; CategoryModel bumps the user's
+    version on upsert / rename / delete so all sessions see the change.
+    Entries also expire after config.CATEGORY_CACHE_TTL_SECONDS to pick up
+    writes made by other processes.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(CategoryCache, cls).__new__(cls)
+            cls._instance._initialize()
+        return cls._instance
+
+    def _initialize(self):
+        self.collection = DatabaseManager().get_collection(config.COLLECTIONS['category'])
+        self._lock = threading.Lock()
+        self._entries = {}   # user_id -> {"version", "loaded_at", "categories", "types_by_name"}
+        self._versions = {}  # user_id -> version counter
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        MetricsRegistry().add_collector(self._collect)
+
+    def version(self, user_id) -> int:
+        """Current version counter of a user's categories"""
+        return self._versions.get(ObjectId(user_id), 0)
+
+    def invalidate(self, user_id):
+        """Bump the user's version and drop the cached entry (call after every category write)"""
+        user_id = ObjectId(user_id)
+        with self._lock:
+            self._versions[user_id] = self._versions.get(user_id, 0) + 1
+            self._entries.pop(user_id, None)
+            self.invalidations += 1
+
+    def _load(self, user_id: ObjectId) -> dict:
+        with self._lock:
+            version = self._versions.get(user_id, 0)
+
+        categories = list(self.collection.find({"user_id": user_id}).sort("created_at", -1))
+        types_by_name = {}
+        for cate in categories:
+            types_by_name.setdefault(cate.get("name"), set()).add(cate.get("type"))
+
+        entry = {
+            "version": version,
+            "loaded_at": time.monotonic(),
+            "categories": categories,
+            "types_by_name": types_by_name
+        }
+
+        with self._lock:
+            # don't store a result that a concurrent write already invalidated
+            if self._versions.get(user_id, 0) == version:
+                self._entries[user_id] = entry
+        return entry
+
+    def _get_entry(self, user_id, refresh: bool = False) -> dict:
+        user_id = ObjectId(user_id)
+
+        with self._lock:
+            entry = self._entries.get(user_id)
+            fresh = (
+                entry is not None
+                and not refresh
+                and entry["version"] == self._versions.get(user_id, 0)
+                and time.monotonic() - entry["loaded_at"] < config.CATEGORY_CACHE_TTL_SECONDS
+            )
+            if fresh:
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        return self._load(user_id)
+
+    def get_categories(self, user_id, category_type: str = None) -> list[dict]:
+        """
+        Get a user's categories sorted by created_at descending
+
+        Args:
+            user_id: User ID
+            category_type: Optional 'Expense' or 'Income' filter
+        """
+        categories = self._get_entry(user_id)["categories"]
+        if category_type is None:
+            return list(categories)
+        return [cate for cate in categories if cate.get("type") == category_type]
+
+    def has_category(self, user_id, category_name: str, category_type: str) -> bool:
+        """
+        Check that a category exists with the given type.
+        A negative answer is confirmed against the database once, so a category
+        created by another process is never rejected because of a stale entry.
+        """
+        if category_type in self._get_entry(user_id)["types_by_name"].get(category_name, ()):
+            return True
+        return category_type in self._get_entry(user_id, refresh=True)["types_by_name"].get(category_name, ())
+
+    def _collect(self, registry):
+        """Scrape-time counters for the Prometheus endpoint"""
+        stats = self.stats()
+        registry.set_counter("finance_category_cache_hits_total", stats["hits"],
+                           help_text="Category cache hits")
+        registry.set_counter("finance_category_cache_misses_total", stats["misses"],
+                           help_text="Category cache misses")
+        registry.set_gauge("finance_category_cache_hit_ratio", stats["hit_ratio"],
+                           help_text="Category cache hit ratio since start")
+
+    def stats(self) -> dict:
+        """Hit/miss counters of the cache"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_ratio": self.hits / total if total else 0.0,
+            "users": len(self._entries)
+        }
@@ -1,15 +1,29 @@
 from dataset.database_manager import DatabaseManager
+from dataset.category_cache import CategoryCache
+from dataset.request_memo import invalidates_reads, bump_data_version
 import config
 from datetime import datetime
 from typing import Optional
+import hashlib
 from bson.objectid import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 
 collection_name = config.COLLECTIONS['category']
 
+# Changes whenever config.DEFAULT_CATEGORIES_* change -> defaults are re-applied once
+DEFAULT_CATEGORIES_VERSION = hashlib.sha1(
+    "|".join(config.DEFAULT_CATEGORIES_EXPENSE + ["#"] + config.DEFAULT_CATEGORIES_INCOME).encode()
+).hexdigest()[:12]
+
 class CategoryModel:
+    # (user_id, version) already bootstrapped in this process
+    _bootstrapped_users = set()
+
     def __init__(self, user_id: Optional[str] = None):
         self.db_manager = DatabaseManager()
         self.collection = self.db_manager.get_collection(collection_name=collection_name)
+        self.cache = CategoryCache()
 
         # init:
         self.user_id = user_id
@@ -26,19 +40,51 @@ class CategoryModel:
         # Check if there is user_id, exist earlier
         if not self.user_id:
             return
-        
-        # EXPENSE
-        for cate in config.DEFAULT_CATEGORIES_EXPENSE:
-            # # calling by params order
-            # self.upsert_category("Expense", cate)
 
-            # calling by params keywords
-            self.upsert_category(category_type = "Expense", category_name= cate)
+        # Already done in this process (set_user_id runs on every rerun)
+        marker = (self.user_id, DEFAULT_CATEGORIES_VERSION)
+        if marker in CategoryModel._bootstrapped_users:
+            return
+
+        # Already done for this version of the defaults (marker on user document)
+        user_collection = self.db_manager.get_collection(config.COLLECTIONS['user'])
+        if user_collection.find_one({"_id": self.user_id, "defaults_version": DEFAULT_CATEGORIES_VERSION}, {"_id": 1}):
+            CategoryModel._bootstrapped_users.add(marker)
+            return
+
+        # EXPENSE + INCOME: one unordered bulk_write of upserts
+        now = datetime.now()
+        defaults = [("Expense", cate) for cate in config.DEFAULT_CATEGORIES_EXPENSE] + \
+                   [("Income", cate) for cate in config.DEFAULT_CATEGORIES_INCOME]
+        requests = [
+            UpdateOne(
+                {"type": category_type, "name": category_name, "user_id": self.user_id},
+                {"$set": {"last_modified": now}, "$setOnInsert": {"created_at": now}},
+                upsert=True
+            )
+            for category_type, category_name in defaults
+        ]
+
+        try:
+            self.collection.bulk_write(requests, ordered=False)
+        except BulkWriteError as e:
+            # duplicate key = a concurrent session upserted the same category first
+            if any(error.get("code") != 11000 for error in e.details.get("writeErrors", [])):
+                print(f"Error initializing default categories: {e.details}")
+                self.cache.invalidate(self.user_id)
+                bump_data_version(self.user_id)
+                return
 
-        # INCOME
-        for cate in config.DEFAULT_CATEGORIES_INCOME:
-            self.upsert_category(category_type = "Income", category_name = cate)
+        self.cache.invalidate(self.user_id)
+        bump_data_version(self.user_id)
+
+        user_collection.update_one(
+            {"_id": self.user_id},
+            {"$set": {"defaults_version": DEFAULT_CATEGORIES_VERSION}}
+        )
+        CategoryModel._bootstrapped_users.add(marker)
 
+    @invalidates_reads
     def upsert_category(self, category_type: str, category_name: str):
 
         # define filter
@@ -63,8 +109,11 @@ class CategoryModel:
             update_doc,
             upsert=True
         )
+        if result.upserted_id is not None:
+            self.cache.invalidate(self.user_id)
         return result.upserted_id
 
+    @invalidates_reads
     def update_category(self, old_name: str, new_name: str, old_type: str, new_type: str = None):
         """
         Update category name and/or type, with transaction sync
@@ -109,28 +158,42 @@ class CategoryModel:
         
         # CASE 1: Only rename (same type)
         if old_type == new_type:
-            # Update category name
-            cat_result = self.collection.update_one(
-                {"name": old_name, "type": old_type, "user_id": self.user_id},
-                {"$set": {"name": new_name, "last_modified": datetime.now()}}
-            )
+            # Rename the category, its transactions and budgets together so budget spent counters stay consistent
+            def rename(session):
+                # Update category name
+                cat_result = self.collection.update_one(
+                    {"name": old_name, "type": old_type, "user_id": self.user_id},
+                    {"$set": {"name": new_name, "last_modified": datetime.now()}},
+                    session=session
+                )
+                if cat_result.modified_count == 0:
+                    return False
+                
+                # Sync transactions (MongoDB update_many - NO LOOP)
+                trans_result = trans_model.collection.update_many(
+                    {"category": old_name, "user_id": self.user_id},
+                    {"$set": {"category": new_name}},
+                    session=session
+                )
+                counts["transactions"] = trans_result.modified_count
+                
+                # Sync budgets (MongoDB update_many - NO LOOP)
+                budget_result = budget_model.collection.update_many(
+                    {"category": old_name, "user_id": self.user_id},
+                    {"$set": {"category": new_name}},
+                    session=session
+                )
+                counts["budgets"] = budget_result.modified_count
+                
+                # Sync monthly rollups
+                trans_model.rollup_model.rename_category(self.user_id, old_name, new_name, session=session)
+                return True
             
-            if cat_result.modified_count == 0:
+            renamed = self.db_manager.run_transaction(rename)
+            if not renamed:
                 return False, "❌ Category not found", counts
             
-            # Sync transactions (MongoDB update_many - NO LOOP)
-            trans_result = trans_model.collection.update_many(
-                {"category": old_name, "user_id": self.user_id},
-                {"$set": {"category": new_name}}
-            )
-            counts["transactions"] = trans_result.modified_count
-            
-            # Sync budgets (MongoDB update_many - NO LOOP)
-            budget_result = budget_model.collection.update_many(
-                {"category": old_name, "user_id": self.user_id},
-                {"$set": {"category": new_name}}
-            )
-            counts["budgets"] = budget_result.modified_count
+            self.cache.invalidate(self.user_id)
             
             message = f"✅ Renamed to '{new_name}' and updated {counts['transactions']} transactions, {counts['budgets']} budgets"
             return True, message, counts
@@ -160,15 +223,20 @@ class CategoryModel:
             )
             
             if cat_result.modified_count > 0:
+                self.cache.invalidate(self.user_id)
                 message = f"✅ Changed '{old_name}' ({old_type}) → '{new_name}' ({new_type})"
                 return True, message, counts
             else:
                 return False, "❌ Category not found", counts
     
+    @invalidates_reads
     def delete_category(self, category_type: str, category_name: str):
         result = self.collection.delete_one({"type": category_type, "name": category_name, "user_id": self.user_id}) # add user_id condition
+        if result.deleted_count > 0:
+            self.cache.invalidate(self.user_id)
         return result.deleted_count
     
+    @invalidates_reads
     def delete_category_with_handling(self, category_type: str, category_name: str, action: str = "cancel"):
         """
         Delete category with transaction and budget handling
@@ -224,40 +292,53 @@ class CategoryModel:
             # Ensure "Others" category exists
             self.upsert_category(category_type, "Others")
             
-            # Move transactions using MongoDB update_many (NO LOOP)
-            if related_trans_count > 0:
-                trans_result = trans_model.collection.update_many(
-                    {"category": category_name, "user_id": self.user_id},
-                    {"$set": {"category": "Others"}}
-                )
-                counts["transactions_moved"] = trans_result.modified_count
+            def move(session):
+                # Move transactions using MongoDB update_many (NO LOOP)
+                if related_trans_count > 0:
+                    trans_result = trans_model.collection.update_many(
+                        {"category": category_name, "user_id": self.user_id},
+                        {"$set": {"category": "Others"}},
+                        session=session
+                    )
+                    counts["transactions_moved"] = trans_result.modified_count
+                
+                # Move budgets (merged into an existing "Others" budget of the same month)
+                if related_budgets_count > 0:
+                    moved = budget_model.move_budgets(category_name, "Others", session=session)
+                    counts["budgets_moved"] = moved["moved"] + moved["merged"]
+                
+                # "Others" budgets now cover the moved transactions -> recompute spent
+                budget_model.reconcile_spent(category="Others", session=session)
             
-            # Move budgets using MongoDB update_many (NO LOOP)
-            if related_budgets_count > 0:
-                budget_result = budget_model.collection.update_many(
-                    {"category": category_name, "user_id": self.user_id},
-                    {"$set": {"category": "Others"}}
-                )
-                counts["budgets_moved"] = budget_result.modified_count
+            self.db_manager.run_transaction(move)
+            
+            # Rebuild monthly rollups of both categories ($merge cannot run in a transaction)
+            trans_model.rollup_model.rebuild(str(self.user_id), categories=[category_name, "Others"])
             
             message = f"✅ Moved {counts['transactions_moved']} transactions and {counts['budgets_moved']} budgets to 'Others'"
         
         elif action == "delete_all":
-            # Delete transactions using MongoDB delete_many (NO LOOP)
-            if related_trans_count > 0:
-                trans_result = trans_model.collection.delete_many({
-                    "category": category_name,
-                    "user_id": self.user_id
-                })
-                counts["transactions_deleted"] = trans_result.deleted_count
+            def delete_all(session):
+                # Delete transactions using MongoDB delete_many (NO LOOP)
+                if related_trans_count > 0:
+                    trans_result = trans_model.collection.delete_many({
+                        "category": category_name,
+                        "user_id": self.user_id
+                    }, session=session)
+                    counts["transactions_deleted"] = trans_result.deleted_count
+                
+                # Delete budgets using MongoDB delete_many (NO LOOP)
+                if related_budgets_count > 0:
+                    budget_result = budget_model.collection.delete_many({
+                        "category": category_name,
+                        "user_id": self.user_id
+                    }, session=session)
+                    counts["budgets_deleted"] = budget_result.deleted_count
+                
+                # Delete monthly rollups of the category
+                trans_model.rollup_model.delete_by_user(self.user_id, category=category_name, session=session)
             
-            # Delete budgets using MongoDB delete_many (NO LOOP)
-            if related_budgets_count > 0:
-                budget_result = budget_model.collection.delete_many({
-                    "category": category_name,
-                    "user_id": self.user_id
-                })
-                counts["budgets_deleted"] = budget_result.deleted_count
+            self.db_manager.run_transaction(delete_all)
             
             message = f"✅ Deleted {counts['transactions_deleted']} transactions and {counts['budgets_deleted']} budgets"
         
@@ -269,7 +350,10 @@ class CategoryModel:
             return False, "❌ Failed to delete category", counts
 
     def get_categories_by_type(self, category_type: str):
-        return list(self.collection.find({"type": category_type, "user_id": self.user_id}).sort("created_at", -1))  # add user_id condition
+        if not self.user_id:
+            return []
+        # served from the per-user category cache (same order: created_at desc)
+        return self.cache.get_categories(self.user_id, category_type)
     
     def get_categories_by_user_id(self, user_id: str):
         """Get all categories for a specific user (admin function)"""
@@ -1,4 +1,6 @@
 from pymongo import MongoClient
+from dataset.pool_monitor import PoolMetrics
+from dataset.query_monitor import QueryMetrics
 import config
 
 class DatabaseManager:
@@ -11,7 +13,15 @@ class DatabaseManager:
         return cls._instance
         
     def _initialize(self):
-        self.client = MongoClient(config.MONGO_URI)
+        # pool telemetry (checkout wait, in-use connections, checkout failures)
+        self.pool_metrics = PoolMetrics()
+        # per-query-shape latency histograms + slow-query log
+        self.query_metrics = QueryMetrics()
+        self.client = MongoClient(
+            config.MONGO_URI,
+            event_listeners=[self.pool_metrics, self.query_metrics],
+            **config.MONGO_CLIENT_OPTIONS
+        )
         self.db = self.client[config.DATABASE_NAME]
         try:
             self.db.command("ping")
@@ -19,11 +29,41 @@ class DatabaseManager:
         except Exception as e:
             print(f"Error in connect: {e}")
             raise e
+
+        # multi-document transactions need a replica set or a sharded cluster (mongos)
+        hello = self.db.command("hello")
+        self.supports_transactions = "setName" in hello or hello.get("msg") == "isdbgrid"
         
     def get_collection(self, collection_name: str):
         """Get a collection from db"""
         return self.db[collection_name]
+
+    def get_pool_stats(self) -> dict:
+        """Connection pool metrics of the sync client (see PoolMetrics.snapshot)"""
+        return self.pool_metrics.snapshot()
+
+    def get_query_stats(self) -> dict:
+        """Per-query-shape latency metrics and slow queries (see QueryMetrics.snapshot)"""
+        return self.query_metrics.snapshot()
     
+    def run_transaction(self, callback):
+        """
+        Run callback(session) atomically when the deployment supports it.
+        Uses session.with_transaction, which retries the whole callback on
+        TransientTransactionError (e.g. a write conflict on the same budget
+        counter) and the commit on UnknownTransactionCommitResult, so the
+        callback must be safe to run again. On a standalone server
+        callback(None) runs once and the writes run one by one.
+        
+        Returns:
+            The return value of the callback
+        """
+        if not self.supports_transactions:
+            return callback(None)
+
+        with self.client.start_session() as session:
+            return session.with_transaction(callback)
+
     def close_connection(self):
         """Close db connection"""
         if self.client:
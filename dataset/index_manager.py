@@ -0,0 +1,301 @@
+import itertools
+from dataset.database_manager import DatabaseManager
+from dataset.transaction_model import TransactionModel
+from dataset.budget_model import BudgetModel
+from dataset.rollup_model import MonthlyRollupModel
+from dataset.category_cache import CategoryCache
+from dataset.user_model import UserModel
+import config
+from bson.objectid import ObjectId
+from datetime import datetime, timedelta
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+
+# Index options compared by diff() besides the keys
+COMPARED_OPTIONS = ("unique", "sparse", "partialFilterExpression", "expireAfterSeconds")
+
+# Fields the driver adds to commands that explain does not accept
+DRIVER_FIELDS = {"lsid", "txnNumber", "autocommit", "startTransaction", "readConcern"}
+
+# Pipeline stages that can run on an index; the stages after them work on
+# their output ($group, $facet, $lookup ...) and are not checked
+INDEX_STAGES = {"$match", "$sort", "$limit", "$skip"}
+
+
+# =============================================
+# Declarative index spec (one entry per query shape the models issue)
+# =============================================
+
+INDEX_SPECS = {
+    config.COLLECTIONS['transaction']: [
+        # get_transactions / get_transactions_page: user_id, sort created_at desc (+ _id keyset)
+        IndexModel([('user_id', ASCENDING), ('created_at', DESCENDING), ('_id', DESCENDING)],
+                   name='user_created_at'),
+        # get_transactions_by_type: user_id + type, sort created_at desc
+        IndexModel([('user_id', ASCENDING), ('type', ASCENDING), ('created_at', DESCENDING), ('_id', DESCENDING)],
+                   name='user_type_created_at'),
+        # BudgetModel.calculate_spent_amount + category rename/delete cascades
+        IndexModel([('user_id', ASCENDING), ('category', ASCENDING), ('type', ASCENDING), ('date', ASCENDING)],
+                   name='user_category_type_date'),
+        # date range filters (analytics, get_transactions_by_date_range)
+        IndexModel([('user_id', ASCENDING), ('date', ASCENDING)],
+                   name='user_date'),
+        # statement import dedupe (only imported rows carry a fingerprint)
+        IndexModel([('user_id', ASCENDING), ('fingerprint', ASCENDING)],
+                   name='unique_user_fingerprint', unique=True,
+                   partialFilterExpression={'fingerprint': {'$exists': True}}),
+    ],
+    config.COLLECTIONS['category']: [
+        # _validate_category, upsert_category, update_category
+        IndexModel([('user_id', ASCENDING), ('type', ASCENDING), ('name', ASCENDING)],
+                   name='unique_user_type_name', unique=True),
+        # CategoryCache._load, get_categories_by_user_id: sort created_at desc
+        IndexModel([('user_id', ASCENDING), ('created_at', DESCENDING)],
+                   name='user_created_at'),
+    ],
+    config.COLLECTIONS['user']: [
+        # UserModel.login
+        IndexModel([('email', ASCENDING)],
+                   name='unique_email', unique=True),
+    ],
+    config.COLLECTIONS['budget']: [
+        # one active budget per user + category + month + year
+        # (soft-deleted budgets are outside the index, so they never collide)
+        IndexModel([('user_id', ASCENDING), ('category', ASCENDING), ('month', ASCENDING),
+                    ('year', ASCENDING)],
+                   name='unique_user_category_month_year', unique=True,
+                   partialFilterExpression={'is_active': True}),
+        # get_budgets_by_month: sort created_at desc
+        IndexModel([('user_id', ASCENDING), ('month', ASCENDING), ('year', ASCENDING),
+                    ('is_active', ASCENDING), ('created_at', DESCENDING)],
+                   name='user_month_year_created_at'),
+        # get_all_budgets: sort year desc, month desc
+        IndexModel([('user_id', ASCENDING), ('is_active', ASCENDING), ('year', DESCENDING), ('month', DESCENDING)],
+                   name='user_active_year_month'),
+    ],
+    config.COLLECTIONS['monthly_rollup']: [
+        # rollup key, also required by the $merge of MonthlyRollupModel.rebuild
+        IndexModel([('user_id', ASCENDING), ('year', ASCENDING), ('month', ASCENDING),
+                    ('type', ASCENDING), ('category', ASCENDING)],
+                   name='unique_user_year_month_type_category', unique=True),
+        # MonthlyRollupModel.get_monthly_totals
+        IndexModel([('user_id', ASCENDING), ('period', ASCENDING)],
+                   name='user_period'),
+    ],
+}
+
+
+def _model_reads(user_id: str) -> list[tuple]:
+    """
+    (name, call) for every hot read the models issue. verify() runs them for
+    a throwaway user and explains the commands they actually send, so the
+    checked shapes follow the model code (query builders, sorts, pipelines).
+    """
+    transaction = TransactionModel()
+    transaction.set_user_id(user_id)
+    budget = BudgetModel(user_id)
+    rollup = MonthlyRollupModel()
+    now = datetime.now()
+    # continuation token of a page ending "now" (the keyset $or of later pages)
+    page_token = TransactionModel._encode_page_cursor({"created_at": now, "_id": ObjectId()})
+
+    def load_categories():
+        CategoryCache().invalidate(user_id)
+        return CategoryCache().get_categories(user_id)
+
+    return [
+        ("TransactionModel.get_transactions", lambda: transaction.get_transactions()),
+        ("TransactionModel.get_transactions_page", lambda: transaction.get_transactions_page(after=page_token)),
+        ("TransactionModel.get_transactions_by_type", lambda: transaction.get_transactions_by_type("Expense")),
+        ("TransactionModel.get_transactions_by_date_range",
+         lambda: transaction.get_transactions_by_date_range(now - timedelta(days=30), now)),
+        ("TransactionModel.get_statistics", lambda: transaction.get_statistics()),
+        ("TransactionModel.get_dashboard_snapshot", lambda: transaction.get_dashboard_snapshot()),
+        ("CategoryCache.get_categories", load_categories),
+        ("UserModel.get_user_by_email", lambda: UserModel().get_user_by_email("verify@example.com")),
+        ("BudgetModel.get_budget_by_category_month",
+         lambda: budget.get_budget_by_category_month("Food & Dining", now.month, now.year)),
+        ("BudgetModel.get_budgets_by_month", lambda: budget.get_budgets_by_month(now.month, now.year)),
+        ("BudgetModel.get_all_budgets", lambda: budget.get_all_budgets()),
+        ("BudgetModel.get_budget_summary", lambda: budget.get_budget_summary(transaction, now.month, now.year)),
+        ("BudgetModel.calculate_spent_amount",
+         lambda: budget.calculate_spent_amount("Food & Dining", now.month, now.year)),
+        ("MonthlyRollupModel.get_monthly_totals",
+         lambda: rollup.get_monthly_totals(user_id, now - timedelta(days=180), now)),
+    ]
+
+
+class IndexManager:
+    """Apply / diff / drop / verify the declarative INDEX_SPECS"""
+
+    def __init__(self, specs: dict = None):
+        self.db_manager = DatabaseManager()
+        self.specs = specs if specs is not None else INDEX_SPECS
+
+    @staticmethod
+    def _normalize(keys) -> list[tuple]:
+        """Normalize index keys to [(field, int_direction)] for comparison"""
+        return [(field, int(direction)) for field, direction in keys]
+
+    @staticmethod
+    def _options(index: dict) -> dict:
+        """The COMPARED_OPTIONS an index sets (unset and false options are equivalent)"""
+        return {option: index[option] for option in COMPARED_OPTIONS if index.get(option) not in (None, False)}
+
+    def diff(self) -> dict:
+        """
+        Compare the spec against the indexes that exist in the database.
+
+        Returns:
+            dict per collection: missing (spec names), changed (spec names with
+            different keys/options), unused (existing names not in spec)
+        """
+        report = {}
+
+        for collection_name, index_models in self.specs.items():
+            existing = self.db_manager.get_collection(collection_name).index_information()
+            wanted = {model.document['name']: model.document for model in index_models}
+
+            missing, changed = [], []
+            for name, doc in wanted.items():
+                if name not in existing:
+                    missing.append(name)
+                    continue
+                same_keys = self._normalize(existing[name]['key']) == self._normalize(doc['key'].items())
+                same_options = self._options(existing[name]) == self._options(doc)
+                if not (same_keys and same_options):
+                    changed.append(name)
+
+            unused = [name for name in existing if name != '_id_' and name not in wanted]
+
+            report[collection_name] = {
+                "missing": missing,
+                "changed": changed,
+                "unused": unused
+            }
+
+        return report
+
+    def apply(self) -> dict:
+        """
+        Create missing indexes and rebuild changed ones. Safe to run repeatedly.
+
+        Returns:
+            dict per collection with created index names and errors
+        """
+        report = self.diff()
+        result = {}
+
+        for collection_name, index_models in self.specs.items():
+            collection = self.db_manager.get_collection(collection_name)
+            changes = report[collection_name]
+            result[collection_name] = {"created": [], "errors": []}
+
+            for name in changes["changed"]:
+                collection.drop_index(name)
+
+            to_create = [model for model in index_models
+                         if model.document['name'] in changes["missing"] + changes["changed"]]
+            if not to_create:
+                continue
+
+            try:
+                result[collection_name]["created"] = collection.create_indexes(to_create)
+            except Exception as e:
+                # e.g. duplicate data blocking a unique index
+                print(f"Error creating indexes on {collection_name}: {e}")
+                result[collection_name]["errors"].append(str(e))
+
+        return result
+
+    def drop_unused(self) -> dict:
+        """
+        Drop indexes that exist in the database but are not in the spec.
+
+        Returns:
+            dict per collection with dropped index names
+        """
+        report = self.diff()
+        result = {}
+
+        for collection_name, changes in report.items():
+            collection = self.db_manager.get_collection(collection_name)
+            for name in changes["unused"]:
+                collection.drop_index(name)
+            result[collection_name] = changes["unused"]
+
+        return result
+
+    @staticmethod
+    def _bad_stages(plan) -> list[str]:
+        """Collect COLLSCAN / in-memory SORT stages from an explain plan"""
+        found = []
+        if isinstance(plan, dict):
+            if plan.get("stage") in ("COLLSCAN", "SORT"):
+                found.append(plan["stage"])
+            for value in plan.values():
+                found.extend(IndexManager._bad_stages(value))
+        elif isinstance(plan, list):
+            for item in plan:
+                found.extend(IndexManager._bad_stages(item))
+        return found
+
+    @staticmethod
+    def _winning_plans(explain) -> list:
+        """Every winningPlan of an explain output (find, or each $cursor of an aggregate)"""
+        plans = []
+        if isinstance(explain, dict):
+            for key, value in explain.items():
+                if key == "winningPlan":
+                    plans.append(value)
+                else:
+                    plans.extend(IndexManager._winning_plans(value))
+        elif isinstance(explain, list):
+            for item in explain:
+                plans.extend(IndexManager._winning_plans(item))
+        return plans
+
+    def _explain(self, command_name: str, command: dict):
+        """explain() a captured find / aggregate (aggregates: only their indexable prefix)"""
+        command = {key: value for key, value in command.items()
+                   if not key.startswith("$") and key not in DRIVER_FIELDS}
+        if command_name == "aggregate":
+            command["pipeline"] = list(itertools.takewhile(
+                lambda stage: next(iter(stage)) in INDEX_STAGES, command.get("pipeline", [])
+            ))
+            if not command["pipeline"]:
+                return None
+        return self.db_manager.db.command("explain", command, verbosity="queryPlanner")
+
+    def verify(self) -> list[dict]:
+        """
+        Run every model read (see _model_reads) for a throwaway user and
+        explain() each find / aggregate it sends.
+
+        Returns:
+            list of {name, collection, stages} for queries whose winning plan
+            uses a COLLSCAN or an in-memory SORT (empty list = all good)
+        """
+        problems = []
+        user_id = str(ObjectId())
+
+        for name, read in _model_reads(user_id):
+            with self.db_manager.query_metrics.capture() as commands:
+                read()
+
+            for command_name, command in commands:
+                if command_name not in ("find", "aggregate"):
+                    continue
+                explain = self._explain(command_name, command)
+                if explain is None:
+                    continue
+
+                stages = [stage for plan in self._winning_plans(explain) for stage in self._bad_stages(plan)]
+                if stages:
+                    problems.append({
+                        "name": name,
+                        "collection": command[command_name],
+                        "stages": stages
+                    })
+
+        return problems
@@ -0,0 +1,62 @@
+from typing import Optional
+from bson.objectid import ObjectId
+from dataset.transaction_model import TransactionModel
+from dataset.category_model import CategoryModel
+from dataset.budget_model import BudgetModel
+
+
+class ModelContext:
+    """
+    Immutable per-session handle: the models of one user.
+
+    Each context owns its own model instances, bound to `user_id` once at
+    construction; they still share the process-wide MongoClient pool
+    (DatabaseManager singleton) and the category cache. A session that logs
+    in as another user gets a new context instead of rebinding this one, so
+    a rerun in one session can never change the user_id another session's
+    queries run with.
+
+    Usage:
+        models = ModelContext(user_id)
+        models.transaction.get_statistics()
+    """
+    __slots__ = ("_user_id", "_transaction", "_category", "_budget")
+
+    def __init__(self, user_id: str):
+        if not user_id:
+            raise ValueError("User ID is required for a model context")
+
+        transaction = TransactionModel()
+        transaction.set_user_id(user_id)
+        category = CategoryModel()
+        category.set_user_id(user_id)  # bootstraps default categories once per process
+        budget = BudgetModel()
+        budget.set_user_id(user_id)
+
+        object.__setattr__(self, "_user_id", ObjectId(user_id))
+        object.__setattr__(self, "_transaction", transaction)
+        object.__setattr__(self, "_category", category)
+        object.__setattr__(self, "_budget", budget)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ModelContext is immutable; create a new one for another user")
+
+    @property
+    def user_id(self) -> str:
+        return str(self._user_id)
+
+    @property
+    def transaction(self) -> TransactionModel:
+        return self._transaction
+
+    @property
+    def category(self) -> CategoryModel:
+        return self._category
+
+    @property
+    def budget(self) -> BudgetModel:
+        return self._budget
+
+    def is_for(self, user_id: Optional[str]) -> bool:
+        """True if this context belongs to `user_id`"""
+        return user_id is not None and str(user_id) == self.user_id
@@ -0,0 +1,135 @@
+import threading
+import time
+from collections import deque
+from pymongo import monitoring
+from metrics import MetricsRegistry
+
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """
+    CMAP listener that tracks connection pool health:
+    checkout wait time, connections in use / open, and checkout failures.
+
+    pymongo calls the listener from whichever thread borrows a connection,
+    so every update happens under a lock. Wait times keep the last
+    `window` samples for percentiles.
+    """
+
+    def __init__(self, client_name: str = "sync", window: int = 1000):
+        self.client_name = client_name
+        self.registry = MetricsRegistry()
+        self.registry.add_collector(self._collect)
+        self._lock = threading.Lock()
+        self._wait_ms = deque(maxlen=window)
+        self.started_at = time.time()
+
+        self.checkouts = 0
+        self.checkout_failures = {}   # reason -> count
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+
+        self.in_use = 0
+        self.in_use_max = 0
+        self.open_connections = 0
+        self.pool_cleared = 0
+
+    # -- checkout / checkin --
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_checked_out(self, event):
+        # event.duration: seconds spent waiting for the connection (pymongo 4.7+)
+        wait_ms = getattr(event, "duration", 0.0) * 1000
+        with self._lock:
+            self.checkouts += 1
+            self.wait_ms_total += wait_ms
+            self.wait_ms_max = max(self.wait_ms_max, wait_ms)
+            self._wait_ms.append(wait_ms)
+            self.in_use += 1
+            self.in_use_max = max(self.in_use_max, self.in_use)
+        self.registry.observe("finance_mongo_pool_checkout_wait_seconds", wait_ms / 1000,
+                              {"client": self.client_name},
+                              help_text="Time spent waiting for a pooled connection")
+
+    def connection_check_out_failed(self, event):
+        # reason: 'timeout' (pool exhausted), 'connectionError' or 'poolClosed'
+        with self._lock:
+            self.checkout_failures[event.reason] = self.checkout_failures.get(event.reason, 0) + 1
+        self.registry.inc("finance_mongo_pool_checkout_failures_total",
+                          {"client": self.client_name, "reason": event.reason},
+                          help_text="Failed connection checkouts by reason")
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.in_use = max(self.in_use - 1, 0)
+
+    # -- pool / connection lifecycle --
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self.pool_cleared += 1
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        with self._lock:
+            self.open_connections += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.open_connections = max(self.open_connections - 1, 0)
+
+    # -- reporting --
+
+    def _collect(self, registry):
+        """Scrape-time gauges for the Prometheus endpoint"""
+        labels = {"client": self.client_name}
+        registry.set_gauge("finance_mongo_pool_in_use", self.in_use, labels,
+                           help_text="Connections currently checked out")
+        registry.set_gauge("finance_mongo_pool_open_connections", self.open_connections, labels,
+                           help_text="Open pooled connections")
+
+    @staticmethod
+    def _percentile(sorted_values: list, fraction: float) -> float:
+        if not sorted_values:
+            return 0.0
+        index = min(int(fraction * len(sorted_values)), len(sorted_values) - 1)
+        return sorted_values[index]
+
+    def snapshot(self) -> dict:
+        """
+        Current pool metrics.
+
+        Returns:
+            dict with checkouts, checkout_failures (by reason), in_use, in_use_max,
+            open_connections, pool_cleared and wait_ms {avg, p50, p95, p99, max}
+        """
+        with self._lock:
+            waits = sorted(self._wait_ms)
+            return {
+                "checkouts": self.checkouts,
+                "checkout_failures": dict(self.checkout_failures),
+                "in_use": self.in_use,
+                "in_use_max": self.in_use_max,
+                "open_connections": self.open_connections,
+                "pool_cleared": self.pool_cleared,
+                "wait_ms": {
+                    "avg": self.wait_ms_total / self.checkouts if self.checkouts else 0.0,
+                    "p50": self._percentile(waits, 0.50),
+                    "p95": self._percentile(waits, 0.95),
+                    "p99": self._percentile(waits, 0.99),
+                    "max": self.wait_ms_max
+                },
+                "uptime_seconds": time.time() - self.started_at
+            }
@@ -0,0 +1,281 @@
+import bisect
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+import bson
+from pymongo import monitoring
+from metrics import MetricsRegistry
+import profiler
+import config
+
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS_MS = [0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+# Commands that are not model queries (handshakes, heartbeats, sessions)
+IGNORED_COMMANDS = {
+    "hello", "ismaster", "isMaster", "ping", "buildInfo", "buildinfo", "saslStart",
+    "saslContinue", "endSessions", "killCursors", "getLastError", "serverStatus"
+}
+
+# command name -> field holding the filter (insert has none)
+FILTER_FIELDS = {
+    "find": "filter",
+    "count": "query",
+    "distinct": "query",
+    "findAndModify": "query",
+}
+
+
+def _strip_values(value):
+    """Keep keys and operators, replace every value with '?'"""
+    if isinstance(value, dict):
+        return {key: _strip_values(val) for key, val in value.items()}
+    if isinstance(value, list) and value and all(isinstance(item, dict) for item in value):
+        # $and / $or / pipelines: keep the structure of each branch
+        return [_strip_values(item) for item in value]
+    return "?"
+
+
+def query_shape(command_name: str, command: dict) -> tuple[str, str]:
+    """
+    Normalized shape of a command: (collection, "operation filter-shape").
+    Values are stripped so the same model call with different users/dates
+    lands in the same bucket.
+    """
+    collection = command.get(command_name)
+    if not isinstance(collection, str):
+        collection = ""
+
+    if command_name in FILTER_FIELDS:
+        shape = _strip_values(command.get(FILTER_FIELDS[command_name], {}))
+        if command.get("sort"):
+            shape = {"filter": shape, "sort": list(command["sort"])}
+    elif command_name == "aggregate":
+        # stage names, plus the shape of the leading $match
+        pipeline = command.get("pipeline", [])
+        shape = [next(iter(stage)) for stage in pipeline]
+        if pipeline and "$match" in pipeline[0]:
+            shape = {"match": _strip_values(pipeline[0]["$match"]), "stages": shape}
+    elif command_name == "update":
+        shape = [_strip_values(update.get("q", {})) for update in command.get("updates", [])[:1]]
+    elif command_name == "delete":
+        shape = [_strip_values(delete.get("q", {})) for delete in command.get("deletes", [])[:1]]
+    else:
+        shape = None
+
+    text = command_name if shape is None else f"{command_name} {json.dumps(shape, default=str)}"
+    return collection, text
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (bounded memory, approximate percentiles)"""
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.docs = 0
+        self.bytes = 0
+
+    def observe(self, duration_ms: float, docs: int = 0, size: int = 0):
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, duration_ms)] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        self.docs += docs
+        self.bytes += size
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the given fraction (max for the open bucket)"""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= rank:
+                bound = LATENCY_BUCKETS_MS[index] if index < len(LATENCY_BUCKETS_MS) else self.max_ms
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "avg_ms": self.total_ms / self.count if self.count else 0.0,
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": self.max_ms,
+            "docs": self.docs,
+            "bytes": self.bytes
+        }
+
+
+class QueryMetrics(monitoring.CommandListener):
+    """
+    CommandListener that records duration and documents returned of every
+    command (reply size too with config.QUERY_MONITOR_MEASURE_BYTES), bucketed
+    by normalized query shape, plus a log of the queries slower than
+    config.SLOW_QUERY_THRESHOLD_MS with their reply size.
+
+    getMore batches are attributed to the find/aggregate that opened the cursor.
+    """
+
+    def __init__(self, slow_threshold_ms: float = None, slow_log_size: int = None,
+                 measure_bytes: bool = None):
+        self.slow_threshold_ms = (
+            config.SLOW_QUERY_THRESHOLD_MS if slow_threshold_ms is None else slow_threshold_ms
+        )
+        self.measure_bytes = config.QUERY_MONITOR_MEASURE_BYTES if measure_bytes is None else measure_bytes
+        self._lock = threading.Lock()
+        self._pending = {}    # (connection_id, request_id) -> ((collection, shape), getMore cursor id)
+        self._cursors = {}    # open cursor id -> (collection, shape)
+        self.histograms = {}  # (collection, shape) -> LatencyHistogram
+        self.slow_queries = deque(maxlen=slow_log_size or config.SLOW_QUERY_LOG_SIZE)
+        self.started_at = time.time()
+        self.registry = MetricsRegistry()
+        self._capture = threading.local()
+
+    @contextmanager
+    def capture(self):
+        """
+        Record the (command name, command) pairs this thread sends inside the
+        block (sync pymongo publishes events in the calling thread).
+        Used by IndexManager.verify to explain exactly what the models issue.
+        """
+        commands = []
+        self._capture.commands = commands
+        try:
+            yield commands
+        finally:
+            self._capture.commands = None
+
+    def started(self, event):
+        if event.command_name in IGNORED_COMMANDS:
+            return
+
+        captured = getattr(self._capture, "commands", None)
+        if captured is not None:
+            captured.append((event.command_name, dict(event.command)))
+
+        cursor_id = None
+        if event.command_name == "getMore":
+            cursor_id = event.command.get("getMore")
+            key = self._cursors.get(cursor_id)
+        else:
+            key = query_shape(event.command_name, event.command)
+
+        if key is not None:
+            with self._lock:
+                self._pending[(event.connection_id, event.request_id)] = (key, cursor_id)
+
+    @staticmethod
+    def _returned_docs(reply: dict) -> int:
+        cursor = reply.get("cursor")
+        if isinstance(cursor, dict):
+            return len(cursor.get("firstBatch", cursor.get("nextBatch", [])))
+        if "n" in reply:
+            return int(reply["n"])
+        return 1 if reply.get("value") is not None else 0
+
+    def succeeded(self, event):
+        with self._lock:
+            pending = self._pending.pop((event.connection_id, event.request_id), None)
+        if pending is None:
+            return
+        key, cursor_id = pending
+
+        duration_ms = event.duration_micros / 1000
+        docs = self._returned_docs(event.reply)
+        slow = duration_ms >= self.slow_threshold_ms
+        # re-encoding every reply costs CPU: opt-in, except for the (rare) slow queries
+        size = len(bson.encode(event.reply)) if self.measure_bytes or slow else 0
+
+        # per-rerun profile (sync pymongo publishes events in the calling thread)
+        profiler.record_query(duration_ms, docs)
+
+        labels = {"collection": key[0], "operation": event.command_name}
+        self.registry.inc("finance_mongo_queries_total", labels,
+                          help_text="MongoDB commands by collection and operation")
+        self.registry.observe("finance_mongo_query_duration_seconds", duration_ms / 1000, labels,
+                              help_text="MongoDB command duration")
+
+        with self._lock:
+            # remember open cursors so their getMore batches count for the same shape
+            cursor = event.reply.get("cursor")
+            if isinstance(cursor, dict) and cursor.get("id"):
+                if len(self._cursors) >= 10000:
+                    # cursors closed without being exhausted never report back
+                    self._cursors.clear()
+                self._cursors[cursor["id"]] = key
+            elif cursor_id is not None:
+                self._cursors.pop(cursor_id, None)
+
+            self.histograms.setdefault(key, LatencyHistogram()).observe(
+                duration_ms, docs, size if self.measure_bytes else 0
+            )
+
+            if slow:
+                self.slow_queries.append({
+                    "time": datetime.now().isoformat(timespec="seconds"),
+                    "collection": key[0],
+                    "shape": key[1],
+                    "duration_ms": round(duration_ms, 2),
+                    "docs": docs,
+                    "bytes": size
+                })
+
+    def failed(self, event):
+        with self._lock:
+            pending = self._pending.pop((event.connection_id, event.request_id), None)
+            if pending is not None:
+                histogram = self.histograms.setdefault(pending[0], LatencyHistogram())
+                histogram.errors += 1
+
+        if pending is not None:
+            self.registry.inc("finance_mongo_query_errors_total",
+                              {"collection": pending[0][0], "operation": event.command_name},
+                              help_text="Failed MongoDB commands by collection and operation")
+
+    def snapshot(self) -> dict:
+        """
+        Current metrics.
+
+        Returns:
+            dict with shapes ([{collection, shape, count, errors, avg/p50/p95/p99/max_ms,
+            docs, bytes}], slowest p95 first), slow_queries (newest first),
+            slow_threshold_ms and uptime_seconds
+        """
+        with self._lock:
+            shapes = [
+                {"collection": collection, "shape": shape, **histogram.to_dict()}
+                for (collection, shape), histogram in self.histograms.items()
+            ]
+            slow_queries = list(reversed(self.slow_queries))
+
+        shapes.sort(key=lambda row: row["p95_ms"], reverse=True)
+        return {
+            "shapes": shapes,
+            "slow_queries": slow_queries,
+            "slow_threshold_ms": self.slow_threshold_ms,
+            "uptime_seconds": time.time() - self.started_at
+        }
+
+    def export_json(self) -> str:
+        """snapshot() as JSON"""
+        return json.dumps(self.snapshot(), indent=2, default=str)
+
+    def reset(self):
+        """Clear histograms and the slow-query log"""
+        with self._lock:
+            self.histograms.clear()
+            self.slow_queries.clear()
+            self._cursors.clear()
+            self.started_at = time.time()
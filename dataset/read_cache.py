@@ -0,0 +1,169 @@
+from collections import OrderedDict
+import threading
+import bson
+from bson.errors import InvalidDocument
+from bson.objectid import ObjectId
+from dataset.database_manager import DatabaseManager
+import config
+from metrics import MetricsRegistry
+
+
+class ReadCache:
+    """
+    Process-wide LRU cache of model read results, keyed by
+    (user_id, query shape, data_version).
+
+    Each user document carries a data_version counter that every model
+    write bumps ($inc, see request_memo.invalidates_reads), so the version
+    is shared by all app processes and CLIs: a cached result stays valid
+    until the user's data actually changes, and old versions are simply
+    never asked for again.
+
+    Results are stored BSON-encoded, which gives an exact size for the
+    memory ceiling (config.READ_CACHE_MAX_MB) and hands every caller its
+    own copy of the documents. Results that cannot be encoded are not cached.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __new__(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = super(ReadCache, cls).__new__(cls)
+                cls._instance._initialize()
+        return cls._instance
+
+    def _initialize(self):
+        self.users = DatabaseManager().get_collection(config.COLLECTIONS['user'])
+        self.max_bytes = config.READ_CACHE_MAX_MB * 1024 * 1024
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # key -> (user_id, encoded result), least recently used first
+        self._keys_by_user = {}         # user_id -> set of keys (to drop a user's entries on write)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        MetricsRegistry().add_collector(self._collect)
+
+    # -- data versions --
+
+    def data_version(self, user_id):
+        """The user's data_version (0 for users without one, None if it cannot be read)"""
+        try:
+            user = self.users.find_one({"_id": ObjectId(user_id)}, {"data_version": 1})
+        except Exception as e:
+            print(f"Error reading data version: {e}")
+            return None
+        return (user or {}).get("data_version", 0)
+
+    def bump(self, user_id=None):
+        """
+        Increase the data_version of one user, of a list of users, or of every
+        user when user_id is None, and drop their cached entries. Called after
+        every model write.
+        """
+        user_ids = None
+        if user_id is not None:
+            user_ids = list(user_id) if isinstance(user_id, (list, tuple, set)) else [user_id]
+
+        try:
+            if user_ids is None:
+                self.users.update_many({}, {"$inc": {"data_version": 1}})
+            elif len(user_ids) == 1:
+                self.users.update_one({"_id": ObjectId(user_ids[0])}, {"$inc": {"data_version": 1}})
+            elif user_ids:
+                self.users.update_many(
+                    {"_id": {"$in": [ObjectId(user) for user in user_ids]}},
+                    {"$inc": {"data_version": 1}}
+                )
+        except Exception as e:
+            print(f"Error bumping data version: {e}")
+
+        with self._lock:
+            self.invalidations += 1
+            users = list(self._keys_by_user) if user_ids is None else [str(user) for user in user_ids]
+            for user in users:
+                for key in self._keys_by_user.pop(user, ()):
+                    _, encoded = self._entries.pop(key, (None, b""))
+                    self.bytes -= len(encoded)
+
+    # -- entries --
+
+    def get(self, key: tuple):
+        """
+        Cached result for a key built with the current data_version.
+
+        Returns:
+            (True, result) on a hit, (False, None) on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            encoded = entry[1]
+        return True, bson.decode(encoded)["v"]
+
+    def put(self, key: tuple, user_id, result):
+        """Store a result, evicting least recently used entries above the memory ceiling"""
+        try:
+            encoded = bson.encode({"v": result})
+        except (InvalidDocument, TypeError, OverflowError):
+            return  # not BSON-serializable (e.g. int dict keys): not cached
+        if len(encoded) > self.max_bytes:
+            return
+
+        user_id = str(user_id)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.bytes -= len(previous[1])
+            self._entries[key] = (user_id, encoded)
+            self._keys_by_user.setdefault(user_id, set()).add(key)
+            self.bytes += len(encoded)
+
+            while self.bytes > self.max_bytes:
+                old_key, (old_user, old_encoded) = self._entries.popitem(last=False)
+                self.bytes -= len(old_encoded)
+                self._keys_by_user.get(old_user, set()).discard(old_key)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+            self.bytes = 0
+
+    # -- reporting --
+
+    def _collect(self, registry):
+        """Scrape-time counters for the Prometheus endpoint"""
+        stats = self.stats()
+        registry.set_counter("finance_read_cache_hits_total", stats["hits"],
+                             help_text="Model reads served from the cross-rerun cache")
+        registry.set_counter("finance_read_cache_misses_total", stats["misses"],
+                             help_text="Model reads not found in the cross-rerun cache")
+        registry.set_counter("finance_read_cache_evictions_total", stats["evictions"],
+                             help_text="Entries evicted by the memory ceiling")
+        registry.set_gauge("finance_read_cache_hit_ratio", stats["hit_ratio"],
+                           help_text="Cross-rerun cache hit ratio since start")
+        registry.set_gauge("finance_read_cache_bytes", stats["bytes"],
+                           help_text="BSON size of the cached results")
+
+    def stats(self) -> dict:
+        """Hit/miss/eviction counters and memory use of the cache"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_ratio": self.hits / total if total else 0.0,
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes
+            }
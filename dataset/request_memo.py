@@ -0,0 +1,250 @@
+"""
+Per-rerun read memoization.
+
+Model read methods decorated with @memoized_read return the result of an
+identical earlier call (same method, user and normalized arguments) made
+during the same Streamlit script run instead of querying MongoDB again.
+Any method decorated with @invalidates_reads (every model write) clears the
+memo of the run, and reads issued while a write is in progress bypass it.
+
+Behind the run memo sits the cross-rerun ReadCache (dataset/read_cache.py),
+keyed by the user's data_version, which the same write decorator bumps.
+
+The memo is thread-local (Streamlit runs each script run in its own thread)
+and only active between start_run() and finish_run(); CLIs and benchmarks
+never open a run, so their reads always hit the database (their writes
+still bump data_version).
+
+Memoized results are shared by every caller in the run: treat them as
+read-only.
+"""
+
+import functools
+import inspect
+import threading
+from datetime import date, datetime
+from bson.objectid import ObjectId
+from dataset.read_cache import ReadCache
+import config
+from metrics import MetricsRegistry
+
+
+_local = threading.local()
+
+
+class RunMemo:
+    """Results and counters of one script run"""
+
+    def __init__(self):
+        self.results = {}
+        self.versions = {}     # user_id -> data_version, read once per run
+        self.write_depth = 0
+        self.hits = {}         # method -> reads served from the memo (round trips saved)
+        self.misses = 0
+        self.cache_hits = 0    # served by the cross-rerun ReadCache
+        self.invalidations = 0
+
+    def invalidate(self):
+        if self.results:
+            self.invalidations += 1
+        self.results.clear()
+        self.versions.clear()
+
+    def data_version(self, user_id: str) -> int:
+        if user_id not in self.versions:
+            self.versions[user_id] = ReadCache().data_version(user_id)
+        return self.versions[user_id]
+
+    def stats(self) -> dict:
+        return {
+            "hits": sum(self.hits.values()),
+            "misses": self.misses,
+            "cache_hits": self.cache_hits,
+            "invalidations": self.invalidations,
+            "hits_by_method": dict(self.hits)
+        }
+
+
+def current() -> "RunMemo | None":
+    """Memo of the run executing in this thread (None outside a run)"""
+    return getattr(_local, "memo", None)
+
+
+def start_run() -> RunMemo:
+    """Open a fresh memo for this script run (drops one left by an interrupted run)"""
+    _local.memo = RunMemo()
+    return _local.memo
+
+
+def finish_run() -> "dict | None":
+    """
+    Close the memo of this run and report its counters.
+
+    Returns:
+        dict with hits, misses, cache_hits, invalidations and hits_by_method
+        (None if no run was open)
+    """
+    memo = current()
+    if memo is None:
+        return None
+    _local.memo = None
+
+    registry = MetricsRegistry()
+    for method, count in memo.hits.items():
+        registry.inc("finance_request_memo_hits_total", {"method": method}, value=count,
+                     help_text="Model reads served from the per-rerun memo (round trips saved)")
+    registry.inc("finance_request_memo_misses_total", value=memo.misses,
+                 help_text="Memoizable model reads that went to MongoDB")
+    return memo.stats()
+
+
+def _normalize(value):
+    """Hashable, order-independent form of a method argument"""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, dict):
+        return tuple(sorted((str(key), _normalize(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted((_normalize(item) for item in value), key=repr))
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, ObjectId):
+        return str(value)
+    if hasattr(value, "collection"):
+        # a model passed as argument (e.g. get_budget_summary(transaction_model))
+        return (type(value).__name__, str(getattr(value, "user_id", None)))
+    return (type(value).__name__, id(value))
+
+
+def _user_of(self, arguments: dict):
+    """User whose data a model call reads or writes (explicit user_id argument first)"""
+    user_id = arguments.get("user_id") or getattr(self, "user_id", None)
+    return str(user_id) if user_id else None
+
+
+def memoized_read(func):
+    """
+    Serve repeated identical calls within one script run from the memo, and
+    calls repeated across reruns from the ReadCache (same data_version)
+    """
+    signature = inspect.signature(func)
+    method = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        memo = current()
+        if memo is None or memo.write_depth:
+            return func(self, *args, **kwargs)
+
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = {name: value for name, value in bound.arguments.items() if name != "self"}
+        user_id = _user_of(self, arguments)
+        key = (method, user_id, _normalize(arguments))
+
+        if key in memo.results:
+            memo.hits[method] = memo.hits.get(method, 0) + 1
+            return memo.results[key]
+
+        # "current month" defaults depend on the day, so the day is part of the key
+        cache_key = None
+        version = memo.data_version(user_id) if config.READ_CACHE_ENABLED and user_id else None
+        if version is not None:
+            cache_key = key + (version, date.today().isoformat())
+            found, result = ReadCache().get(cache_key)
+            if found:
+                memo.cache_hits += 1
+                memo.results[key] = result
+                return result
+
+        result = func(self, *args, **kwargs)
+        memo.misses += 1
+        memo.results[key] = result
+        if cache_key is not None:
+            ReadCache().put(cache_key, user_id, result)
+        return result
+    return wrapper
+
+
+# pending bump of every user (a write spanning all users)
+_ALL_USERS = "*"
+
+
+def _written_users(func, signature, args, kwargs) -> set:
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    arguments = dict(bound.arguments)
+    # writes spanning every user (e.g. reconcile_spent(all_users=True)) bump them all
+    if arguments.get("all_users"):
+        return {_ALL_USERS}
+    user_id = _user_of(args[0] if args else None, arguments)
+    return {user_id} if user_id else {_ALL_USERS}
+
+
+def _flush_bumps(users: set):
+    if not config.READ_CACHE_ENABLED or not users:
+        return
+    ReadCache().bump(None if _ALL_USERS in users else sorted(users))
+
+
+def bump_data_version(user_id=None):
+    """
+    Bump data_version after a write that does not go through a decorated
+    model method (default-category bootstrap, rollup rebuilds, data
+    generators). user_id may be a list; None bumps every user. Inside a
+    decorated write the bump is deferred to the end of the outermost one.
+    """
+    memo = current()
+    if memo is not None:
+        memo.invalidate()
+
+    if user_id is None:
+        users = {_ALL_USERS}
+    elif isinstance(user_id, (list, tuple, set)):
+        users = {str(user) for user in user_id}
+    else:
+        users = {str(user_id)}
+
+    if getattr(_local, "write_depth", 0):
+        _local.pending_bumps.update(users)
+    else:
+        _flush_bumps(users)
+
+
+def invalidates_reads(func):
+    """
+    Clear the run's memo around a write (reads inside the write are not
+    memoized) and bump the user's data_version once the write is done.
+    Nested decorated writes (e.g. delete_category_with_handling calling
+    upsert_category) bump once, when the outermost one returns.
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        memo = current()
+        if memo is not None:
+            memo.invalidate()
+            memo.write_depth += 1
+
+        depth = getattr(_local, "write_depth", 0)
+        if depth == 0:
+            _local.pending_bumps = set()
+        _local.write_depth = depth + 1
+        try:
+            return func(*args, **kwargs)
+        finally:
+            if memo is not None:
+                memo.write_depth -= 1
+                memo.invalidate()
+            _local.write_depth = depth
+            try:
+                _local.pending_bumps.update(_written_users(func, signature, args, kwargs))
+            except TypeError:
+                pass  # called with bad arguments: nothing was written
+            if depth == 0:
+                pending, _local.pending_bumps = _local.pending_bumps, None
+                _flush_bumps(pending)
+    return wrapper
@@ -0,0 +1,357 @@
+from dataset.database_manager import DatabaseManager
+from dataset.request_memo import bump_data_version
+import config
+from datetime import datetime
+from typing import Optional, List
+from bson.objectid import ObjectId
+from pymongo import UpdateOne
+from utils import handler_datetime
+
+
+collection_name = config.COLLECTIONS['monthly_rollup']
+
+# (user_id, year, month, type, category) identifies one rollup document
+ROLLUP_KEY = ['user_id', 'year', 'month', 'type', 'category']
+
+# Marker stored on the user document once the user's rollups were built from
+# their transactions; bump it to rebuild everyone's rollups on first read
+ROLLUPS_VERSION = 1
+
+
+class MonthlyRollupModel:
+    """
+    Materialized per-user, per-month, per-type, per-category sum/count/min/max
+    of transactions. Kept up to date by TransactionModel writes and fully
+    rebuildable with an aggregation ending in $merge.
+
+    Readers call ensure_built() first: a user whose transactions predate the
+    rollups (no rollups_version marker) is rebuilt once before the first read,
+    so whole-month sums are never read from an empty collection.
+    """
+    # (user_id, version) already built in this process
+    _built_users = set()
+
+    def __init__(self):
+        self.db_manager = DatabaseManager()
+        self.collection = self.db_manager.get_collection(collection_name=collection_name)
+        self.transaction_collection = self.db_manager.get_collection(config.COLLECTIONS['transaction'])
+        self.user_collection = self.db_manager.get_collection(config.COLLECTIONS['user'])
+
+    def ensure_built(self, user_id):
+        """Rebuild a user's rollups once if they were never built from the transactions"""
+        user_id = ObjectId(user_id)
+        marker = (user_id, ROLLUPS_VERSION)
+        if marker in MonthlyRollupModel._built_users:
+            return
+
+        if not self.user_collection.find_one({"_id": user_id, "rollups_version": ROLLUPS_VERSION}, {"_id": 1}):
+            self.rebuild(user_id=user_id)
+        MonthlyRollupModel._built_users.add(marker)
+
+    @staticmethod
+    def _bucket(transaction: dict) -> dict:
+        """Rollup key of the month bucket a transaction belongs to"""
+        trans_date = transaction.get('date')
+        if not isinstance(trans_date, datetime):
+            trans_date = handler_datetime(trans_date)
+
+        return {
+            'user_id': transaction.get('user_id'),
+            'year': trans_date.year,
+            'month': trans_date.month,
+            'type': transaction.get('type'),
+            'category': transaction.get('category')
+        }
+
+    @staticmethod
+    def _month_range(year: int, month: int) -> tuple[datetime, datetime]:
+        start_date = datetime(year, month, 1)
+        if month == 12:
+            return start_date, datetime(year + 1, 1, 1)
+        return start_date, datetime(year, month + 1, 1)
+
+    def apply_change(self, before: Optional[dict], after: Optional[dict], session=None):
+        """
+        Update the rollups touched by one transaction write.
+        Inserts are applied with $inc/$min/$max; updates and deletes recompute
+        the affected buckets, since min/max cannot be decremented.
+
+        Args:
+            before: Transaction document before the write (None for insert)
+            after: Transaction document after the write (None for delete)
+            session: Optional session of the surrounding transaction
+        """
+        if before is None and after is not None:
+            amount = after.get('amount', 0)
+            bucket = self._bucket(after)
+            self.collection.update_one(
+                bucket,
+                {
+                    '$inc': {'sum': amount, 'count': 1},
+                    '$min': {'min': amount},
+                    '$max': {'max': amount},
+                    '$set': {'last_modified': datetime.now()},
+                    '$unset': {'rebuild_id': ''},
+                    '$setOnInsert': {'period': datetime(bucket['year'], bucket['month'], 1)}
+                },
+                upsert=True,
+                session=session
+            )
+            return
+
+        buckets = [self._bucket(trans) for trans in (before, after) if trans]
+        for bucket in {tuple(b.items()): b for b in buckets}.values():
+            self.recompute_bucket(bucket, session=session)
+
+    def apply_inserts(self, transactions: List[dict]):
+        """Apply many inserted transactions with one unordered bulk_write (one upsert per bucket)"""
+        totals = {}
+        for trans in transactions:
+            bucket = self._bucket(trans)
+            key = tuple(bucket.items())
+            amount = trans.get('amount', 0)
+            if key not in totals:
+                totals[key] = {'bucket': bucket, 'sum': 0, 'count': 0, 'min': amount, 'max': amount}
+            entry = totals[key]
+            entry['sum'] += amount
+            entry['count'] += 1
+            entry['min'] = min(entry['min'], amount)
+            entry['max'] = max(entry['max'], amount)
+
+        if not totals:
+            return
+
+        now = datetime.now()
+        self.collection.bulk_write(
+            [
+                UpdateOne(
+                    entry['bucket'],
+                    {
+                        '$inc': {'sum': entry['sum'], 'count': entry['count']},
+                        '$min': {'min': entry['min']},
+                        '$max': {'max': entry['max']},
+                        '$set': {'last_modified': now},
+                        '$unset': {'rebuild_id': ''},
+                        '$setOnInsert': {'period': datetime(entry['bucket']['year'], entry['bucket']['month'], 1)}
+                    },
+                    upsert=True
+                )
+                for entry in totals.values()
+            ],
+            ordered=False
+        )
+
+    def recompute_bucket(self, bucket: dict, session=None):
+        """Recompute one rollup document from raw transactions"""
+        start_date, end_date = self._month_range(bucket['year'], bucket['month'])
+
+        pipeline = [
+            {
+                "$match": {
+                    "user_id": bucket['user_id'],
+                    "category": bucket['category'],
+                    "type": bucket['type'],
+                    "date": {"$gte": start_date, "$lt": end_date}
+                }
+            },
+            {
+                "$group": {
+                    "_id": None,
+                    "sum": {"$sum": "$amount"},
+                    "count": {"$sum": 1},
+                    "min": {"$min": "$amount"},
+                    "max": {"$max": "$amount"}
+                }
+            }
+        ]
+        result = list(self.transaction_collection.aggregate(pipeline, session=session))
+
+        if not result:
+            self.collection.delete_one(bucket, session=session)
+            return
+
+        totals = result[0]
+        self.collection.update_one(
+            bucket,
+            {
+                '$set': {
+                    'sum': totals['sum'],
+                    'count': totals['count'],
+                    'min': totals['min'],
+                    'max': totals['max'],
+                    'period': start_date,
+                    'last_modified': datetime.now()
+                },
+                '$unset': {'rebuild_id': ''}
+            },
+            upsert=True,
+            session=session
+        )
+
+    def rebuild(self, user_id: Optional[str] = None, categories: Optional[List[str]] = None) -> int:
+        """
+        Rebuild rollups from scratch with an aggregation ending in $merge.
+        ($merge cannot run inside a multi-document transaction.)
+
+        Buckets are replaced in place, then the buckets the rebuild did not
+        produce (their transactions are gone) are deleted, so readers never
+        see an empty or partial set of rollups: every existing bucket of the
+        scope is first tagged with this run's rebuild_id, the $merge replaces
+        the buckets it produces (dropping the tag) and incremental writes
+        $unset it, so whatever still carries the tag afterwards is stale.
+        A transaction written while the aggregation runs can still be
+        overwritten by the $merge; run rebuilds when writes are quiet.
+
+        Args:
+            user_id: Only rebuild this user's rollups (default: every user)
+            categories: Only rebuild these categories (default: all)
+
+        Returns:
+            Number of rollup documents after the rebuild
+        """
+        scope = {}
+        if user_id is not None:
+            scope['user_id'] = ObjectId(user_id)
+        if categories is not None:
+            scope['category'] = {'$in': categories}
+
+        # tag the existing buckets; no clock involved, so two rebuilds of the
+        # same scope (even within one second) never mistake each other's buckets
+        rebuild_id = ObjectId()
+        self.collection.update_many(scope, {'$set': {'rebuild_id': rebuild_id}})
+
+        pipeline = [
+            {"$match": scope},
+            {
+                "$group": {
+                    "_id": {
+                        "user_id": "$user_id",
+                        "year": {"$year": "$date"},
+                        "month": {"$month": "$date"},
+                        "type": "$type",
+                        "category": "$category"
+                    },
+                    "sum": {"$sum": "$amount"},
+                    "count": {"$sum": 1},
+                    "min": {"$min": "$amount"},
+                    "max": {"$max": "$amount"}
+                }
+            },
+            {
+                "$project": {
+                    "_id": 0,
+                    "user_id": "$_id.user_id",
+                    "year": "$_id.year",
+                    "month": "$_id.month",
+                    "type": "$_id.type",
+                    "category": "$_id.category",
+                    "period": {"$dateFromParts": {"year": "$_id.year", "month": "$_id.month"}},
+                    "sum": 1,
+                    "count": 1,
+                    "min": 1,
+                    "max": 1,
+                    # same (application) clock as the incremental writes
+                    "last_modified": datetime.now()
+                }
+            },
+            {
+                "$merge": {
+                    "into": collection_name,
+                    "on": ROLLUP_KEY,
+                    "whenMatched": "replace",
+                    "whenNotMatched": "insert"
+                }
+            }
+        ]
+        self.transaction_collection.aggregate(pipeline)
+
+        # stale buckets: tagged above, not produced by the $merge, not written since
+        self.collection.delete_many({**scope, 'rebuild_id': rebuild_id})
+
+        # a full rebuild of a user (or of everyone) makes the marker valid
+        if categories is None:
+            self.user_collection.update_many(
+                {'_id': scope['user_id']} if user_id is not None else {},
+                {'$set': {'rollups_version': ROLLUPS_VERSION}}
+            )
+        # the rebuilt sums are not written by a decorated model method
+        bump_data_version(scope.get('user_id'))
+
+        return self.collection.count_documents(scope)
+
+    def rename_category(self, user_id, old_name: str, new_name: str, session=None) -> int:
+        """Follow a category rename (transactions keep the same buckets)"""
+        result = self.collection.update_many(
+            {'user_id': user_id, 'category': old_name},
+            {'$set': {'category': new_name, 'last_modified': datetime.now()}, '$unset': {'rebuild_id': ''}},
+            session=session
+        )
+        return result.modified_count
+
+    def delete_by_user(self, user_id, category: Optional[str] = None, session=None) -> int:
+        """Delete a user's rollups (optionally only one category)"""
+        query = {'user_id': user_id}
+        if category is not None:
+            query['category'] = category
+        result = self.collection.delete_many(query, session=session)
+        return result.deleted_count
+
+    def get_monthly_totals(
+        self,
+        user_id,
+        start_period: datetime,
+        end_period: datetime,
+        transaction_type: Optional[str] = None
+    ) -> List[dict]:
+        """
+        Get per-month, per-type sums for whole months in [start_period, end_period)
+
+        Returns:
+            List of {month (datetime, first day), type, amount, count}
+        """
+        self.ensure_built(user_id)
+
+        match = {
+            'user_id': ObjectId(user_id),
+            'period': {'$gte': start_period, '$lt': end_period}
+        }
+        if transaction_type:
+            match['type'] = transaction_type
+
+        pipeline = [
+            {"$match": match},
+            {
+                "$group": {
+                    "_id": {"month": "$period", "type": "$type"},
+                    "amount": {"$sum": "$sum"},
+                    "count": {"$sum": "$count"}
+                }
+            },
+            {"$sort": {"_id.month": 1}}
+        ]
+
+        return [
+            {
+                'month': row['_id']['month'],
+                'type': row['_id']['type'],
+                'amount': row['amount'],
+                'count': row['count']
+            }
+            for row in self.collection.aggregate(pipeline)
+        ]
+
+    def get_bucket_sum(self, user_id, category: str, transaction_type: str, month: int, year: int) -> float:
+        """Sum of one (user, year, month, type, category) bucket"""
+        self.ensure_built(user_id)
+
+        doc = self.collection.find_one(
+            {
+                'user_id': ObjectId(user_id),
+                'year': year,
+                'month': month,
+                'type': transaction_type,
+                'category': category
+            },
+            {'sum': 1}
+        )
+        return float(doc['sum']) if doc else 0.0
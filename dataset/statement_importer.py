@@ -0,0 +1,286 @@
+import csv
+import hashlib
+import re
+from datetime import datetime
+from typing import Iterator, Optional, TextIO
+from utils import handler_datetime
+
+
+# Fallback categories for rows without a (known) category column
+DEFAULT_IMPORT_CATEGORIES = {
+    "Expense": "Others",
+    "Income": "Other Income",
+}
+
+# transactions schema field -> accepted CSV headers (case-insensitive)
+DEFAULT_COLUMN_MAP = {
+    "date": ["date", "transaction date", "posting date", "posted date", "ngày"],
+    "amount": ["amount", "số tiền"],
+    "debit": ["debit", "withdrawal", "chi"],
+    "credit": ["credit", "deposit", "thu"],
+    "description": ["description", "memo", "payee", "details", "mô tả"],
+    "category": ["category", "danh mục"],
+    "type": ["type", "loại"],
+}
+
+# date formats tried (after ISO) when no explicit date_format is given
+DATE_FORMATS = ["%d/%m/%Y", "%d-%m-%Y", "%m/%d/%Y", "%Y/%m/%d", "%d.%m.%Y"]
+
+OFX_TAG_RE = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+
+
+def _parse_amount(value) -> Optional[float]:
+    """Parse '1,234.50', '$-12', '(12.00)' -> float (None if empty)"""
+    if value is None:
+        return None
+    text = str(value).strip()
+    if not text:
+        return None
+
+    negative = text.startswith("(") and text.endswith(")")
+    text = re.sub(r"[^\d.\-]", "", text)
+    amount = float(text)
+    return -amount if negative else amount
+
+
+def _cell(row: dict, column: Optional[str]) -> str:
+    """Stripped value of a mapped column ('' when the column is unmapped or the row is short)"""
+    if column is None:
+        return ""
+    value = row.get(column)
+    # extra fields of a long row are a list under the key None; never read them
+    return value.strip() if isinstance(value, str) else ""
+
+
+def _parse_date(value: str, date_format: Optional[str] = None) -> datetime:
+    """Parse a statement date with an explicit format, ISO, or a few common formats"""
+    value = value.strip()
+    if date_format:
+        return datetime.strptime(value, date_format)
+
+    try:
+        return handler_datetime(value)
+    except ValueError:
+        pass
+
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognized date '{value}'")
+
+
+def iter_csv_rows(stream: TextIO, column_map: dict = None, date_format: str = None) -> Iterator[dict]:
+    """
+    Stream a CSV statement row by row, mapped to the transactions schema.
+
+    Yields:
+        {line, date, amount (signed), description, category, type, fitid}
+        or {line, error} when a row cannot be parsed
+    """
+    column_map = column_map or DEFAULT_COLUMN_MAP
+    reader = csv.DictReader(stream)
+
+    # resolve header names once
+    headers = {header.strip().lower(): header for header in (reader.fieldnames or [])}
+    columns = {}
+    for field, candidates in column_map.items():
+        for candidate in candidates:
+            if candidate.lower() in headers:
+                columns[field] = headers[candidate.lower()]
+                break
+
+    if "date" not in columns or not ({"amount", "debit", "credit"} & columns.keys()):
+        raise ValueError("CSV must have a date column and an amount (or debit/credit) column")
+
+    for line, row in enumerate(reader, start=2):
+        try:
+            if "amount" in columns:
+                amount = _parse_amount(_cell(row, columns["amount"]))
+            else:
+                credit = _parse_amount(_cell(row, columns.get("credit"))) or 0
+                debit = _parse_amount(_cell(row, columns.get("debit"))) or 0
+                amount = credit - abs(debit)
+            if amount is None:
+                raise ValueError("Missing amount")
+
+            yield {
+                "line": line,
+                "date": _parse_date(_cell(row, columns["date"]), date_format),
+                "amount": amount,
+                "description": _cell(row, columns.get("description")),
+                "category": _cell(row, columns.get("category")) or None,
+                "type": _cell(row, columns.get("type")) or None,
+                "fitid": None
+            }
+        except ValueError as e:
+            yield {"line": line, "error": str(e)}
+
+
+def _iter_ofx_tokens(stream: TextIO, chunk_size: int = 65536) -> Iterator[tuple]:
+    """Tokenize OFX (SGML or XML) into (is_closing, tag, text) reading fixed-size chunks"""
+    buffer = ""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        buffer += chunk
+
+        # keep the last (possibly incomplete) tag for the next chunk
+        cut = buffer.rfind("<")
+        complete, buffer = buffer[:cut], buffer[cut:]
+        for match in OFX_TAG_RE.finditer(complete):
+            yield match.group(1) == "/", match.group(2).upper(), match.group(3).strip()
+
+    for match in OFX_TAG_RE.finditer(buffer):
+        yield match.group(1) == "/", match.group(2).upper(), match.group(3).strip()
+
+
+def iter_ofx_rows(stream: TextIO) -> Iterator[dict]:
+    """
+    Stream the <STMTTRN> records of an OFX/QFX statement.
+
+    Yields:
+        Same shape as iter_csv_rows ('line' is the record number)
+    """
+    current = None
+    record = 0
+
+    for is_closing, tag, text in _iter_ofx_tokens(stream):
+        if tag == "STMTTRN":
+            if not is_closing:
+                current = {}
+                record += 1
+                continue
+            if current is None:
+                continue
+
+            try:
+                amount = _parse_amount(current.get("TRNAMT"))
+                if amount is None:
+                    raise ValueError("Missing TRNAMT")
+
+                yield {
+                    "line": record,
+                    # DTPOSTED: YYYYMMDD[HHMMSS[.XXX]][TZ]
+                    "date": datetime.strptime(current.get("DTPOSTED", "")[:8], "%Y%m%d"),
+                    "amount": amount,
+                    "description": current.get("NAME") or current.get("MEMO") or "",
+                    "category": None,
+                    "type": None,
+                    "fitid": current.get("FITID")
+                }
+            except ValueError as e:
+                yield {"line": record, "error": str(e)}
+            current = None
+
+        elif current is not None and not is_closing and text:
+            current[tag] = text
+
+
+class StatementImporter:
+    """
+    Import CSV / OFX bank statements into transactions.
+    Parses in a streaming fashion and writes through
+    TransactionModel.add_transactions_bulk in batches; every row carries a
+    content fingerprint (unique per user) so re-importing an overlapping
+    statement only adds the new rows.
+    """
+
+    def __init__(self, transaction_model, category_model, batch_size: int = None,
+                 date_format: str = None, column_map: dict = None):
+        self.transaction_model = transaction_model
+        self.category_model = category_model
+        self.batch_size = batch_size
+        self.date_format = date_format
+        self.column_map = column_map
+
+    def _fingerprint(self, row: dict, occurrence: int) -> str:
+        """Stable hash of the row content (or the bank's FITID) for dedupe"""
+        if row.get("fitid"):
+            key = f"fitid|{row['fitid']}"
+        else:
+            key = "|".join([
+                row["date"].date().isoformat(),
+                f"{row['amount']:.2f}",
+                " ".join(row["description"].lower().split()),
+                str(occurrence)
+            ])
+        return hashlib.sha256(f"{self.transaction_model.user_id}|{key}".encode()).hexdigest()
+
+    def _to_transaction(self, row: dict, occurrences: dict) -> dict:
+        transaction_type = row["type"] if row["type"] in DEFAULT_IMPORT_CATEGORIES else (
+            "Income" if row["amount"] > 0 else "Expense"
+        )
+
+        # identical rows in one statement (two coffees the same day) stay distinct;
+        # counted over the whole stream, so unsorted statements number them right too
+        content_key = (row["date"].date(), round(row["amount"], 2), row["description"].lower())
+        occurrences[content_key] = occurrences.get(content_key, 0) + 1
+
+        return {
+            "type": transaction_type,
+            "category": row["category"] or DEFAULT_IMPORT_CATEGORIES[transaction_type],
+            "amount": abs(row["amount"]),
+            "date": row["date"],
+            "description": row["description"],
+            "fingerprint": self._fingerprint(row, occurrences[content_key])
+        }
+
+    def import_stream(self, stream: TextIO, file_format: str) -> dict:
+        """
+        Import a statement.
+
+        Args:
+            stream: Text stream of the file
+            file_format: 'csv' or 'ofx' ('qfx' is treated as ofx)
+
+        Returns:
+            dict with rows, imported, duplicates and errors ([{line, error}], first 100)
+        """
+        file_format = file_format.lower()
+        if file_format == "csv":
+            rows = iter_csv_rows(stream, self.column_map, self.date_format)
+        elif file_format in ("ofx", "qfx"):
+            rows = iter_ofx_rows(stream)
+        else:
+            raise ValueError(f"Unsupported statement format '{file_format}'")
+
+        # make sure the fallback categories exist
+        for category_type, category_name in DEFAULT_IMPORT_CATEGORIES.items():
+            self.category_model.upsert_category(category_type=category_type, category_name=category_name)
+
+        summary = {"rows": 0, "imported": 0, "duplicates": 0, "errors": []}
+        occurrences = {}
+        batch, lines = [], []
+
+        def flush():
+            results = self.transaction_model.add_transactions_bulk(batch, chunk_size=self.batch_size)
+            for line, result in zip(lines, results):
+                if result["duplicate"]:
+                    summary["duplicates"] += 1
+                elif result["success"]:
+                    summary["imported"] += 1
+                elif len(summary["errors"]) < 100:
+                    summary["errors"].append({"line": line, "error": result["error"]})
+            batch.clear()
+            lines.clear()
+
+        batch_size = self.batch_size or 1000
+        for row in rows:
+            summary["rows"] += 1
+            if "error" in row:
+                if len(summary["errors"]) < 100:
+                    summary["errors"].append({"line": row["line"], "error": row["error"]})
+                continue
+
+            batch.append(self._to_transaction(row, occurrences))
+            lines.append(row["line"])
+            if len(batch) >= batch_size:
+                flush()
+
+        if batch:
+            flush()
+
+        return summary
@@ -0,0 +1,131 @@
+import csv
+from datetime import datetime
+from typing import BinaryIO, Optional, TextIO, Union
+import config
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional
+    pa = None
+    pq = None
+
+
+# Exported columns, in file order (also the cursor projection)
+EXPORT_FIELDS = ["date", "type", "category", "amount", "description", "created_at"]
+
+EXPORT_FORMATS = ["csv", "parquet"]
+
+
+def parquet_available() -> bool:
+    """True if pyarrow is installed"""
+    return pa is not None
+
+
+def _format_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    return "" if value is None else value
+
+
+class TransactionExporter:
+    """
+    Export a user's transaction history to CSV or Parquet.
+    Reads through TransactionModel.iter_transactions (server cursor with a
+    projection) and writes batch by batch, so memory stays bounded by
+    batch_size no matter how long the history is.
+    """
+
+    def __init__(self, transaction_model, batch_size: Optional[int] = None):
+        self.transaction_model = transaction_model
+        self.batch_size = batch_size or config.EXPORT_BATCH_SIZE
+        self.projection = {field: 1 for field in EXPORT_FIELDS}
+        self.projection["_id"] = 0
+
+    def _iter_rows(self, advanced_filters: Optional[dict] = None):
+        return self.transaction_model.iter_transactions(
+            advanced_filters,
+            projection=self.projection,
+            batch_size=self.batch_size
+        )
+
+    def write_csv(self, stream: TextIO, advanced_filters: Optional[dict] = None) -> int:
+        """
+        Write transactions as CSV.
+
+        Args:
+            stream: Text stream opened with newline=""
+            advanced_filters: Same filters as TransactionModel.get_transactions
+
+        Returns:
+            Number of rows written
+        """
+        writer = csv.writer(stream)
+        writer.writerow(EXPORT_FIELDS)
+
+        count = 0
+        batch = []
+        for trans in self._iter_rows(advanced_filters):
+            batch.append([_format_value(trans.get(field)) for field in EXPORT_FIELDS])
+            if len(batch) >= self.batch_size:
+                writer.writerows(batch)
+                count += len(batch)
+                batch.clear()
+
+        writer.writerows(batch)
+        return count + len(batch)
+
+    def write_parquet(self, sink: Union[str, BinaryIO], advanced_filters: Optional[dict] = None) -> int:
+        """
+        Write transactions as Parquet, one row group per batch.
+
+        Args:
+            sink: File path or binary stream
+            advanced_filters: Same filters as TransactionModel.get_transactions
+
+        Returns:
+            Number of rows written
+
+        Raises:
+            RuntimeError: If pyarrow is not installed
+        """
+        if not parquet_available():
+            raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)")
+
+        schema = pa.schema([
+            ("date", pa.timestamp("ms")),
+            ("type", pa.string()),
+            ("category", pa.string()),
+            ("amount", pa.float64()),
+            ("description", pa.string()),
+            ("created_at", pa.timestamp("ms")),
+        ])
+
+        def flush(columns):
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+            for values in columns.values():
+                values.clear()
+
+        count = 0
+        columns = {field: [] for field in EXPORT_FIELDS}
+        with pq.ParquetWriter(sink, schema) as writer:
+            for trans in self._iter_rows(advanced_filters):
+                for field in EXPORT_FIELDS:
+                    columns[field].append(trans.get(field))
+                count += 1
+                if len(columns["date"]) >= self.batch_size:
+                    flush(columns)
+
+            # an empty export still gets a valid (schema-only) file
+            if columns["date"] or count == 0:
+                flush(columns)
+
+        return count
+
+    def export(self, sink, file_format: str, advanced_filters: Optional[dict] = None) -> int:
+        """Write transactions in `file_format` ('csv' needs a text sink, 'parquet' a binary one)"""
+        if file_format == "csv":
+            return self.write_csv(sink, advanced_filters)
+        if file_format == "parquet":
+            return self.write_parquet(sink, advanced_filters)
+        raise ValueError(f"Unsupported export format '{file_format}'")
@@ -1,9 +1,16 @@
 from typing import Optional, Any
 from datetime import datetime, date
+import base64
+import json
+from bson.errors import InvalidId
 from bson.objectid import ObjectId
 from .database_manager import DatabaseManager
+from .rollup_model import MonthlyRollupModel
+from .category_cache import CategoryCache
+from .request_memo import memoized_read, invalidates_reads
 import config
-from pymongo import DESCENDING, ASCENDING
+from pymongo import DESCENDING, ASCENDING, ReturnDocument, InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
 from utils import handler_datetime
 
 
@@ -12,12 +19,14 @@ class TransactionModel:
     def __init__(self, user_id: Optional[str] = None):
         self.db_manager = DatabaseManager()
         self.collection = self.db_manager.get_collection(config.COLLECTIONS["transaction"])
+        self.rollup_model = MonthlyRollupModel()
         self.user_id = user_id
 
     def set_user_id(self, user_id: Optional[str]):
         """Set or clear the current user id used to scope queries."""
         self.user_id = ObjectId(user_id) if user_id is not None else None
     
+    @memoized_read
     def get_transactions(
         self,
         advanced_filters: dict[str, any] = None
@@ -30,6 +39,101 @@ class TransactionModel:
         cursor = self.collection.find(query).sort("created_at", -1)
         return list(cursor)     
     
+    def iter_transactions(
+        self,
+        advanced_filters: dict[str, any] = None,
+        projection: Optional[dict] = None,
+        batch_size: Optional[int] = None
+    ):
+        """
+        Stream transactions (newest first) from a server cursor instead of
+        materializing a list like get_transactions.
+        
+        Args:
+            advanced_filters: Same filters as get_transactions
+            projection: Fields to return (default: whole documents)
+            batch_size: Documents fetched per round trip (default: config.EXPORT_BATCH_SIZE)
+        
+        Yields:
+            Transaction documents
+        """
+        query = self._build_query(advanced_filters)
+        
+        cursor = self.collection.find(query, projection).sort(
+            [("created_at", DESCENDING), ("_id", DESCENDING)]
+        ).batch_size(batch_size or config.EXPORT_BATCH_SIZE)
+        
+        with cursor:
+            yield from cursor
+    
+    @memoized_read
+    def get_transactions_page(
+        self,
+        advanced_filters: dict[str, any] = None,
+        after: Optional[str] = None,
+        limit: int = 20
+    ) -> dict:
+        """
+        Get one page of transactions, newest first, using keyset pagination
+        on (created_at, _id) instead of skip/limit.
+        
+        Args:
+            advanced_filters: Same filters as get_transactions
+            after: Continuation token returned by the previous page (None = first page)
+            limit: Page size
+        
+        Returns:
+            dict with 'transactions' and 'next_cursor' (None on the last page)
+        
+        Raises:
+            ValueError: If the continuation token is invalid
+        """
+        query = self._build_query(advanced_filters)
+        
+        # Continue strictly after the last (created_at, _id) of the previous page
+        if after:
+            last_created_at, last_id = self._decode_page_cursor(after)
+            query["$and"].append({
+                "$or": [
+                    {"created_at": {"$lt": last_created_at}},
+                    {"created_at": last_created_at, "_id": {"$lt": last_id}}
+                ]
+            })
+        
+        # Fetch one extra document to know whether another page exists
+        cursor = self.collection.find(query).sort(
+            [("created_at", DESCENDING), ("_id", DESCENDING)]
+        ).limit(limit + 1)
+        transactions = list(cursor)
+        
+        next_cursor = None
+        if len(transactions) > limit:
+            transactions = transactions[:limit]
+            next_cursor = self._encode_page_cursor(transactions[-1])
+        
+        return {
+            "transactions": transactions,
+            "next_cursor": next_cursor
+        }
+    
+    @staticmethod
+    def _encode_page_cursor(transaction: dict) -> str:
+        """Build an opaque continuation token from the last document of a page"""
+        payload = {
+            "c": transaction["created_at"].isoformat(),
+            "i": str(transaction["_id"])
+        }
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+    
+    @staticmethod
+    def _decode_page_cursor(token: str) -> tuple[datetime, ObjectId]:
+        """Decode a continuation token into (created_at, _id)"""
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode()))
+            return datetime.fromisoformat(payload["c"]), ObjectId(payload["i"])
+        except (ValueError, KeyError, TypeError, InvalidId):
+            raise ValueError("Invalid page cursor")
+    
     def _build_query(self, advanced_filter: Optional[dict]) -> dict:
         conditions = []
         if not advanced_filter:
@@ -103,23 +207,15 @@ class TransactionModel:
         if not self.user_id:
             raise ValueError("User ID must be set before validating category")
         
-        # Get category collection
-        category_collection = self.db_manager.get_collection(config.COLLECTIONS['category'])
-        
-        # Check if category exists and type matches
-        existing_category = category_collection.find_one({
-            'user_id': self.user_id,
-            'name': category,
-            'type': transaction_type
-        })
-        
-        if not existing_category:
+        # Check if category exists and type matches (per-user category cache)
+        if not CategoryCache().has_category(self.user_id, category, transaction_type):
             raise ValueError(
                 f"Category '{category}' không tồn tại hoặc không khớp với transaction type '{transaction_type}'"
             )
         
         return True
     
+    @invalidates_reads
     def add_transaction(
         self,
         transaction_type: str,
@@ -162,13 +258,176 @@ class TransactionModel:
             'user_id': self.user_id ## added user_id field
         }
 
+        def insert(session):
+            result = self.collection.insert_one(transaction, session=session)
+            self._sync_derived_data(None, transaction, session)
+            return result.inserted_id
+
         try:
-            result = self.collection.insert_one(transaction)
-            return str(result.inserted_id)
+            return str(self.db_manager.run_transaction(insert))
         except Exception as e:
             print(f"Error adding transaction: {e}")
             return None
     
+    @invalidates_reads
+    def add_transactions_bulk(
+        self,
+        rows: list[dict],
+        chunk_size: int = None
+    ) -> list[dict]:
+        """
+        Add many transactions at once (imports, sample data).
+        ✅ Validate tất cả (category, type) bằng 1 query $in, insert bằng insert_many (unordered) theo chunk
+        
+        Each chunk is written without a multi-document transaction (batches can
+        exceed transaction limits); budget counters and monthly rollups are
+        updated right after each chunk.
+        
+        Rows carrying a 'fingerprint' are upserted on (user_id, fingerprint)
+        instead of inserted, so re-importing the same statement is idempotent.
+        
+        Args:
+            rows: list of dicts with type, category, amount, date and optional
+                  description / fingerprint
+            chunk_size: Documents per write call (default: config.BULK_INSERT_CHUNK_SIZE)
+        
+        Returns:
+            One result per row, in order: {index, success, duplicate, id, error}
+        """
+        if not self.user_id:
+            raise ValueError("User ID must be set before adding transactions")
+        
+        chunk_size = chunk_size or config.BULK_INSERT_CHUNK_SIZE
+        results = [{'index': i, 'success': False, 'duplicate': False, 'id': None, 'error': None}
+                   for i in range(len(rows))]
+        
+        # ✅ VALIDATION: 1 query $in cho tất cả category names
+        category_collection = self.db_manager.get_collection(config.COLLECTIONS['category'])
+        names = list({row.get('category') for row in rows})
+        valid_pairs = {
+            (cate['name'], cate['type'])
+            for cate in category_collection.find(
+                {'user_id': self.user_id, 'name': {'$in': names}},
+                {'name': 1, 'type': 1}
+            )
+        }
+        
+        # Build documents, recording per-row validation errors
+        now = datetime.now()
+        documents = []  # (row index, document)
+        for i, row in enumerate(rows):
+            transaction_type = row.get('type')
+            category = row.get('category')
+            amount = row.get('amount')
+            
+            try:
+                if transaction_type not in config.TRANSACTION_TYPES:
+                    raise ValueError(f"Invalid transaction type '{transaction_type}'")
+                if (category, transaction_type) not in valid_pairs:
+                    raise ValueError(
+                        f"Category '{category}' không tồn tại hoặc không khớp với transaction type '{transaction_type}'"
+                    )
+                if not isinstance(amount, (int, float)) or amount <= 0:
+                    raise ValueError(f"Invalid amount '{amount}'")
+                transaction_date = handler_datetime(row.get('date'))
+            except (ValueError, TypeError) as e:
+                results[i]['error'] = str(e)
+                continue
+            
+            document = {
+                'type': transaction_type,
+                'category': category,
+                'amount': amount,
+                'date': transaction_date,
+                'description': row.get('description', ''),
+                'created_at': now,
+                'last_modified': now,
+                'user_id': self.user_id
+            }
+            if row.get('fingerprint'):
+                document['fingerprint'] = row['fingerprint']
+            documents.append((i, document))
+        
+        # Write chunk by chunk (unordered); one bad document does not abort the batch
+        for offset in range(0, len(documents), chunk_size):
+            chunk = documents[offset:offset + chunk_size]
+            failed = {}
+            upserted = {}
+            
+            requests = []
+            for _, doc in chunk:
+                if 'fingerprint' in doc:
+                    new_fields = {k: v for k, v in doc.items() if k not in ('user_id', 'fingerprint')}
+                    requests.append(UpdateOne(
+                        {'user_id': self.user_id, 'fingerprint': doc['fingerprint']},
+                        {'$setOnInsert': new_fields},
+                        upsert=True
+                    ))
+                else:
+                    requests.append(InsertOne(doc))
+            
+            try:
+                result = self.collection.bulk_write(requests, ordered=False)
+                upserted = result.upserted_ids
+            except BulkWriteError as e:
+                failed = {error['index']: error for error in e.details.get('writeErrors', [])}
+                upserted = {item['index']: item['_id'] for item in e.details.get('upserted', [])}
+            except Exception as e:
+                print(f"Error adding transactions: {e}")
+                failed = {position: {'errmsg': str(e)} for position in range(len(chunk))}
+            
+            inserted = []
+            for position, (i, doc) in enumerate(chunk):
+                error = failed.get(position)
+                fingerprinted = 'fingerprint' in doc
+                
+                if error and not (fingerprinted and error.get('code') == 11000):
+                    results[i]['error'] = error.get('errmsg', 'write error')
+                    continue
+                
+                results[i]['success'] = True
+                if fingerprinted and position not in upserted:
+                    # already imported (matched, or lost a concurrent upsert race)
+                    results[i]['duplicate'] = True
+                    continue
+                
+                doc['_id'] = upserted.get(position, doc.get('_id'))
+                results[i]['id'] = str(doc['_id'])
+                inserted.append(doc)
+            
+            self._sync_derived_data_bulk(inserted)
+        
+        return results
+    
+    def _sync_derived_data_bulk(self, inserted: list[dict]):
+        """Apply many inserted transactions to budget counters and rollups in one bulk_write each."""
+        if not inserted:
+            return
+        
+        # Budget spent counters: one $inc per (category, month, year)
+        spent = {}
+        for trans in inserted:
+            if trans['type'] == 'Expense':
+                key = (trans['category'], trans['date'].month, trans['date'].year)
+                spent[key] = spent.get(key, 0) + trans['amount']
+        
+        if spent:
+            budget_collection = self.db_manager.get_collection(config.COLLECTIONS['budget'])
+            budget_collection.bulk_write(
+                [
+                    UpdateOne(
+                        {'user_id': self.user_id, 'category': category, 'month': month,
+                         'year': year, 'is_active': True},
+                        {'$inc': {'spent': amount}}
+                    )
+                    for (category, month, year), amount in spent.items()
+                ],
+                ordered=False
+            )
+        
+        self.rollup_model.apply_inserts(inserted)
+    
+    @invalidates_reads
     def update_transaction(
         self,
         transaction_id: str,
@@ -208,8 +467,18 @@ class TransactionModel:
             # Build filter and scope by user if available
             filter_ = {'_id': ObjectId(transaction_id),
                        'user_id': self.user_id} # added user_id constraint
-            result = self.collection.update_one(filter_, {'$set': kwargs})
-            return result.modified_count > 0
+            def update(session):
+                before = self.collection.find_one_and_update(
+                    filter_,
+                    {'$set': kwargs},
+                    return_document=ReturnDocument.BEFORE,
+                    session=session
+                )
+                if before:
+                    self._sync_derived_data(before, {**before, **kwargs}, session)
+                return before
+            
+            return self.db_manager.run_transaction(update) is not None
         except ValueError:
             # Re-raise ValueError (validation errors)
             raise
@@ -217,6 +486,7 @@ class TransactionModel:
             print(f"Error updating transaction: {e}")
             return False
     
+    @invalidates_reads
     def delete_transaction(self, transaction_id: str) -> bool:
         """
         Delete a transaction.
@@ -231,12 +501,54 @@ class TransactionModel:
             filter_ = {'_id': ObjectId(transaction_id),
                        'user_id': self.user_id} # added user_id constraint
             
-            result = self.collection.delete_one(filter_)
-            return result.deleted_count > 0
+            def delete(session):
+                deleted = self.collection.find_one_and_delete(filter_, session=session)
+                if deleted:
+                    self._sync_derived_data(deleted, None, session)
+                return deleted
+            
+            return self.db_manager.run_transaction(delete) is not None
         except Exception as e:
             print(f"Error deleting transaction: {e}")
             return False
     
+    def _sync_derived_data(self, before: Optional[dict], after: Optional[dict], session=None):
+        """Update budget spent counters and monthly rollups after a transaction write."""
+        self._sync_budget_spent(before, after, session)
+        self.rollup_model.apply_change(before, after, session)
+    
+    def _sync_budget_spent(self, before: Optional[dict], after: Optional[dict], session=None):
+        """
+        Keep the 'spent' counter of the matching active budget in sync ($inc).
+        
+        Args:
+            before: Transaction document before the write (None for insert)
+            after: Transaction document after the write (None for delete)
+            session: Optional session of the surrounding transaction
+        """
+        budget_collection = self.db_manager.get_collection(config.COLLECTIONS['budget'])
+        
+        for trans, sign in ((before, -1), (after, 1)):
+            if not trans or trans.get('type') != 'Expense':
+                continue
+            
+            trans_date = trans.get('date')
+            if not isinstance(trans_date, datetime):
+                trans_date = handler_datetime(trans_date)
+            
+            budget_collection.update_one(
+                {
+                    'user_id': trans.get('user_id'),
+                    'category': trans.get('category'),
+                    'month': trans_date.month,
+                    'year': trans_date.year,
+                    'is_active': True
+                },
+                {'$inc': {'spent': sign * trans.get('amount', 0)}},
+                session=session
+            )
+    
+    @memoized_read
     def get_transaction_by_id(self, transaction_id: str) -> Optional[dict]:
         """
         Get a single transaction by ID.
@@ -255,6 +567,7 @@ class TransactionModel:
             print(f"Error getting transaction: {e}")
             return None
         
+    @memoized_read
     def get_transactions_by_date_range(
         self,
         start_date: datetime | date | str,
@@ -277,6 +590,7 @@ class TransactionModel:
             }
         )
     
+    @memoized_read
     def get_all_transactions(self) -> list[dict]:
         """
         Get all transactions for the current user.
@@ -286,6 +600,87 @@ class TransactionModel:
         """
         return self.get_transactions()
     
+    @memoized_read
+    def get_dashboard_snapshot(self, recent_limit: int = 10) -> dict:
+        """
+        Get everything the home dashboard needs in one round trip.
+        Runs a single $facet pipeline over the user's transactions.
+        
+        Args:
+            recent_limit: Number of most recent transactions to return
+        
+        Returns:
+            dict with statistics (same shape as get_statistics),
+            recent_transactions, category_totals and monthly_totals
+        """
+        result = list(self.collection.aggregate(self._dashboard_snapshot_pipeline(recent_limit)))
+        return self._parse_dashboard_snapshot(result)
+    
+    def _dashboard_snapshot_pipeline(self, recent_limit: int) -> list[dict]:
+        """$facet pipeline of get_dashboard_snapshot"""
+        return [
+            {"$match": self._build_query(None)},
+            {"$facet": {
+                "type_totals": [
+                    {"$group": {
+                        "_id": "$type",
+                        "total": {"$sum": "$amount"},
+                        "count": {"$sum": 1}
+                    }}
+                ],
+                "recent_transactions": [
+                    {"$sort": {"created_at": -1}},
+                    {"$limit": recent_limit}
+                ],
+                "category_totals": [
+                    {"$group": {
+                        "_id": {"type": "$type", "category": "$category"},
+                        "amount": {"$sum": "$amount"},
+                        "count": {"$sum": 1}
+                    }},
+                    {"$sort": {"_id.type": 1, "_id.category": 1}}
+                ],
+                "monthly_totals": [
+                    {"$group": {
+                        "_id": {
+                            "month": {"$dateTrunc": {"date": "$date", "unit": "month"}},
+                            "type": "$type"
+                        },
+                        "amount": {"$sum": "$amount"}
+                    }},
+                    {"$sort": {"_id.month": 1}}
+                ]
+            }}
+        ]
+    
+    @classmethod
+    def _parse_dashboard_snapshot(cls, result: list[dict]) -> dict:
+        """Shape the $facet output of _dashboard_snapshot_pipeline"""
+        facets = result[0] if result else {}
+        
+        return {
+            'statistics': cls._summarize_type_totals(facets.get('type_totals', [])),
+            'recent_transactions': facets.get('recent_transactions', []),
+            'category_totals': [
+                {
+                    'type': row['_id']['type'],
+                    'category': row['_id']['category'],
+                    'amount': row['amount'],
+                    'count': row['count']
+                }
+                for row in facets.get('category_totals', [])
+            ],
+            'monthly_totals': [
+                {
+                    'month': row['_id']['month'],
+                    'type': row['_id']['type'],
+                    'amount': row['amount']
+                }
+                for row in facets.get('monthly_totals', [])
+            ]
+        }
+    
+    @memoized_read
     def get_transactions_by_type(self, transaction_type: str) -> list[dict]:
         """
         Get transactions filtered by type (Income/Expense).
@@ -300,6 +695,7 @@ class TransactionModel:
             advanced_filters={"transaction_type": transaction_type}
         )
     
+    @memoized_read
     def get_transactions_by_category(self, category_name: str) -> list[dict]:
         """
         Get transactions filtered by category name.
@@ -314,6 +710,7 @@ class TransactionModel:
             advanced_filters={"category": category_name}
         )
     
+    @memoized_read
     def get_transactions_by_user_id(self, user_id: str) -> list[dict]:
         """
         Get all transactions for a specific user (admin function).
@@ -328,34 +725,60 @@ class TransactionModel:
         cursor = self.collection.find(query).sort("created_at", -1)
         return list(cursor)
     
-    def get_statistics(self) -> dict:
+    @memoized_read
+    def get_statistics(
+        self,
+        start_date: datetime | date | str = None,
+        end_date: datetime | date | str = None
+    ) -> dict:
         """
         Get transaction statistics for the current user.
+        ✅ $group by type trên MongoDB, không tải toàn bộ transactions về client
+        
+        Args:
+            start_date: Optional start of the date range
+            end_date: Optional end of the date range
         
         Returns:
             dict with statistics: total_income, total_expense, balance, counts
         """
-        all_trans = self.get_all_transactions()
-        
+        pipeline = self._statistics_pipeline(start_date, end_date)
+        return self._summarize_type_totals(list(self.collection.aggregate(pipeline)))
+    
+    def _statistics_pipeline(self, start_date=None, end_date=None) -> list[dict]:
+        """$group-by-type pipeline of get_statistics"""
+        return [
+            {"$match": self._build_query({"start_date": start_date, "end_date": end_date})},
+            {"$group": {
+                "_id": "$type",
+                "total": {"$sum": "$amount"},
+                "count": {"$sum": 1}
+            }}
+        ]
+    
+    @staticmethod
+    def _summarize_type_totals(type_totals: list[dict]) -> dict:
+        """
+        Build the get_statistics dict from per-type {_id, total, count} rows.
+        """
         stats = {
             'total_income': 0.0,
             'total_expense': 0.0,
             'income_count': 0,
             'expense_count': 0,
-            'total_transactions': len(all_trans),
+            'total_transactions': 0,
             'balance': 0.0
         }
         
-        for trans in all_trans:
-            amount = trans.get('amount', 0)
-            trans_type = trans.get('type', '')
+        for row in type_totals:
+            stats['total_transactions'] += row.get('count', 0)
             
-            if trans_type == 'Income':
-                stats['total_income'] += amount
-                stats['income_count'] += 1
-            elif trans_type == 'Expense':
-                stats['total_expense'] += amount
-                stats['expense_count'] += 1
+            if row.get('_id') == 'Income':
+                stats['total_income'] += row.get('total', 0)
+                stats['income_count'] += row.get('count', 0)
+            elif row.get('_id') == 'Expense':
+                stats['total_expense'] += row.get('total', 0)
+                stats['expense_count'] += row.get('count', 0)
         
         stats['balance'] = stats['total_income'] - stats['total_expense']
         
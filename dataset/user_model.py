@@ -1,6 +1,9 @@
 from dataset.database_manager import DatabaseManager
+from dataset.category_cache import CategoryCache
+from dataset.request_memo import invalidates_reads
 import config
 from datetime import datetime
+from typing import Optional
 from bson.objectid import ObjectId
 
 collection_name = config.COLLECTIONS['user']
@@ -23,9 +26,12 @@ class UserModel:
         result = self.collection.insert_one(user)
         return str(result.inserted_id)
     
+    def get_user_by_email(self, email: str) -> Optional[dict]:
+        return self.collection.find_one({'email': email})
+
     def login(self, email: str) -> str:
         # check user exist (use find_one)
-        user = self.collection.find_one({'email': email})
+        user = self.get_user_by_email(email)
         
         # case 1: user not exist:
         # create: call create_user(email)
@@ -40,6 +46,7 @@ class UserModel:
         # all checking passed
         return str(user.get("_id"))
     
+    @invalidates_reads
     def deactivate(self, user_id: str) -> bool:
         # find and update:
         user = self.collection.find_one({
@@ -59,6 +66,15 @@ class UserModel:
 
         return result.modified_count > 0
     
+    def get_data_counts(self, user_id: str) -> tuple[int, int, int]:
+        """(transactions, budgets, categories) of a user (count_documents on the user_id indexes)"""
+        user_oid = ObjectId(user_id)
+        return tuple(
+            self.db_manager.get_collection(config.COLLECTIONS[name]).count_documents({"user_id": user_oid})
+            for name in ('transaction', 'budget', 'category')
+        )
+    
+    @invalidates_reads
     def delete_user_completely(self, user_id: str) -> dict:
         """
         Delete user and all related data (CASCADE DELETE)
@@ -91,6 +107,11 @@ class UserModel:
             category_collection = self.db_manager.get_collection(config.COLLECTIONS['category'])
             category_result = category_collection.delete_many({"user_id": user_oid})
             counts['categories'] = category_result.deleted_count
+            CategoryCache().invalidate(user_oid)
+            
+            # Delete monthly rollups (derived data, not reported in counts)
+            rollup_collection = self.db_manager.get_collection(config.COLLECTIONS['monthly_rollup'])
+            rollup_collection.delete_many({"user_id": user_oid})
             
             # Delete user (delete_one)
             user_result = self.collection.delete_one({"_id": user_oid})
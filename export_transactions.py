@@ -0,0 +1,54 @@
+"""
+Export transaction history (CSV / Parquet)
+Xuất lịch sử giao dịch của 1 user ra file, đọc theo batch nên không tốn nhiều RAM
+
+Usage:
+    python export_transactions.py --user-id <id> --output history.csv
+    python export_transactions.py --user-id <id> --output history.parquet   # cần pyarrow
+    python export_transactions.py --user-id <id> --output expenses.csv --type Expense
+"""
+
+import argparse
+import os
+import sys
+import time
+from dataset.transaction_model import TransactionModel
+from dataset.transaction_exporter import TransactionExporter, EXPORT_FORMATS
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export a user's transactions to CSV or Parquet")
+    parser.add_argument("--user-id", required=True, help="User to export")
+    parser.add_argument("--output", required=True, help="Output file")
+    parser.add_argument("--format", choices=EXPORT_FORMATS,
+                        help="Output format (default: from the file extension)")
+    parser.add_argument("--type", choices=["Expense", "Income"], help="Only export this transaction type")
+    parser.add_argument("--batch-size", type=int, help="Documents per cursor batch / Parquet row group")
+    args = parser.parse_args()
+
+    file_format = args.format or os.path.splitext(args.output)[1].lstrip(".").lower()
+    if file_format not in EXPORT_FORMATS:
+        parser.error(f"Cannot infer format from '{args.output}', use --format")
+
+    print("=" * 60)
+    print("📤 EXPORT TRANSACTIONS")
+    print("=" * 60)
+
+    transaction_model = TransactionModel()
+    transaction_model.set_user_id(args.user_id)
+    exporter = TransactionExporter(transaction_model, batch_size=args.batch_size)
+    advanced_filters = {"transaction_type": args.type} if args.type else None
+
+    start = time.perf_counter()
+    try:
+        if file_format == "csv":
+            with open(args.output, "w", encoding="utf-8", newline="") as stream:
+                count = exporter.write_csv(stream, advanced_filters)
+        else:
+            count = exporter.write_parquet(args.output, advanced_filters)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    print(f"✅ {count:,} transactions -> {args.output} ({time.perf_counter() - start:.1f}s)")
+    print("=" * 60)
@@ -0,0 +1,62 @@
+"""
+Import a bank statement (CSV / OFX / QFX)
+Nhập sao kê ngân hàng vào transactions; chạy lại với file trùng lặp sẽ bỏ qua các dòng đã có
+
+Usage:
+    python import_statement.py --user-id <id> --file statement.csv
+    python import_statement.py --user-id <id> --file statement.csv --date-format %d/%m/%Y
+    python import_statement.py --user-id <id> --file export.qfx
+"""
+
+import argparse
+import os
+import sys
+from dataset.transaction_model import TransactionModel
+from dataset.category_model import CategoryModel
+from dataset.statement_importer import StatementImporter
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import a CSV/OFX bank statement")
+    parser.add_argument("--user-id", required=True, help="User to import into")
+    parser.add_argument("--file", required=True, help="Statement file")
+    parser.add_argument("--format", choices=["csv", "ofx", "qfx"],
+                        help="File format (default: from the file extension)")
+    parser.add_argument("--date-format", help="strptime format of the CSV date column (default: auto)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows per bulk write")
+    args = parser.parse_args()
+
+    file_format = args.format or os.path.splitext(args.file)[1].lstrip(".").lower()
+
+    print("=" * 60)
+    print("📥 IMPORT BANK STATEMENT")
+    print("=" * 60)
+
+    transaction_model = TransactionModel()
+    transaction_model.set_user_id(args.user_id)
+    category_model = CategoryModel()
+    category_model.set_user_id(args.user_id)
+
+    importer = StatementImporter(
+        transaction_model,
+        category_model,
+        batch_size=args.batch_size,
+        date_format=args.date_format
+    )
+
+    try:
+        with open(args.file, encoding="utf-8-sig", errors="replace", newline="") as stream:
+            summary = importer.import_stream(stream, file_format)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    print(f"📄 Rows:       {summary['rows']}")
+    print(f"✅ Imported:   {summary['imported']}")
+    print(f"⏭️  Duplicates: {summary['duplicates']}")
+    print(f"❌ Errors:     {len(summary['errors'])}")
+    for error in summary["errors"][:20]:
+        print(f"  ⚠️  line {error['line']}: {error['error']}")
+    print("=" * 60)
+
+    sys.exit(1 if summary["errors"] else 0)
@@ -21,6 +21,33 @@ TRANSLATIONS = {
     "nav_transactions": "💳 Transactions",
     "nav_categories": "📁 Categories",
     "nav_budgets": "💰 Budgets",
+    "nav_admin": "🛠️ Admin",
+    "admin_title": "🛠️ Monitoring",
+    "export_json": "Export JSON",
+    "reset_metrics": "Reset metrics",
+    "query_shapes": "Query latency by shape",
+    "slow_queries": "Slow queries",
+    "pool_stats": "Connection pools",
+    "cache_stats": "Category cache",
+    "hit_ratio": "Hit ratio",
+    "hits_misses": "Hits / misses",
+    "invalidations": "Invalidations",
+    "read_cache_stats": "Read cache",
+    "evictions": "Evictions",
+    "cache_memory": "Memory",
+    "no_data": "No data yet",
+    "connections_in_use": "In use",
+    "open_connections": "Open connections",
+    "checkout_wait_p95": "Checkout wait p95",
+    "checkout_failures": "Checkout failures",
+    "render_profile": "Render profile",
+    "profile_other": "Other",
+    "profile_wall": "Total",
+    "profile_queries": "queries",
+    "profile_rows": "rows",
+    "profile_figures": "figures",
+    "profile_memo_hits": "repeated reads skipped",
+    "profile_cache_hits": "reads served from cache",
     "nav_profile": "👤 Profile",
     "nav_logout": "🚪 Logout",
     "account_settings": "⚙️ Account Settings",
@@ -58,6 +85,19 @@ TRANSLATIONS = {
     "transaction_added": "Transaction added successfully!",
     "transaction_updated": "Transaction updated successfully!",
     "transaction_deleted": "Transaction deleted successfully!",
+    "page": "Page",
+    "previous_page": "⬅️ Previous",
+    "next_page": "Next ➡️",
+    "import_statement": "📥 Import Bank Statement",
+    "statement_file": "Statement file (CSV, OFX, QFX)",
+    "date_format_hint": "Date format (optional, e.g. %d/%m/%Y)",
+    "import_button": "Import",
+    "import_result": "Imported {imported} of {rows} rows, skipped {duplicates} duplicates",
+    "import_errors": "Rows with errors",
+    "export_transactions": "📤 Export Transactions",
+    "export_format": "Format",
+    "prepare_export": "Prepare export",
+    "download": "Download",
     
     # Categories
     "categories_title": "📁 Category Management",
@@ -21,6 +21,33 @@ TRANSLATIONS = {
     "nav_transactions": "💳 Giao Dịch",
     "nav_categories": "📁 Danh Mục",
     "nav_budgets": "💰 Ngân Sách",
+    "nav_admin": "🛠️ Quản Trị",
+    "admin_title": "🛠️ Giám Sát",
+    "export_json": "Xuất JSON",
+    "reset_metrics": "Đặt lại số liệu",
+    "query_shapes": "Độ trễ truy vấn theo dạng",
+    "slow_queries": "Truy vấn chậm",
+    "pool_stats": "Connection pool",
+    "cache_stats": "Cache danh mục",
+    "hit_ratio": "Tỉ lệ hit",
+    "hits_misses": "Hit / miss",
+    "invalidations": "Số lần làm mới",
+    "read_cache_stats": "Cache truy vấn",
+    "evictions": "Số lần loại bỏ",
+    "cache_memory": "Bộ nhớ",
+    "no_data": "Chưa có dữ liệu",
+    "connections_in_use": "Đang dùng",
+    "open_connections": "Kết nối đang mở",
+    "checkout_wait_p95": "Thời gian chờ p95",
+    "checkout_failures": "Lỗi lấy kết nối",
+    "render_profile": "Hồ sơ hiệu năng",
+    "profile_other": "Khác",
+    "profile_wall": "Tổng",
+    "profile_queries": "truy vấn",
+    "profile_rows": "dòng",
+    "profile_figures": "biểu đồ",
+    "profile_memo_hits": "truy vấn lặp được bỏ qua",
+    "profile_cache_hits": "truy vấn lấy từ cache",
     "nav_profile": "👤 Hồ Sơ",
     "nav_logout": "🚪 Đăng Xuất",
     "account_settings": "⚙️ Cài Đặt Tài Khoản",
@@ -58,6 +85,19 @@ TRANSLATIONS = {
     "transaction_added": "Đã thêm giao dịch thành công!",
     "transaction_updated": "Đã cập nhật giao dịch thành công!",
     "transaction_deleted": "Đã xóa giao dịch thành công!",
+    "page": "Trang",
+    "previous_page": "⬅️ Trang Trước",
+    "next_page": "Trang Sau ➡️",
+    "import_statement": "📥 Nhập Sao Kê Ngân Hàng",
+    "statement_file": "File sao kê (CSV, OFX, QFX)",
+    "date_format_hint": "Định dạng ngày (tùy chọn, vd. %d/%m/%Y)",
+    "import_button": "Nhập",
+    "import_result": "Đã nhập {imported}/{rows} dòng, bỏ qua {duplicates} dòng trùng",
+    "import_errors": "Các dòng bị lỗi",
+    "export_transactions": "📤 Xuất Giao Dịch",
+    "export_format": "Định dạng",
+    "prepare_export": "Chuẩn bị file",
+    "download": "Tải xuống",
     
     # Categories
     "categories_title": "📁 Quản Lý Danh Mục",
@@ -0,0 +1,247 @@
+"""Process-wide metrics registry exposed in Prometheus text format"""
+
+import bisect
+import functools
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import config
+
+
+# Default histogram buckets, in seconds
+DEFAULT_BUCKETS = [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry:
+    """
+    Minimal thread-safe registry of counters, gauges and histograms with labels.
+    The model layer pushes samples (inc / set_gauge / observe); values that
+    already live elsewhere (cache stats, pool gauges, sessions) are read at
+    scrape time through collectors registered with add_collector().
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super(MetricsRegistry, cls).__new__(cls)
+                cls._instance._initialize()
+        return cls._instance
+
+    def _initialize(self):
+        self._metrics_lock = threading.Lock()
+        self._meta = {}        # name -> (type, help, buckets)
+        self._values = {}      # name -> {labels: value or histogram state}
+        self._collectors = [self._collect_sessions]
+        self._sessions = {}    # session id -> last seen (monotonic)
+
+    def _declare(self, name: str, metric_type: str, help_text: str, buckets=None):
+        if name not in self._meta:
+            self._meta[name] = (metric_type, help_text, buckets)
+            self._values[name] = {}
+
+    @staticmethod
+    def _key(labels: dict = None) -> tuple:
+        return tuple(sorted((labels or {}).items()))
+
+    def inc(self, name: str, labels: dict = None, value: float = 1, help_text: str = ""):
+        """Increase a counter"""
+        with self._metrics_lock:
+            self._declare(name, "counter", help_text)
+            key = self._key(labels)
+            self._values[name][key] = self._values[name].get(key, 0) + value
+
+    def set_counter(self, name: str, value: float, labels: dict = None, help_text: str = ""):
+        """Set a counter to an absolute value (for totals counted elsewhere)"""
+        with self._metrics_lock:
+            self._declare(name, "counter", help_text)
+            self._values[name][self._key(labels)] = value
+
+    def set_gauge(self, name: str, value: float, labels: dict = None, help_text: str = ""):
+        """Set a gauge"""
+        with self._metrics_lock:
+            self._declare(name, "gauge", help_text)
+            self._values[name][self._key(labels)] = value
+
+    def observe(self, name: str, value: float, labels: dict = None, help_text: str = "",
+                buckets: list = None):
+        """Record one sample in a histogram"""
+        with self._metrics_lock:
+            self._declare(name, "histogram", help_text, buckets or DEFAULT_BUCKETS)
+            bounds = self._meta[name][2]
+            state = self._values[name].setdefault(
+                self._key(labels), {"buckets": [0] * len(bounds), "sum": 0.0, "count": 0}
+            )
+            index = bisect.bisect_left(bounds, value)
+            if index < len(bounds):
+                state["buckets"][index] += 1
+            state["sum"] += value
+            state["count"] += 1
+
+    def add_collector(self, collector):
+        """Register a callable run at every scrape (it sets gauges/counters)"""
+        with self._metrics_lock:
+            if collector not in self._collectors:
+                self._collectors.append(collector)
+
+    # -- sessions --
+
+    def touch_session(self, session_id: str):
+        """Mark a Streamlit session as active (call once per rerun)"""
+        with self._metrics_lock:
+            self._sessions[session_id] = time.monotonic()
+
+    def active_sessions(self) -> int:
+        """Sessions seen within config.METRICS_SESSION_WINDOW_SECONDS"""
+        cutoff = time.monotonic() - config.METRICS_SESSION_WINDOW_SECONDS
+        with self._metrics_lock:
+            for session_id in [sid for sid, seen in self._sessions.items() if seen < cutoff]:
+                del self._sessions[session_id]
+            return len(self._sessions)
+
+    def _collect_sessions(self, registry):
+        registry.set_gauge("finance_active_sessions", self.active_sessions(),
+                           help_text="Streamlit sessions that reran recently")
+
+    # -- exposition --
+
+    def render(self) -> str:
+        """All metrics in Prometheus text exposition format (version 0.0.4)"""
+        for collector in list(self._collectors):
+            try:
+                collector(self)
+            except Exception as e:
+                print(f"Error in metrics collector: {e}")
+
+        lines = []
+        with self._metrics_lock:
+            for name in sorted(self._meta):
+                metric_type, help_text, bounds = self._meta[name]
+                if help_text:
+                    lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {metric_type}")
+
+                for labels, value in sorted(self._values[name].items()):
+                    if metric_type != "histogram":
+                        lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                        continue
+
+                    cumulative = 0
+                    for bound, bucket_count in zip(bounds, value["buckets"]):
+                        cumulative += bucket_count
+                        le = labels + (("le", _format_value(float(bound))),)
+                        lines.append(f"{name}_bucket{_format_labels(le)} {cumulative}")
+                    inf = labels + (("le", "+Inf"),)
+                    lines.append(f"{name}_bucket{_format_labels(inf)} {value['count']}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(value['sum'])}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {value['count']}")
+
+        return "\n".join(lines) + "\n"
+
+
+def track_render(view_name: str):
+    """
+    Decorator recording the duration of a view render function
+    (finance_view_render_seconds{view=...}). st.rerun()/st.stop() raise
+    inside renders, so the sample is recorded in a finally block.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                MetricsRegistry().observe(
+                    "finance_view_render_seconds",
+                    time.perf_counter() - start,
+                    {"view": view_name},
+                    help_text="Duration of Streamlit view render functions"
+                )
+        return wrapper
+    return decorator
+
+
+# =============================================
+# HTTP endpoint
+# =============================================
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+
+        body = MetricsRegistry().render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # keep scrapes out of the app log
+        pass
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(host: str = None, port: int = None):
+    """
+    Serve GET /metrics from a daemon thread. Safe to call on every rerun:
+    the server is started once per process.
+
+    Returns:
+        The ThreadingHTTPServer (None if the port could not be bound)
+    """
+    global _server
+    with _server_lock:
+        if _server is not None:
+            return _server
+
+        host = host or config.METRICS_HOST
+        port = config.METRICS_PORT if port is None else port
+        try:
+            _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        except OSError as e:
+            # e.g. a second Streamlit process on the same machine
+            print(f"Error starting metrics server on {host}:{port}: {e}")
+            return None
+
+        _server.daemon_threads = True
+        thread = threading.Thread(target=_server.serve_forever, name="metrics-http", daemon=True)
+        thread.start()
+        print(f"Metrics server on http://{host}:{_server.server_port}/metrics")
+        return _server
+
+
+if __name__ == "__main__":
+    # Offline check: python metrics.py, then curl http://127.0.0.1:<port>/metrics
+    registry = MetricsRegistry()
+    registry.inc("finance_selftest_total", {"source": "cli"}, help_text="Self-test counter")
+    registry.observe("finance_selftest_seconds", 0.042, help_text="Self-test histogram")
+    start_metrics_server()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,233 @@
+"""
+Per-rerun render profiler.
+
+Splits the wall time of one Streamlit rerun into:
+    db      - MongoDB commands (timed by the command listener) + model methods
+    pandas  - FinanceAnalyzer methods (minus the queries they issue)
+    plotly  - FinanceVisualizer methods (figure building)
+    other   - everything else (view code, widgets)
+
+Enabled with config.PROFILER_MODE ('on' = every rerun, 'query' = only with
+?profile=1 in the URL, 'off' = methods are not wrapped at all).
+"""
+
+import cProfile
+import functools
+import os
+import threading
+import time
+from datetime import datetime
+import config
+
+try:
+    from pyinstrument import Profiler as PyinstrumentProfiler
+except ImportError:  # pyinstrument dumps are optional
+    PyinstrumentProfiler = None
+
+
+CATEGORIES = ["db", "pandas", "plotly"]
+
+# Streamlit runs each session's script in its own thread
+_local = threading.local()
+_installed = False
+_install_lock = threading.Lock()
+
+
+class RenderProfile:
+    """Timings collected during one rerun"""
+
+    def __init__(self, page: str):
+        self.page = page
+        self.started = time.perf_counter()
+        self.wall_ms = 0.0
+        self.self_ms = {category: 0.0 for category in CATEGORIES}
+        self.calls = {}        # (category, name) -> [count, inclusive ms]
+        self.queries = 0
+        self.rows = 0
+        self.figures = 0
+        self._stack = []       # open frames: [category, name, start, child ms, query ms]
+        self.dumper = None
+
+    def enter(self, category: str, name: str):
+        self._stack.append([category, name, time.perf_counter(), 0.0, 0.0])
+
+    def exit(self):
+        category, name, start, child_ms, query_ms = self._stack.pop()
+        inclusive_ms = (time.perf_counter() - start) * 1000
+
+        # self time excludes nested wrapped calls and the queries issued directly
+        self.self_ms[category] += max(inclusive_ms - child_ms - query_ms, 0.0)
+        if self._stack:
+            self._stack[-1][3] += inclusive_ms
+
+        entry = self.calls.setdefault((category, name), [0, 0.0])
+        entry[0] += 1
+        entry[1] += inclusive_ms
+        if category == "plotly":
+            self.figures += 1
+
+    def record_query(self, duration_ms: float, docs: int):
+        self.queries += 1
+        self.rows += docs
+        self.self_ms["db"] += duration_ms
+        if self._stack:
+            self._stack[-1][4] += duration_ms
+
+    def summary(self) -> dict:
+        """Breakdown of the rerun: wall/db/pandas/plotly/other ms and counters"""
+        accounted = sum(self.self_ms.values())
+        return {
+            "page": self.page,
+            "wall_ms": self.wall_ms,
+            **{f"{category}_ms": value for category, value in self.self_ms.items()},
+            "other_ms": max(self.wall_ms - accounted, 0.0),
+            "queries": self.queries,
+            "rows": self.rows,
+            "figures": self.figures,
+            "calls": [
+                {"category": category, "name": name, "calls": count, "total_ms": total}
+                for (category, name), (count, total) in sorted(
+                    self.calls.items(), key=lambda item: item[1][1], reverse=True
+                )
+            ]
+        }
+
+
+def current() -> "RenderProfile | None":
+    """Profile of the rerun running in this thread (None when not profiling)"""
+    return getattr(_local, "profile", None)
+
+
+def record_query(duration_ms: float, docs: int):
+    """Called by the command listener (same thread as the sync pymongo call)"""
+    profile = current()
+    if profile is not None:
+        profile.record_query(duration_ms, docs)
+
+
+# =============================================
+# Method wrapping
+# =============================================
+
+def _timed(func, category: str, name: str):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profile = current()
+        if profile is None:
+            return func(*args, **kwargs)
+        profile.enter(category, name)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profile.exit()
+    return wrapper
+
+
+def instrument_class(cls, category: str):
+    """Wrap every public method (incl. static/class methods) of a class with a timer"""
+    for attr_name, attr in list(vars(cls).items()):
+        if attr_name.startswith("_"):
+            continue
+        name = f"{cls.__name__}.{attr_name}"
+        if isinstance(attr, staticmethod):
+            setattr(cls, attr_name, staticmethod(_timed(attr.__func__, category, name)))
+        elif isinstance(attr, classmethod):
+            setattr(cls, attr_name, classmethod(_timed(attr.__func__, category, name)))
+        elif callable(attr):
+            setattr(cls, attr_name, _timed(attr, category, name))
+
+
+def install():
+    """Wrap model, analyzer and visualizer methods once per process (no-op when PROFILER_MODE=off)"""
+    global _installed
+    if config.PROFILER_MODE == "off":
+        return
+
+    with _install_lock:
+        if _installed:
+            return
+
+        from dataset.transaction_model import TransactionModel
+        from dataset.category_model import CategoryModel
+        from dataset.budget_model import BudgetModel
+        from dataset.user_model import UserModel
+        from dataset.rollup_model import MonthlyRollupModel
+        from analytics.analyzer import FinanceAnalyzer
+        from analytics.visualizer import FinanceVisualizer
+
+        for model in (TransactionModel, CategoryModel, BudgetModel, UserModel, MonthlyRollupModel):
+            instrument_class(model, "db")
+        instrument_class(FinanceAnalyzer, "pandas")
+        instrument_class(FinanceVisualizer, "plotly")
+        _installed = True
+
+
+# =============================================
+# Rerun lifecycle
+# =============================================
+
+def is_requested(query_params=None) -> bool:
+    """Should this rerun be profiled (PROFILER_MODE + ?profile=1)"""
+    if config.PROFILER_MODE == "on":
+        return True
+    if config.PROFILER_MODE == "query" and query_params is not None:
+        return query_params.get("profile") in ("1", "true")
+    return False
+
+
+def start_rerun(page: str) -> RenderProfile:
+    """Begin profiling the current rerun (replaces a profile left by an interrupted rerun)"""
+    profile = RenderProfile(page)
+
+    if config.PROFILER_DUMP_DIR:
+        if config.PROFILER_DUMP_FORMAT == "pyinstrument" and PyinstrumentProfiler is not None:
+            profile.dumper = PyinstrumentProfiler()
+            profile.dumper.start()
+        else:
+            profile.dumper = cProfile.Profile()
+            profile.dumper.enable()
+
+    _local.profile = profile
+    return profile
+
+
+def _dump(profile: RenderProfile) -> str:
+    os.makedirs(config.PROFILER_DUMP_DIR, exist_ok=True)
+    stem = os.path.join(config.PROFILER_DUMP_DIR, f"{profile.page}_{datetime.now():%Y%m%d_%H%M%S_%f}")
+
+    if isinstance(profile.dumper, cProfile.Profile):
+        profile.dumper.disable()
+        path = f"{stem}.prof"
+        profile.dumper.dump_stats(path)
+    else:
+        profile.dumper.stop()
+        path = f"{stem}.html"
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(profile.dumper.output_html())
+    return path
+
+
+def finish_rerun() -> "dict | None":
+    """
+    Stop profiling the current rerun.
+
+    Returns:
+        RenderProfile.summary() plus 'dump_path' (None if not dumping),
+        or None if this rerun was not profiled
+    """
+    profile = current()
+    if profile is None:
+        return None
+    _local.profile = None
+
+    profile.wall_ms = (time.perf_counter() - profile.started) * 1000
+    summary = profile.summary()
+    summary["dump_path"] = None
+
+    if profile.dumper is not None:
+        try:
+            summary["dump_path"] = _dump(profile)
+        except OSError as e:
+            print(f"Error writing profile dump: {e}")
+
+    return summary
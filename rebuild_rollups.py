@@ -0,0 +1,27 @@
+"""
+Rebuild monthly_rollups collection
+Tính lại toàn bộ rollup (sum/count/min/max theo user + tháng + type + category)
+từ transactions bằng aggregation kết thúc với $merge
+
+Usage:
+    python rebuild_rollups.py                 # tất cả users
+    python rebuild_rollups.py --user-id <id>  # chỉ 1 user
+"""
+
+import argparse
+from dataset.rollup_model import MonthlyRollupModel
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild monthly rollups from transactions")
+    parser.add_argument("--user-id", help="Only rebuild this user's rollups")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🔄 REBUILD MONTHLY ROLLUPS")
+    print("=" * 60)
+
+    count = MonthlyRollupModel().rebuild(user_id=args.user_id)
+
+    print(f"✅ {count} rollup documents")
+    print("=" * 60)
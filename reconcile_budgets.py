@@ -0,0 +1,42 @@
+"""
+Reconcile budget spent counters
+Tính lại field 'spent' của budgets từ transactions và báo cáo sai lệch (drift)
+
+Usage:
+    python reconcile_budgets.py                 # tất cả users, ghi lại giá trị đúng
+    python reconcile_budgets.py --dry-run       # chỉ báo cáo, không ghi
+    python reconcile_budgets.py --user-id <id>  # chỉ 1 user
+"""
+
+import argparse
+import sys
+from dataset.budget_model import BudgetModel
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recompute budget spent counters from transactions")
+    parser.add_argument("--user-id", help="Only reconcile this user's budgets")
+    parser.add_argument("--dry-run", action="store_true", help="Report drift without fixing it")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🔄 RECONCILE BUDGET SPENT COUNTERS")
+    print("=" * 60)
+
+    budget_model = BudgetModel(user_id=args.user_id)
+    drifted = budget_model.reconcile_spent(all_users=args.user_id is None, fix=not args.dry_run)
+
+    if not drifted:
+        print("✅ Không có sai lệch")
+        sys.exit(0)
+
+    for item in drifted:
+        print(f"  ⚠️  {item['user_id']} | {item['category']} {item['month']}/{item['year']}: "
+              f"stored={item['stored']} actual={item['actual']:,.2f}")
+
+    action = "Báo cáo" if args.dry_run else "Đã sửa"
+    print(f"\n{action} {len(drifted)} budget(s)")
+    print("=" * 60)
+
+    # dry run with drift -> non-zero exit so it can be used as a check
+    sys.exit(1 if args.dry_run else 0)
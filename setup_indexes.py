@@ -1,71 +1,96 @@
 """
 Setup MongoDB indexes for Finance Tracker
-Chạy script này MỘT LẦN để tạo unique index cho budgets collection
+Index spec được khai báo trong dataset/index_manager.py (INDEX_SPECS)
+
+Usage:
+    python setup_indexes.py apply        # tạo index còn thiếu (idempotent)
+    python setup_indexes.py diff         # so sánh spec với database
+    python setup_indexes.py drop-unused  # xóa index không có trong spec
+    python setup_indexes.py verify       # explain() mọi query shape, fail nếu COLLSCAN / SORT
 """
 
-from dataset.database_manager import DatabaseManager
-import config
-
-def create_budget_unique_index():
-    """
-    Tạo compound unique index cho budgets collection
-    Đảm bảo mỗi user chỉ có 1 budget cho mỗi category + month + year
-    """
-    db_manager = DatabaseManager()
-    budgets_collection = db_manager.get_collection(config.COLLECTIONS['budget'])
-    
-    try:
-        # Tạo compound unique index
-        index_name = budgets_collection.create_index(
-            [
-                ('user_id', 1),
-                ('category', 1),
-                ('month', 1),
-                ('year', 1),
-                ('is_active', 1)
-            ],
-            unique=True,
-            name='unique_user_category_month_year'
-        )
-        
-        print(f"✅ Đã tạo unique index: {index_name}")
-        
-        # Liệt kê tất cả indexes
-        indexes = budgets_collection.index_information()
-        print("\n📋 Danh sách indexes trong collection 'budgets':")
-        for idx_name, idx_info in indexes.items():
-            print(f"  - {idx_name}: {idx_info['key']}")
-        
+import argparse
+import sys
+from dataset.index_manager import IndexManager
+
+
+def apply_indexes(manager: IndexManager) -> bool:
+    """Tạo các index còn thiếu hoặc đã thay đổi"""
+    result = manager.apply()
+    ok = True
+
+    for collection_name, changes in result.items():
+        for name in changes["created"]:
+            print(f"✅ {collection_name}: đã tạo index {name}")
+        for error in changes["errors"]:
+            print(f"❌ {collection_name}: {error}")
+            ok = False
+
+    return ok
+
+
+def diff_indexes(manager: IndexManager) -> bool:
+    """In ra khác biệt giữa spec và database"""
+    report = manager.diff()
+    in_sync = True
+
+    print("\n📋 INDEX DIFF:")
+    for collection_name, changes in report.items():
+        for key, icon in (("missing", "➕"), ("changed", "✏️"), ("unused", "➖")):
+            for name in changes[key]:
+                print(f"  {icon} {collection_name}.{name} ({key})")
+                in_sync = False
+
+    if in_sync:
+        print("  ✅ Database khớp với spec")
+
+    return in_sync
+
+
+def drop_unused_indexes(manager: IndexManager) -> bool:
+    """Xóa các index không có trong spec"""
+    result = manager.drop_unused()
+
+    for collection_name, names in result.items():
+        for name in names:
+            print(f"🗑️ {collection_name}: đã xóa index {name}")
+
+    return True
+
+
+def verify_query_plans(manager: IndexManager) -> bool:
+    """Kiểm tra query plan của mọi query shape"""
+    problems = manager.verify()
+
+    print("\n🔍 KIỂM TRA QUERY PLANS:")
+    if not problems:
+        print("  ✅ Tất cả query đều dùng index (không có COLLSCAN / in-memory SORT)")
         return True
-    
-    except Exception as e:
-        print(f"❌ Lỗi khi tạo index: {e}")
-        return False
-
-def verify_indexes():
-    """Kiểm tra indexes đã tạo"""
-    db_manager = DatabaseManager()
-    budgets_collection = db_manager.get_collection(config.COLLECTIONS['budget'])
-    
-    indexes = budgets_collection.index_information()
-    
-    print("\n🔍 KIỂM TRA INDEXES:")
-    if 'unique_user_category_month_year' in indexes:
-        print("✅ Unique index đã tồn tại")
-        print(f"   Details: {indexes['unique_user_category_month_year']}")
-    else:
-        print("❌ Unique index CHƯA được tạo!")
+
+    for problem in problems:
+        print(f"  ❌ {problem['name']} ({problem['collection']}): {', '.join(problem['stages'])}")
+
+    return False
+
+
+COMMANDS = {
+    "apply": apply_indexes,
+    "diff": diff_indexes,
+    "drop-unused": drop_unused_indexes,
+    "verify": verify_query_plans,
+}
+
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage MongoDB indexes for Finance Tracker")
+    parser.add_argument("command", nargs="?", default="apply", choices=COMMANDS.keys())
+    args = parser.parse_args()
+
     print("=" * 60)
-    print("🚀 SETUP MONGODB INDEXES")
+    print(f"🚀 SETUP MONGODB INDEXES: {args.command}")
     print("=" * 60)
-    
-    # Tạo index
-    create_budget_unique_index()
-    
-    # Verify
-    verify_indexes()
-    
-    print("\n✅ HOÀN THÀNH!")
+
+    success = COMMANDS[args.command](IndexManager())
+
     print("=" * 60)
+    sys.exit(0 if success else 1)
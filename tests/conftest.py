@@ -0,0 +1,103 @@
+"""
+Shared fixtures.
+
+Tests that touch MongoDB run against a throwaway database on MONGO_URI
+(TEST_DATABASE_NAME, default finance_tracker_test, dropped at the end of the
+session) and are skipped when no server answers. Pure tests only need the
+Python dependencies.
+"""
+
+import os
+import uuid
+from datetime import datetime, timedelta
+import pytest
+
+# must be set before config is imported anywhere
+os.environ["DATABASE_NAME"] = os.getenv("TEST_DATABASE_NAME", "finance_tracker_test")
+os.environ.setdefault("MONGO_SERVER_SELECTION_TIMEOUT_MS", "2000")
+os.environ.setdefault("METRICS_ENABLED", "false")
+
+
+@pytest.fixture(scope="session")
+def db_manager():
+    """The DatabaseManager singleton on the test database (skips without a server)"""
+    pytest.importorskip("pymongo")
+    import config
+    from dataset.database_manager import DatabaseManager
+
+    try:
+        manager = DatabaseManager()
+    except Exception as e:
+        DatabaseManager._instance = None
+        pytest.skip(f"MongoDB not reachable at {config.MONGO_URI} ({type(e).__name__})")
+
+    yield manager
+    manager.client.drop_database(config.DATABASE_NAME)
+
+
+@pytest.fixture
+def make_user(db_manager):
+    """Factory of throwaway users; everything they own is deleted after the test"""
+    import config
+    from dataset.category_cache import CategoryCache
+    from dataset.read_cache import ReadCache
+
+    created = []
+
+    def make(email: str = None) -> str:
+        email = email or f"{uuid.uuid4().hex}@test.local"
+        result = db_manager.get_collection(config.COLLECTIONS["user"]).insert_one({
+            "email": email,
+            "created_at": datetime.now(),
+            "last_modified": datetime.now(),
+            "is_activate": True
+        })
+        created.append(result.inserted_id)
+        return str(result.inserted_id)
+
+    yield make
+
+    for user_oid in created:
+        for name in ("transaction", "category", "budget", "monthly_rollup"):
+            db_manager.get_collection(config.COLLECTIONS[name]).delete_many({"user_id": user_oid})
+        db_manager.get_collection(config.COLLECTIONS["user"]).delete_one({"_id": user_oid})
+        CategoryCache().invalidate(user_oid)
+    ReadCache().clear()
+
+
+@pytest.fixture
+def user_id(make_user) -> str:
+    return make_user()
+
+
+@pytest.fixture
+def insert_transactions(db_manager):
+    """
+    Insert raw transaction documents (no validation, no derived data) and
+    rebuild the user's monthly rollups, as an existing database would have them.
+    Rows are (type, category, amount, date); created_at follows the row order.
+    """
+    import config
+    from bson.objectid import ObjectId
+    from dataset.rollup_model import MonthlyRollupModel
+
+    def insert(user_id: str, rows: list) -> list[dict]:
+        created_at = datetime(2020, 1, 1)
+        documents = []
+        for i, (transaction_type, category, amount, date) in enumerate(rows):
+            documents.append({
+                "type": transaction_type,
+                "category": category,
+                "amount": amount,
+                "date": date,
+                "description": f"row {i}",
+                "created_at": created_at + timedelta(seconds=i),
+                "last_modified": created_at + timedelta(seconds=i),
+                "user_id": ObjectId(user_id)
+            })
+        if documents:
+            db_manager.get_collection(config.COLLECTIONS["transaction"]).insert_many(documents)
+        MonthlyRollupModel().rebuild(user_id=user_id)
+        return documents
+
+    return insert
@@ -0,0 +1,218 @@
+"""
+FinanceAnalyzer: the aggregation mode (_agg_*) must return what the pandas
+mode returns for the same data.
+"""
+
+import statistics
+from datetime import datetime, timedelta
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pymongo")
+
+import analytics.analyzer as analyzer_module
+from analytics.analyzer import FinanceAnalyzer
+from dataset.transaction_model import TransactionModel
+
+
+NOW = datetime(2024, 7, 15, 12, 0)
+
+
+class FrozenDatetime(datetime):
+    """datetime whose now() is NOW (get_monthly_trend windows on datetime.now())"""
+
+    @classmethod
+    def now(cls, tz=None):
+        return NOW
+
+
+@pytest.fixture
+def frozen_now(monkeypatch):
+    monkeypatch.setattr(analyzer_module, "datetime", FrozenDatetime)
+
+
+@pytest.fixture
+def analyzers(user_id):
+    model = TransactionModel()
+    model.set_user_id(user_id)
+    return FinanceAnalyzer(model, use_aggregation=False), FinanceAnalyzer(model, use_aggregation=True)
+
+
+def assert_same_frame(agg, pandas_):
+    if pandas_.empty:
+        assert agg.empty
+        return
+    if "Category" in pandas_.columns:
+        # categories with equal totals may come back in either order
+        agg = agg.sort_values(["Total", "Category"], ascending=[False, True]).reset_index(drop=True)
+        pandas_ = pandas_.sort_values(["Total", "Category"], ascending=[False, True]).reset_index(drop=True)
+    pd.testing.assert_frame_equal(
+        agg, pandas_,
+        check_dtype=False, check_freq=False, check_index_type=False, check_column_type=False
+    )
+
+
+def assert_same_summary(agg, pandas_):
+    assert agg.keys() == pandas_.keys()
+    for key, value in pandas_.items():
+        assert agg[key] == pytest.approx(value), key
+
+
+def assert_parity(pandas_analyzer, agg_analyzer, start_date=None, end_date=None):
+    for transaction_type in ("Expense", "Income"):
+        assert agg_analyzer.calculate_total_by_type(transaction_type, start_date, end_date) == pytest.approx(
+            pandas_analyzer.calculate_total_by_type(transaction_type, start_date, end_date)
+        )
+    assert_same_frame(
+        agg_analyzer.get_spending_by_category(start_date, end_date),
+        pandas_analyzer.get_spending_by_category(start_date, end_date)
+    )
+    assert_same_frame(agg_analyzer.get_monthly_trend(), pandas_analyzer.get_monthly_trend())
+    assert agg_analyzer.get_daily_average() == pytest.approx(pandas_analyzer.get_daily_average())
+    assert agg_analyzer.predict_next_month_spending() == pytest.approx(
+        pandas_analyzer.predict_next_month_spending()
+    )
+    assert_same_summary(agg_analyzer.get_statistics_summary(), pandas_analyzer.get_statistics_summary())
+
+
+# ---------------------------------------------------------------------------
+# _full_month_bounds (pure)
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("start_date, end_date, first_full, after_last_full", [
+    # partial months at both ends
+    (datetime(2024, 3, 15, 10), datetime(2024, 6, 10), datetime(2024, 4, 1), datetime(2024, 6, 1)),
+    # a start at midnight on the 1st keeps its whole month
+    (datetime(2024, 3, 1), datetime(2024, 6, 10), datetime(2024, 3, 1), datetime(2024, 6, 1)),
+    # one second past the 1st makes that month partial
+    (datetime(2024, 3, 1, 0, 0, 1), datetime(2024, 6, 10), datetime(2024, 4, 1), datetime(2024, 6, 1)),
+    # December rolls over to January of the next year
+    (datetime(2024, 12, 5), datetime(2025, 3, 2), datetime(2025, 1, 1), datetime(2025, 3, 1)),
+    # an end at midnight on the 1st: that month is still the partial one
+    (datetime(2024, 1, 10), datetime(2024, 6, 1), datetime(2024, 2, 1), datetime(2024, 6, 1)),
+])
+def test_full_month_bounds(start_date, end_date, first_full, after_last_full):
+    assert FinanceAnalyzer._full_month_bounds(start_date, end_date) == (first_full, after_last_full)
+
+
+def test_full_month_bounds_within_one_month_has_no_whole_month():
+    first_full, after_last_full = FinanceAnalyzer._full_month_bounds(datetime(2024, 3, 5), datetime(2024, 3, 20))
+    assert first_full >= after_last_full
+
+
+# ---------------------------------------------------------------------------
+# Parity against MongoDB
+# ---------------------------------------------------------------------------
+
+def test_empty_data(analyzers, frozen_now):
+    pandas_analyzer, agg_analyzer = analyzers
+    assert_parity(pandas_analyzer, agg_analyzer)
+    assert agg_analyzer.get_statistics_summary() == {}
+    assert agg_analyzer.get_spending_by_category().empty
+    assert agg_analyzer.get_monthly_trend().empty
+    assert agg_analyzer.get_daily_average() == 0
+
+
+def test_only_income(analyzers, user_id, insert_transactions, frozen_now):
+    insert_transactions(user_id, [
+        ("Income", "Salary", 1000.0, datetime(2024, 5, 3)),
+        ("Income", "Bonus", 250.5, datetime(2024, 6, 20)),
+    ])
+    assert_parity(*analyzers)
+
+
+def test_single_whole_month(analyzers, user_id, insert_transactions, frozen_now):
+    # May 2024 is a whole month of the 6-month window: served from the rollups
+    insert_transactions(user_id, [
+        ("Expense", "Food", 12.5, datetime(2024, 5, 1)),
+        ("Expense", "Food", 30.0, datetime(2024, 5, 14, 18)),
+        ("Expense", "Travel", 210.0, datetime(2024, 5, 31, 23, 59)),
+        ("Income", "Salary", 1500.0, datetime(2024, 5, 2)),
+    ])
+    assert_parity(*analyzers)
+    assert list(analyzers[1].get_monthly_trend().index) == [pd.Timestamp(2024, 5, 1)]
+
+
+def test_single_partial_month(analyzers, user_id, insert_transactions, frozen_now):
+    # only the current (partial) month: no rollups involved
+    insert_transactions(user_id, [
+        ("Expense", "Food", 8.0, datetime(2024, 7, 1)),
+        ("Expense", "Food", 16.0, datetime(2024, 7, 10)),
+        ("Income", "Salary", 900.0, datetime(2024, 7, 15, 11)),
+    ])
+    assert_parity(*analyzers)
+
+
+def test_partial_month_boundaries(analyzers, user_id, insert_transactions, frozen_now):
+    # the window is [NOW - 180 days, NOW] = [2024-01-17 12:00, 2024-07-15 12:00]
+    window_start = NOW - timedelta(days=180)
+    insert_transactions(user_id, [
+        ("Expense", "Food", 1.0, window_start - timedelta(minutes=1)),   # outside
+        ("Expense", "Food", 2.0, window_start),                          # first partial month
+        ("Expense", "Food", 4.0, datetime(2024, 1, 31, 23, 59, 59)),
+        ("Expense", "Food", 8.0, datetime(2024, 2, 1)),                  # first whole month
+        ("Expense", "Rent", 16.0, datetime(2024, 6, 30, 23, 59, 59)),    # last whole month
+        ("Expense", "Rent", 32.0, datetime(2024, 7, 1)),                 # last partial month
+        ("Expense", "Food", 64.0, NOW),                                  # end is inclusive
+        ("Expense", "Food", 128.0, NOW + timedelta(minutes=1)),          # outside
+        ("Income", "Salary", 500.0, datetime(2024, 3, 1)),
+    ])
+    pandas_analyzer, agg_analyzer = analyzers
+    assert_parity(pandas_analyzer, agg_analyzer)
+    assert_parity(pandas_analyzer, agg_analyzer, datetime(2024, 1, 31), datetime(2024, 7, 1))
+
+    trend = agg_analyzer.get_monthly_trend()
+    assert trend.loc[pd.Timestamp(2024, 1, 1), "Expense"] == pytest.approx(6.0)
+    assert trend.loc[pd.Timestamp(2024, 7, 1), "Expense"] == pytest.approx(96.0)
+
+
+def test_mixed_history(analyzers, user_id, insert_transactions, frozen_now):
+    categories = ["Food", "Rent", "Travel", "Health"]
+    rows = []
+    for i in range(120):
+        date = NOW - timedelta(days=i * 2, hours=i % 7)
+        rows.append(("Expense", categories[i % 4], float(5 + (i * 37) % 200) + 0.25 * (i % 4), date))
+        if i % 15 == 0:
+            rows.append(("Income", "Salary", 2000.0 + i, date))
+    insert_transactions(user_id, rows)
+
+    pandas_analyzer, agg_analyzer = analyzers
+    assert_parity(pandas_analyzer, agg_analyzer)
+    assert_parity(pandas_analyzer, agg_analyzer, NOW - timedelta(days=45), NOW - timedelta(days=10))
+
+
+@pytest.mark.parametrize("amounts", [
+    [42.0],
+    [10.0, 30.0],                      # even count: mean of the two middle values
+    [5.0, 1.0, 3.0],
+    [40.0, 10.0, 30.0, 20.0],
+    [7.0, 7.0, 1.0, 9.0, 3.0, 100.0],
+])
+def test_median_expense(analyzers, user_id, insert_transactions, amounts):
+    insert_transactions(user_id, [
+        ("Expense", "Food", amount, datetime(2024, 5, 1 + i)) for i, amount in enumerate(amounts)
+    ] + [("Income", "Salary", 999.0, datetime(2024, 5, 1))])
+
+    pandas_analyzer, agg_analyzer = analyzers
+    median = agg_analyzer.get_statistics_summary()["median_expense"]
+    assert median == pytest.approx(statistics.median(amounts))
+    assert median == pytest.approx(pandas_analyzer.get_statistics_summary()["median_expense"])
+
+
+def test_existing_data_without_rollups_is_backfilled(analyzers, user_id, insert_transactions, db_manager, frozen_now):
+    from bson.objectid import ObjectId
+    from dataset.rollup_model import MonthlyRollupModel
+
+    insert_transactions(user_id, [
+        ("Expense", "Food", 12.5, datetime(2024, 5, 1)),
+        ("Expense", "Travel", 210.0, datetime(2024, 4, 30)),
+        ("Income", "Salary", 1500.0, datetime(2024, 5, 2)),
+    ])
+    # transactions from before the rollups existed: no buckets, no marker
+    rollups = MonthlyRollupModel()
+    rollups.collection.delete_many({"user_id": ObjectId(user_id)})
+    rollups.user_collection.update_one({"_id": ObjectId(user_id)}, {"$unset": {"rollups_version": ""}})
+    MonthlyRollupModel._built_users.clear()
+
+    assert_parity(*analyzers)
+    assert analyzers[1].get_monthly_trend()["Expense"].sum() == pytest.approx(222.5)
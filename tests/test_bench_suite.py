@@ -0,0 +1,33 @@
+"""benchmarks/suite.py baseline check: exit codes of the regression comparison (no MongoDB needed)."""
+
+import json
+import pytest
+
+pytest.importorskip("pymongo")
+
+from benchmarks.suite import check
+
+
+def report(**medians) -> dict:
+    return {"results": {"1000": {name: {"median_ms": ms} for name, ms in medians.items()}}}
+
+
+@pytest.fixture
+def baseline(tmp_path):
+    path = tmp_path / "baseline.json"
+    path.write_text(json.dumps(report(get_statistics=10.0, get_all_budgets=2.0)))
+    return str(path)
+
+
+def test_within_threshold_passes(baseline):
+    assert check(report(get_statistics=12.0, get_all_budgets=1.0), baseline, 1.25) == 0
+
+
+def test_slower_than_threshold_fails(baseline, capsys):
+    assert check(report(get_statistics=13.0, get_all_budgets=2.0), baseline, 1.25) == 1
+    assert "get_statistics" in capsys.readouterr().out
+
+
+def test_missing_baseline_or_unbaselined_case_fails(baseline, tmp_path):
+    assert check(report(get_statistics=1.0), str(tmp_path / "missing.json"), 1.25) == 2
+    assert check(report(get_statistics=1.0, get_dashboard_snapshot=1.0), baseline, 1.25) == 2
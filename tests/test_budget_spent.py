@@ -0,0 +1,138 @@
+"""Budget spent counters: kept in sync by transaction writes, recounted on budget changes."""
+
+import threading
+from datetime import datetime
+import pytest
+
+pytest.importorskip("pymongo")
+
+from bson.objectid import ObjectId
+from dataset.model_context import ModelContext
+
+
+MONTH, YEAR = 3, 2024
+
+
+@pytest.fixture
+def models(user_id):
+    return ModelContext(user_id)
+
+
+def spent_of(models, budget_id) -> float:
+    return models.budget.get_budget_by_id(budget_id)["spent"]
+
+
+def test_create_budget_counts_existing_transactions(models):
+    models.transaction.add_transaction("Expense", "Food & Dining", 12.5, datetime(YEAR, MONTH, 2))
+    models.transaction.add_transaction("Expense", "Food & Dining", 7.5, datetime(YEAR, MONTH, 28))
+    models.transaction.add_transaction("Expense", "Food & Dining", 99.0, datetime(YEAR, MONTH + 1, 1))
+
+    budget_id = models.budget.create_budget("Food & Dining", 100.0, MONTH, YEAR)
+
+    assert spent_of(models, budget_id) == pytest.approx(20.0)
+
+
+def test_transaction_writes_move_the_counter(models):
+    budget_id = models.budget.create_budget("Food & Dining", 100.0, MONTH, YEAR)
+
+    transaction_id = models.transaction.add_transaction("Expense", "Food & Dining", 30.0, datetime(YEAR, MONTH, 5))
+    assert spent_of(models, budget_id) == pytest.approx(30.0)
+
+    models.transaction.update_transaction(transaction_id, amount=45.0)
+    assert spent_of(models, budget_id) == pytest.approx(45.0)
+
+    models.transaction.update_transaction(transaction_id, date=datetime(YEAR, MONTH + 1, 5))
+    assert spent_of(models, budget_id) == pytest.approx(0.0)
+
+
+def test_update_budget_month_recounts(models):
+    models.transaction.add_transaction("Expense", "Food & Dining", 10.0, datetime(YEAR, MONTH, 5))
+    models.transaction.add_transaction("Expense", "Transportation", 4.0, datetime(YEAR, MONTH + 1, 5))
+    budget_id = models.budget.create_budget("Food & Dining", 100.0, MONTH, YEAR)
+
+    models.budget.update_budget(budget_id, category="Transportation", month=MONTH + 1)
+
+    assert spent_of(models, budget_id) == pytest.approx(4.0)
+
+
+def test_summary_reads_the_counter_and_counts_legacy_budgets(models):
+    models.transaction.add_transaction("Expense", "Food & Dining", 25.0, datetime(YEAR, MONTH, 5))
+    budget_id = models.budget.create_budget("Food & Dining", 50.0, MONTH, YEAR)
+
+    # a budget from before the counter existed
+    models.budget.collection.update_one({"_id": ObjectId(budget_id)}, {"$unset": {"spent": ""}})
+
+    summary = models.budget.get_budget_summary(models.transaction, MONTH, YEAR)
+
+    assert [(row["budget_id"], row["spent_amount"], row["status"]) for row in summary] == [
+        (budget_id, 25.0, "warning")
+    ]
+    assert "has_spent" not in summary[0]
+    assert spent_of(models, budget_id) == pytest.approx(25.0)
+
+
+def test_concurrent_writes_on_one_budget_are_not_lost(db_manager, models):
+    if not db_manager.supports_transactions:
+        pytest.skip("needs a replica set (multi-document transactions)")
+
+    budget_id = models.budget.create_budget("Food & Dining", 1000.0, MONTH, YEAR)
+    threads_count, per_thread = 8, 5
+    barrier = threading.Barrier(threads_count)
+    failures = []
+
+    def writer():
+        context = ModelContext(models.user_id)
+        barrier.wait()
+        for _ in range(per_thread):
+            if context.transaction.add_transaction("Expense", "Food & Dining", 1.0, datetime(YEAR, MONTH, 10)) is None:
+                failures.append(1)
+
+    threads = [threading.Thread(target=writer) for _ in range(threads_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert failures == []
+    assert spent_of(models, budget_id) == pytest.approx(threads_count * per_thread)
+    assert models.budget.reconcile_spent(fix=False) == []
+
+
+def test_summary_recount_invalidates_cached_budget_reads(models, monkeypatch):
+    import config
+    from dataset import request_memo
+
+    monkeypatch.setattr(config, "READ_CACHE_ENABLED", True)
+    models.transaction.add_transaction("Expense", "Food & Dining", 25.0, datetime(YEAR, MONTH, 5))
+    budget_id = models.budget.create_budget("Food & Dining", 50.0, MONTH, YEAR)
+    models.budget.collection.update_one({"_id": ObjectId(budget_id)}, {"$unset": {"spent": ""}})
+
+    def rerun(read):
+        request_memo.start_run()
+        try:
+            return read()
+        finally:
+            request_memo.finish_run()
+
+    # cached while the budget had no counter
+    assert "spent" not in rerun(models.budget.get_all_budgets)[0]
+
+    rerun(lambda: models.budget.get_budget_summary(models.transaction, MONTH, YEAR))
+
+    assert rerun(models.budget.get_all_budgets)[0]["spent"] == pytest.approx(25.0)
+
+
+def test_generated_budgets_spent_matches_the_stored_amounts(monkeypatch):
+    from benchmarks import generate_data
+
+    monkeypatch.setattr(generate_data, "DatabaseManager", lambda: None)
+    documents, budgets = generate_data.SyntheticDataGenerator(seed=7)._user_transactions("user", 5000)
+
+    totals = {}
+    for doc in documents:
+        if doc["type"] == "Expense":
+            key = (doc["category"], doc["date"].month, doc["date"].year)
+            totals[key] = totals.get(key, 0.0) + doc["amount"]
+    for budget in budgets:
+        key = (budget["category"], budget["month"], budget["year"])
+        assert budget["spent"] == round(totals.get(key, 0.0), 2), key
@@ -0,0 +1,183 @@
+"""CategoryCache against an in-memory collection (no MongoDB needed)."""
+
+from datetime import datetime, timedelta
+import pytest
+
+pytest.importorskip("pymongo")
+
+from bson.objectid import ObjectId
+import config
+import dataset.category_cache as category_cache_module
+from dataset.category_cache import CategoryCache
+
+
+class FakeCursor(list):
+    def sort(self, key, direction):
+        return FakeCursor(sorted(self, key=lambda doc: doc[key], reverse=direction < 0))
+
+
+class FakeCollection:
+    """find({"user_id": ...}).sort(...) over a list of documents; counts the finds"""
+
+    def __init__(self):
+        self.documents = []
+        self.finds = 0
+        self.on_find = None
+
+    def insert(self, user_id, name, category_type):
+        self.documents.append({
+            "_id": ObjectId(),
+            "user_id": user_id,
+            "name": name,
+            "type": category_type,
+            "created_at": datetime(2024, 1, 1) + timedelta(seconds=len(self.documents))
+        })
+
+    def find(self, query):
+        self.finds += 1
+        result = FakeCursor(dict(doc) for doc in self.documents if doc["user_id"] == query["user_id"])
+        if self.on_find is not None:
+            self.on_find()
+        return result
+
+
+class FakeDatabaseManager:
+    def __init__(self, collection):
+        self.collection = collection
+
+    def get_collection(self, collection_name):
+        return self.collection
+
+
+class FakeRegistry:
+    def add_collector(self, collector):
+        pass
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def collection():
+    return FakeCollection()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(category_cache_module, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def cache(monkeypatch, collection, clock):
+    """A fresh CategoryCache on the fake collection, standing in for the process singleton"""
+    monkeypatch.setattr(category_cache_module, "DatabaseManager", lambda: FakeDatabaseManager(collection))
+    monkeypatch.setattr(category_cache_module, "MetricsRegistry", FakeRegistry)
+    monkeypatch.setattr(config, "CATEGORY_CACHE_TTL_SECONDS", 60)
+    cache = object.__new__(CategoryCache)
+    cache._initialize()
+    monkeypatch.setattr(CategoryCache, "_instance", cache)
+    return cache
+
+
+@pytest.fixture
+def user():
+    return ObjectId()
+
+
+def names(categories):
+    return sorted(cate["name"] for cate in categories)
+
+
+def test_invalidation_in_one_session_is_seen_by_another(cache, collection, user):
+    collection.insert(user, "Food", "Expense")
+    # each session's CategoryModel gets the process-wide instance
+    first_session, second_session = CategoryCache(), CategoryCache()
+
+    assert names(first_session.get_categories(user)) == ["Food"]
+    assert names(second_session.get_categories(user)) == ["Food"]
+    assert collection.finds == 1
+
+    # first session writes a category and invalidates
+    collection.insert(user, "Rent", "Expense")
+    first_session.invalidate(user)
+
+    assert names(second_session.get_categories(user)) == ["Food", "Rent"]
+    assert collection.finds == 2
+
+
+def test_invalidation_is_per_user(cache, collection, user):
+    other = ObjectId()
+    collection.insert(user, "Food", "Expense")
+    collection.insert(other, "Salary", "Income")
+    cache.get_categories(user)
+    cache.get_categories(other)
+
+    cache.invalidate(other)
+
+    assert names(cache.get_categories(user)) == ["Food"]
+    assert collection.finds == 2
+
+
+def test_load_discards_result_after_concurrent_invalidate(cache, collection, user):
+    collection.insert(user, "Food", "Expense")
+
+    def concurrent_write():
+        # another session writes while this load is reading
+        collection.on_find = None
+        collection.insert(user, "Rent", "Expense")
+        cache.invalidate(user)
+
+    collection.on_find = concurrent_write
+    assert names(cache.get_categories(user)) == ["Food"]
+    assert user not in cache._entries
+
+    # the stale read was not cached: the next read loads the write
+    assert names(cache.get_categories(user)) == ["Food", "Rent"]
+    assert collection.finds == 2
+    assert names(cache.get_categories(user)) == ["Food", "Rent"]
+    assert collection.finds == 2
+
+
+def test_ttl_expired_entry_is_reloaded(cache, collection, clock, user):
+    collection.insert(user, "Food", "Expense")
+    cache.get_categories(user)
+
+    # written by another process: no invalidate here
+    collection.insert(user, "Rent", "Expense")
+    clock.now += 59
+    assert names(cache.get_categories(user)) == ["Food"]
+
+    clock.now += 1
+    assert names(cache.get_categories(user)) == ["Food", "Rent"]
+    assert collection.finds == 2
+
+
+def test_has_category_rechecks_a_negative_answer_once(cache, collection, user):
+    collection.insert(user, "Food", "Expense")
+    assert cache.has_category(user, "Food", "Expense")
+    assert collection.finds == 1
+
+    # created by another process after the entry was loaded
+    collection.insert(user, "Rent", "Expense")
+    assert cache.has_category(user, "Rent", "Expense")
+    assert collection.finds == 2
+
+    # really missing: one re-check, no more
+    assert not cache.has_category(user, "Rent", "Income")
+    assert collection.finds == 3
+
+
+def test_get_categories_filters_by_type_newest_first(cache, collection, user):
+    collection.insert(user, "Food", "Expense")
+    collection.insert(user, "Salary", "Income")
+    collection.insert(user, "Rent", "Expense")
+
+    assert [cate["name"] for cate in cache.get_categories(user, "Expense")] == ["Rent", "Food"]
+    assert [cate["name"] for cate in cache.get_categories(user)] == ["Rent", "Salary", "Food"]
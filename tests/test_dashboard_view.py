@@ -0,0 +1,40 @@
+"""The dashboard renders from FinanceAnalyzer's summary (no MongoDB needed)."""
+
+import pytest
+
+pytest.importorskip("pandas")
+pytest.importorskip("streamlit")
+
+from streamlit.testing.v1 import AppTest
+
+
+def dashboard_script():
+    from datetime import datetime, timedelta
+    from analytics.analyzer import FinanceAnalyzer
+    from view.dashboard_view import render_dashboard
+
+    class FakeTransactionModel:
+        def get_transactions(self):
+            now = datetime.now()
+            return [
+                {"type": "Expense", "category": "Food", "amount": 12.5, "date": now - timedelta(days=40)},
+                {"type": "Expense", "category": "Rent", "amount": 500.0, "date": now - timedelta(days=10)},
+                {"type": "Income", "category": "Salary", "amount": 1500.0, "date": now - timedelta(days=5)},
+            ]
+
+        def get_transactions_by_date_range(self, start_date, end_date):
+            return [t for t in self.get_transactions() if start_date <= t["date"] <= end_date]
+
+    model = FakeTransactionModel()
+    render_dashboard(FinanceAnalyzer(model, use_aggregation=False), model)
+
+
+def test_dashboard_renders_the_summary_metrics():
+    app = AppTest.from_function(dashboard_script, default_timeout=30)
+    app.run()
+
+    assert not app.exception
+    metrics = {metric.label: metric.value for metric in app.metric}
+    assert metrics["💸 Total Expense"] == "$512.50"
+    assert metrics["💵 Total Income"] == "$1,500.00"
+    assert metrics["💰 Net Balance"] == "$987.50"
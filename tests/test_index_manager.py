@@ -0,0 +1,80 @@
+from datetime import datetime
+import pytest
+
+pytest.importorskip("pymongo")
+
+from pymongo import ASCENDING, IndexModel
+from dataset.index_manager import IndexManager
+
+
+SCRATCH_COLLECTION = "index_manager_test"
+
+
+def test_winning_plans_skip_rejected_plans():
+    explain = {
+        "stages": [{"$cursor": {"queryPlanner": {
+            "winningPlan": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN"}},
+            "rejectedPlans": [{"stage": "SORT", "inputStage": {"stage": "COLLSCAN"}}]
+        }}}]
+    }
+    plans = IndexManager._winning_plans(explain)
+    assert len(plans) == 1
+    assert IndexManager._bad_stages(plans) == []
+
+
+def test_options_ignore_unset_and_false():
+    assert IndexManager._options({"key": [("a", 1)], "unique": False, "v": 2}) == {}
+    assert IndexManager._options({"unique": True, "partialFilterExpression": {"a": True}}) == {
+        "unique": True, "partialFilterExpression": {"a": True}
+    }
+
+
+@pytest.fixture
+def scratch_collection(db_manager):
+    collection = db_manager.get_collection(SCRATCH_COLLECTION)
+    yield collection
+    collection.drop()
+
+
+def test_diff_detects_changed_partial_filter(scratch_collection):
+    scratch_collection.create_index([("user_id", ASCENDING), ("name", ASCENDING)], name="user_name", unique=True)
+    manager = IndexManager(specs={SCRATCH_COLLECTION: [
+        IndexModel([("user_id", ASCENDING), ("name", ASCENDING)], name="user_name", unique=True,
+                   partialFilterExpression={"name": {"$exists": True}})
+    ]})
+
+    assert manager.diff()[SCRATCH_COLLECTION]["changed"] == ["user_name"]
+    manager.apply()
+    assert manager.diff()[SCRATCH_COLLECTION] == {"missing": [], "changed": [], "unused": []}
+
+
+def test_verify_passes_with_spec_indexes(db_manager):
+    manager = IndexManager()
+    manager.apply()
+    assert manager.verify() == []
+
+
+def test_move_to_others_merges_budgets_of_the_same_month(db_manager, user_id):
+    from dataset.category_model import CategoryModel
+    from dataset.budget_model import BudgetModel
+
+    IndexManager().apply()
+    category_model = CategoryModel()
+    category_model.set_user_id(user_id)
+    category_model.upsert_category("Expense", "Others")
+    budget_model = BudgetModel(user_id)
+
+    now = datetime.now()
+    budget_model.create_budget("Food & Dining", 100.0, now.month, now.year)
+    budget_model.create_budget("Food & Dining", 40.0, 1, now.year - 1)
+    budget_model.create_budget("Others", 50.0, now.month, now.year)
+
+    success, _, counts = category_model.delete_category_with_handling("Expense", "Food & Dining", "move_to_others")
+
+    assert success
+    assert counts["budgets_moved"] == 2
+    others = budget_model.get_budgets_by_category("Others")
+    assert sorted((b["year"], b["month"], b["amount"]) for b in others) == [
+        (now.year - 1, 1, 40.0), (now.year, now.month, 150.0)
+    ]
+    assert budget_model.get_budgets_by_category("Food & Dining") == []
@@ -0,0 +1,38 @@
+"""
+Per-page query budgets (benchmarks/query_budget.py PAGE_BUDGETS): the warm
+render of every page stays within its command and document counts, as
+recorded by the QueryMetrics command listener.
+"""
+
+import pytest
+
+pytest.importorskip("pymongo")
+pytest.importorskip("streamlit")
+
+from benchmarks.query_budget import PAGE_BUDGETS, PAGE_CALLS, measure_page, remove_user, seed_user
+
+
+# the size PAGE_BUDGETS is written for
+SEEDED_SIZE = 2000
+RENDER_TIMEOUT = 60
+
+
+@pytest.fixture(scope="module")
+def seeded_user(db_manager):
+    user_id = seed_user(SEEDED_SIZE)
+    yield user_id
+    remove_user(user_id)
+
+
+def test_every_page_has_a_budget():
+    assert PAGE_BUDGETS.keys() == PAGE_CALLS.keys()
+
+
+@pytest.mark.parametrize("page", list(PAGE_CALLS))
+def test_page_within_query_budget(seeded_user, page):
+    measured = measure_page(page, seeded_user, RENDER_TIMEOUT)
+
+    assert "error" not in measured, measured.get("error")
+    budget = PAGE_BUDGETS[page]
+    assert measured["commands"] <= budget["commands"], f"{page}: {measured['commands']} commands"
+    assert measured["docs"] <= budget["docs"], f"{page}: {measured['docs']} documents"
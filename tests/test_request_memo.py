@@ -0,0 +1,86 @@
+"""data_version bumps of request_memo.invalidates_reads / bump_data_version (no MongoDB needed)."""
+
+import pytest
+
+pytest.importorskip("pymongo")
+
+import config
+import dataset.request_memo as request_memo
+from dataset.request_memo import bump_data_version, invalidates_reads
+
+
+class FakeReadCache:
+    bumps = []
+
+    def bump(self, user_id=None):
+        FakeReadCache.bumps.append(user_id)
+
+
+@pytest.fixture
+def bumps(monkeypatch):
+    monkeypatch.setattr(config, "READ_CACHE_ENABLED", True)
+    monkeypatch.setattr(request_memo, "ReadCache", FakeReadCache)
+    FakeReadCache.bumps = []
+    return FakeReadCache.bumps
+
+
+class Model:
+    def __init__(self, user_id):
+        self.user_id = user_id
+
+    @invalidates_reads
+    def upsert(self):
+        pass
+
+    @invalidates_reads
+    def delete_with_handling(self):
+        self.upsert()
+        self.upsert()
+        bump_data_version(self.user_id)
+
+    @invalidates_reads
+    def failing(self):
+        self.upsert()
+        raise ValueError("write failed")
+
+    @invalidates_reads
+    def reconcile(self, all_users: bool = False):
+        self.upsert()
+
+
+def test_single_write_bumps_its_user(bumps):
+    Model("a").upsert()
+    assert bumps == [["a"]]
+
+
+def test_nested_writes_bump_once_at_the_outermost_frame(bumps):
+    Model("a").delete_with_handling()
+    assert bumps == [["a"]]
+
+
+def test_failed_write_still_bumps_once(bumps):
+    with pytest.raises(ValueError):
+        Model("a").failing()
+    assert bumps == [["a"]]
+
+    Model("b").upsert()
+    assert bumps == [["a"], ["b"]]
+
+
+def test_all_users_write_bumps_everyone_once(bumps):
+    Model("a").reconcile(all_users=True)
+    assert bumps == [None]
+
+
+def test_bump_outside_a_write_is_immediate(bumps):
+    bump_data_version("a")
+    bump_data_version(["c", "b"])
+    bump_data_version()
+    assert bumps == [["a"], ["b", "c"], None]
+
+
+def test_disabled_read_cache_does_not_bump(bumps, monkeypatch):
+    monkeypatch.setattr(config, "READ_CACHE_ENABLED", False)
+    Model("a").delete_with_handling()
+    bump_data_version("a")
+    assert bumps == []
@@ -0,0 +1,76 @@
+"""MonthlyRollupModel: rebuilds replace buckets in place and drop the stale ones."""
+
+from datetime import datetime
+import pytest
+
+pytest.importorskip("pymongo")
+
+from bson.objectid import ObjectId
+import config
+from dataset.category_model import CategoryModel
+from dataset.rollup_model import MonthlyRollupModel
+
+
+START, END = datetime(2024, 1, 1), datetime(2024, 12, 31)
+
+
+def buckets(rollups, user_id) -> dict:
+    return {
+        (doc["category"], doc["month"]): doc["sum"]
+        for doc in rollups.collection.find({"user_id": ObjectId(user_id)})
+    }
+
+
+def expense_total(rollups, user_id) -> float:
+    return sum(row["amount"] for row in rollups.get_monthly_totals(user_id, START, END, "Expense"))
+
+
+def test_move_to_others_after_initial_rebuild_counts_spending_once(user_id, insert_transactions):
+    insert_transactions(user_id, [
+        ("Expense", "Food & Dining", 10.0, datetime(2024, 3, 5)),
+        ("Expense", "Food & Dining", 15.0, datetime(2024, 4, 5)),
+        ("Expense", "Others", 7.0, datetime(2024, 3, 9)),
+    ])
+    rollups = MonthlyRollupModel()
+    rollups.rebuild(user_id=user_id)  # a second rebuild within the same second
+
+    category_model = CategoryModel()
+    category_model.set_user_id(user_id)
+    success, _, _ = category_model.delete_category_with_handling("Expense", "Food & Dining", "move_to_others")
+
+    assert success
+    assert buckets(rollups, user_id) == {("Others", 3): 17.0, ("Others", 4): 15.0}
+    assert expense_total(rollups, user_id) == pytest.approx(32.0)
+
+
+def test_rebuild_drops_buckets_whose_transactions_are_gone(db_manager, user_id, insert_transactions):
+    documents = insert_transactions(user_id, [
+        ("Expense", "Food & Dining", 10.0, datetime(2024, 3, 5)),
+        ("Expense", "Transportation", 4.0, datetime(2024, 5, 1)),
+    ])
+    # deleted behind the models' back (no incremental rollup update)
+    db_manager.get_collection(config.COLLECTIONS["transaction"]).delete_one({"_id": documents[1]["_id"]})
+
+    rollups = MonthlyRollupModel()
+    rollups.rebuild(user_id=user_id)
+
+    assert buckets(rollups, user_id) == {("Food & Dining", 3): 10.0}
+    assert rollups.collection.count_documents({"user_id": ObjectId(user_id), "rebuild_id": {"$exists": True}}) == 0
+
+
+def test_incremental_write_during_rebuild_keeps_its_bucket(user_id, insert_transactions, monkeypatch):
+    insert_transactions(user_id, [("Expense", "Food & Dining", 10.0, datetime(2024, 3, 5))])
+    rollups = MonthlyRollupModel()
+    bucket = {"user_id": ObjectId(user_id), "year": 2024, "month": 6, "type": "Expense", "category": "Health"}
+
+    # a bucket created by a write that lands between the tagging and the $merge
+    original = rollups.transaction_collection.aggregate
+
+    def aggregate_after_write(pipeline, *args, **kwargs):
+        rollups.apply_change(None, {**bucket, "amount": 3.0, "date": datetime(2024, 6, 2)})
+        return original(pipeline, *args, **kwargs)
+
+    monkeypatch.setattr(rollups.transaction_collection, "aggregate", aggregate_after_write, raising=False)
+    rollups.rebuild(user_id=user_id)
+
+    assert buckets(rollups, user_id) == {("Food & Dining", 3): 10.0, ("Health", 6): 3.0}
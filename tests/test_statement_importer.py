@@ -0,0 +1,77 @@
+"""StatementImporter parsing and fingerprints (no MongoDB needed)."""
+
+import io
+from datetime import datetime
+
+from dataset.statement_importer import StatementImporter, iter_csv_rows
+
+
+class FakeTransactionModel:
+    user_id = "user"
+
+    def __init__(self):
+        self.inserted = []
+
+    def add_transactions_bulk(self, transactions, chunk_size=None):
+        results = []
+        for transaction in transactions:
+            duplicate = any(t["fingerprint"] == transaction["fingerprint"] for t in self.inserted)
+            if not duplicate:
+                self.inserted.append(transaction)
+            results.append({"success": not duplicate, "duplicate": duplicate, "error": None})
+        return results
+
+
+class FakeCategoryModel:
+    def upsert_category(self, category_type, category_name):
+        pass
+
+
+def import_csv(text, model=None):
+    model = model or FakeTransactionModel()
+    summary = StatementImporter(model, FakeCategoryModel()).import_stream(io.StringIO(text), "csv")
+    return summary, model
+
+
+def test_rows_with_extra_fields_and_unmapped_columns():
+    # no debit/category/type columns; line 3 has more fields than the header
+    rows = list(iter_csv_rows(io.StringIO(
+        "Date,Amount,Memo\n"
+        "2024-03-01,-12.50,Coffee\n"
+        "2024-03-02,40,Refund,unexpected,fields\n"
+        "2024-03-03\n"
+    )))
+
+    assert [row.get("amount") for row in rows[:2]] == [-12.5, 40.0]
+    assert rows[1]["description"] == "Refund"
+    assert rows[1]["category"] is None and rows[1]["type"] is None
+    assert rows[2] == {"line": 4, "error": "Missing amount"}
+
+
+def test_identical_rows_of_a_day_stay_distinct_and_reimport_is_deduplicated():
+    statement = (
+        "Date,Amount,Description\n"
+        "2024-03-01,-3.00,Coffee\n"
+        "2024-03-01,-3.00,Coffee\n"
+        "2024-03-02,-3.00,Coffee\n"
+    )
+    summary, model = import_csv(statement)
+    assert (summary["imported"], summary["duplicates"]) == (3, 0)
+    assert [t["date"] for t in model.inserted] == [datetime(2024, 3, 1), datetime(2024, 3, 1), datetime(2024, 3, 2)]
+
+    summary, _ = import_csv(statement, model)
+    assert (summary["imported"], summary["duplicates"]) == (0, 3)
+
+
+def test_identical_rows_interleaved_with_other_dates_are_all_imported():
+    statement = (
+        "Date,Amount,Description\n"
+        "2024-03-01,-3.00,Coffee\n"
+        "2024-03-02,-9.00,Lunch\n"
+        "2024-03-01,-3.00,Coffee\n"
+    )
+    summary, model = import_csv(statement)
+    assert (summary["imported"], summary["duplicates"]) == (3, 0)
+
+    summary, _ = import_csv(statement, model)
+    assert (summary["imported"], summary["duplicates"]) == (0, 3)
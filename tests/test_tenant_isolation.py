@@ -0,0 +1,145 @@
+"""
+Tenant isolation of the model layer: a session's ModelContext only ever
+returns its own user's data, including reads served by the per-rerun memo
+(request_memo) and the cross-rerun ReadCache.
+"""
+
+import threading
+from datetime import datetime
+import pytest
+
+pytest.importorskip("pymongo")
+
+import config
+from dataset import request_memo
+from dataset.model_context import ModelContext
+from benchmarks.tenant_isolation import check_session
+
+
+MONTH, YEAR = 3, 2024
+
+
+@pytest.fixture
+def read_cache_enabled(monkeypatch):
+    monkeypatch.setattr(config, "READ_CACHE_ENABLED", True)
+
+
+def seed(user_id: str, transactions: int) -> ModelContext:
+    """`transactions` expenses and one budget, written through the models"""
+    models = ModelContext(user_id)
+    for day in range(1, transactions + 1):
+        models.transaction.add_transaction("Expense", "Food & Dining", float(day), datetime(YEAR, MONTH, day))
+    models.budget.create_budget("Food & Dining", 100.0 * transactions, MONTH, YEAR)
+    return models
+
+
+def reads(models: ModelContext) -> dict:
+    """The memoized reads a page rerun issues, with identical arguments for every user"""
+    return {
+        "transactions": models.transaction.get_transactions(),
+        "page": models.transaction.get_transactions_page(limit=20)["transactions"],
+        "statistics": models.transaction.get_statistics(),
+        "snapshot": models.transaction.get_dashboard_snapshot(),
+        "budgets": models.budget.get_all_budgets(),
+        "summary": models.budget.get_budget_summary(models.transaction, MONTH, YEAR),
+    }
+
+
+def assert_owned_by(result: dict, user_id: str, transactions: int):
+    for name in ("transactions", "page", "budgets"):
+        assert {str(doc["user_id"]) for doc in result[name]} == {user_id}, name
+    assert len(result["transactions"]) == transactions
+    assert result["statistics"]["total_transactions"] == transactions
+    assert result["snapshot"]["statistics"]["total_transactions"] == transactions
+    assert {str(doc["user_id"]) for doc in result["snapshot"]["recent_transactions"]} == {user_id}
+    assert [row["budget_amount"] for row in result["summary"]] == [100.0 * transactions]
+
+
+def test_second_user_never_gets_first_users_reads(make_user, read_cache_enabled):
+    first, second = make_user(), make_user()
+    first_models, second_models = seed(first, 3), seed(second, 5)
+
+    # first session's rerun fills the run memo and the ReadCache
+    request_memo.start_run()
+    try:
+        assert_owned_by(reads(first_models), first, 3)
+        assert_owned_by(reads(first_models), first, 3)  # memo hits
+    finally:
+        first_stats = request_memo.finish_run()
+    assert first_stats["hits"] > 0
+
+    # second session: same methods and arguments, other user
+    request_memo.start_run()
+    try:
+        assert_owned_by(reads(second_models), second, 5)
+        # both users in one run: the memo is keyed by user too
+        assert_owned_by(reads(first_models), first, 3)
+    finally:
+        stats = request_memo.finish_run()
+    assert stats["cache_hits"] > 0  # the first user's reads came back from the ReadCache
+
+    # next rerun of the first session: served from the ReadCache, still its own data
+    request_memo.start_run()
+    try:
+        assert_owned_by(reads(first_models), first, 3)
+    finally:
+        request_memo.finish_run()
+
+
+def cached_reads(models: ModelContext, user_id: str, transactions: int) -> int:
+    """Run one rerun of reads, check ownership, return how many the ReadCache served"""
+    request_memo.start_run()
+    try:
+        assert_owned_by(reads(models), user_id, transactions)
+    finally:
+        stats = request_memo.finish_run()
+    return stats["cache_hits"]
+
+
+def test_write_by_one_user_keeps_the_other_users_cache(make_user, read_cache_enabled):
+    first, second = make_user(), make_user()
+    first_models, second_models = seed(first, 2), seed(second, 4)
+    cached_reads(first_models, first, 2)
+    cached_reads(second_models, second, 4)
+
+    first_models.transaction.add_transaction("Expense", "Food & Dining", 1.0, datetime(YEAR, MONTH, 20))
+
+    # the write bumped only the first user's data_version
+    assert cached_reads(first_models, first, 3) == 0
+    assert cached_reads(second_models, second, 4) == len(reads(second_models))
+
+
+def test_parallel_sessions_read_only_their_own_data(make_user, read_cache_enabled):
+    users = {}
+    for i in range(6):
+        user_id = make_user()
+        seed(user_id, 2 + i)
+        users[user_id] = 2 + i
+
+    rounds = 10
+    barrier = threading.Barrier(len(users))
+    found, errors = [], []
+
+    def session(user_id: str, expected: int):
+        try:
+            context = ModelContext(user_id)
+            barrier.wait()
+            for _ in range(rounds):
+                # one Streamlit rerun: memo open, reads, memo closed
+                request_memo.start_run()
+                try:
+                    found.extend((user_id, leak) for leak in check_session(context, user_id, expected))
+                    assert_owned_by(reads(context), user_id, expected)
+                finally:
+                    request_memo.finish_run()
+        except Exception as e:
+            errors.append((user_id, repr(e)))
+
+    threads = [threading.Thread(target=session, args=item) for item in users.items()]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert found == []
+    assert errors == []
@@ -51,11 +51,6 @@ def display_metric_card(title, value, delta=None, delta_color="normal"):
         delta_color=delta_color
     )
 
-@st.cache_data(ttl=300)  # Cache for 5 minutes
-def cached_data_fetch(func, *args, **kwargs):
-    """Cache data fetching functions"""
-    return func(*args, **kwargs)
-
 
 def handler_datetime(date_: Union[datetime, date, str]) -> datetime:
     """Convert various date formats to datetime object"""
@@ -0,0 +1,100 @@
+import json
+import streamlit as st
+import pandas as pd
+from datetime import datetime
+from dataset.database_manager import DatabaseManager
+from dataset.category_cache import CategoryCache
+from dataset.read_cache import ReadCache
+from language_manager import t
+from metrics import track_render
+
+
+def collect_metrics() -> dict:
+    """All in-process monitoring data (query shapes, pools, caches) as one dict"""
+    db_manager = DatabaseManager()
+    metrics = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "queries": db_manager.get_query_stats(),
+        "pool": {"sync": db_manager.get_pool_stats()},
+        "category_cache": CategoryCache().stats(),
+        "read_cache": ReadCache().stats()
+    }
+    return metrics
+
+
+def _render_pool(name: str, pool: dict):
+    st.markdown(f"**{name}**")
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric(t('connections_in_use'), pool['in_use'], delta=f"max {pool['in_use_max']}", delta_color="off")
+    col2.metric(t('open_connections'), pool['open_connections'])
+    col3.metric(t('checkout_wait_p95'), f"{pool['wait_ms']['p95']:.1f} ms",
+                delta=f"max {pool['wait_ms']['max']:.1f} ms", delta_color="off")
+    col4.metric(t('checkout_failures'), sum(pool['checkout_failures'].values()))
+    if pool['checkout_failures']:
+        st.caption(", ".join(f"{reason}: {count}" for reason, count in pool['checkout_failures'].items()))
+
+
+@track_render("admin")
+def render_admin():
+    """Render the monitoring page: query latency by shape, slow queries, pools, caches"""
+    st.title(t('admin_title'))
+
+    metrics = collect_metrics()
+    queries = metrics['queries']
+
+    col_export, col_reset, col_spacer = st.columns([1, 1, 3])
+    with col_export:
+        st.download_button(
+            f"⬇️ {t('export_json')}",
+            data=json.dumps(metrics, indent=2, default=str),
+            file_name=f"metrics_{datetime.now():%Y%m%d_%H%M%S}.json",
+            mime="application/json",
+            key="admin_export_metrics"
+        )
+    with col_reset:
+        if st.button(f"🔄 {t('reset_metrics')}", key="admin_reset_metrics"):
+            DatabaseManager().query_metrics.reset()
+            st.rerun()
+
+    # Query shapes
+    st.subheader(t('query_shapes'))
+    if queries['shapes']:
+        shapes = pd.DataFrame(queries['shapes'])
+        st.dataframe(
+            shapes[['collection', 'shape', 'count', 'errors', 'p50_ms', 'p95_ms', 'p99_ms',
+                    'max_ms', 'avg_ms', 'docs', 'bytes']],
+            width='stretch',
+            hide_index=True
+        )
+    else:
+        st.info(t('no_data'))
+
+    # Slow queries
+    st.subheader(f"{t('slow_queries')} (≥ {queries['slow_threshold_ms']:g} ms)")
+    if queries['slow_queries']:
+        st.dataframe(pd.DataFrame(queries['slow_queries']), width='stretch', hide_index=True)
+    else:
+        st.info(t('no_data'))
+
+    # Connection pools
+    st.subheader(t('pool_stats'))
+    for name, pool in metrics['pool'].items():
+        _render_pool(name, pool)
+
+    # Category cache
+    st.subheader(t('cache_stats'))
+    cache = metrics['category_cache']
+    col1, col2, col3 = st.columns(3)
+    col1.metric(t('hit_ratio'), f"{cache['hit_ratio']:.1%}")
+    col2.metric(t('hits_misses'), f"{cache['hits']} / {cache['misses']}")
+    col3.metric(t('invalidations'), cache['invalidations'])
+
+    # Read cache
+    st.subheader(t('read_cache_stats'))
+    cache = metrics['read_cache']
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric(t('hit_ratio'), f"{cache['hit_ratio']:.1%}")
+    col2.metric(t('hits_misses'), f"{cache['hits']} / {cache['misses']}")
+    col3.metric(t('evictions'), cache['evictions'])
+    col4.metric(t('cache_memory'), f"{cache['bytes'] / 2**20:.1f} MB",
+                delta=f"max {cache['max_bytes'] / 2**20:.0f} MB", delta_color="off")
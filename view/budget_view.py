@@ -4,6 +4,7 @@ from dataset.transaction_model import TransactionModel
 from dataset.category_model import CategoryModel
 from analytics.visualizer import FinanceVisualizer
 from language_manager import t
+from metrics import track_render
 
 
 def _get_status_color(status: str) -> tuple:
@@ -351,6 +352,7 @@ def _render_budget_visualization(budget_model: BudgetModel, transaction_model: T
                 st.plotly_chart(fig, width='stretch')
 
 
+@track_render("budgets")
 def render_budgets(budget_model: BudgetModel, transaction_model: TransactionModel, category_model: CategoryModel):
     """Main render function for budget management page"""
     
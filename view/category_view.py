@@ -1,6 +1,7 @@
 import streamlit as st
 import config
 from language_manager import t
+from metrics import track_render
 
 # function to render category list
 def _render_category_list(category_model, category_type: str):
@@ -262,6 +263,7 @@ def _render_add_category(category_model):
 
 
 # public function
+@track_render("categories")
 def render_categories(category_model):
     # Modern header
     st.markdown("""
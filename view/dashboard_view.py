@@ -1,8 +1,10 @@
 import streamlit as st
 from analytics.analyzer import FinanceAnalyzer
 from dataset.transaction_model import TransactionModel
+from metrics import track_render
 
 
+@track_render("dashboard")
 def render_dashboard(analyzer_model: FinanceAnalyzer, transaction_model: TransactionModel):
     """Render dashboard with analytics"""
     st.title("📊 Dashboard")
@@ -28,7 +30,7 @@ def render_dashboard(analyzer_model: FinanceAnalyzer, transaction_model: Transac
     with col2:
         st.metric(
             label="💸 Total Expense",
-            value=f"${stats['total_expense']:,.2f}",
+            value=f"${stats['total_expenses']:,.2f}",
             delta=f"{stats['expense_count']} transactions"
         )
     
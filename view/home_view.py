@@ -3,7 +3,9 @@ import pandas as pd
 from datetime import datetime, timedelta
 from analytics.visualizer import FinanceVisualizer
 from language_manager import t
+from metrics import track_render
 
+@track_render("home")
 def render_home(transaction_model, category_model):
     """Render home page with dashboard"""
     
@@ -38,8 +40,10 @@ def render_home(transaction_model, category_model):
         </div>
     """, unsafe_allow_html=True)
     
-    # Get statistics
-    stats = transaction_model.get_statistics()
+    # Get all dashboard data in a single round trip ($facet)
+    snapshot = transaction_model.get_dashboard_snapshot(recent_limit=10)
+    stats = snapshot['statistics']
+    category_summary = pd.DataFrame(snapshot['category_totals'])
     
     # Display key metrics with modern styling
     st.markdown("""
@@ -123,7 +127,7 @@ def render_home(transaction_model, category_model):
             </div>
         """, unsafe_allow_html=True)
         
-        recent_trans = transaction_model.get_all_transactions()[:10]
+        recent_trans = snapshot['recent_transactions']
         
         if recent_trans:
             for trans in recent_trans:
@@ -190,16 +194,9 @@ def render_home(transaction_model, category_model):
             </div>
         """, unsafe_allow_html=True)
         
-        # Get all transactions
-        all_trans = transaction_model.get_all_transactions()
-        
-        if all_trans:
-            # Create dataframe for analysis
-            df = pd.DataFrame(all_trans)
-            
-            # Group by category and sum amounts
-            if 'category' in df.columns and 'amount' in df.columns:
-                category_summary = df.groupby(['type', 'category'])['amount'].sum().reset_index()
+        if not category_summary.empty:
+            # Amounts are already grouped by type + category on the server
+            if 'category' in category_summary.columns and 'amount' in category_summary.columns:
                 
                 # Display Expense categories
                 st.markdown("""
@@ -256,7 +253,7 @@ def render_home(transaction_model, category_model):
     st.markdown("<br><br>", unsafe_allow_html=True)
     
     # Charts Section
-    if all_trans:
+    if not category_summary.empty:
         st.markdown("""
             <div style='background: white; padding: 1.5rem; border-radius: 15px; 
                         box-shadow: 0 2px 8px rgba(0,0,0,0.08); margin-bottom: 2rem;'>
@@ -272,9 +269,9 @@ def render_home(transaction_model, category_model):
         
         with chart_col1:
             # Expense Pie Chart
-            expense_df = df[df['type'] == 'Expense']
+            expense_df = category_summary[category_summary['type'] == 'Expense']
             if not expense_df.empty:
-                expense_summary = expense_df.groupby('category')['amount'].sum().reset_index()
+                expense_summary = expense_df[['category', 'amount']].copy()
                 expense_summary.columns = ['Category', 'Total']
                 expense_summary = expense_summary.sort_values('Total', ascending=False)
                 
@@ -286,9 +283,9 @@ def render_home(transaction_model, category_model):
         
         with chart_col2:
             # Income Donut Chart
-            income_df = df[df['type'] == 'Income']
+            income_df = category_summary[category_summary['type'] == 'Income']
             if not income_df.empty:
-                income_summary = income_df.groupby('category')['amount'].sum().reset_index()
+                income_summary = income_df[['category', 'amount']].copy()
                 income_summary.columns = ['Category', 'Total']
                 income_summary = income_summary.sort_values('Total', ascending=False)
                 
@@ -306,9 +303,8 @@ def render_home(transaction_model, category_model):
         with chart_col3:
             # Category Spending Bar Chart
             if not expense_df.empty:
-                expense_summary = expense_df.groupby('category')['amount'].sum().reset_index()
-                expense_summary.columns = ['Category', 'Total']
-                expense_summary['Count'] = expense_df.groupby('category').size().values
+                expense_summary = expense_df[['category', 'amount', 'count']].copy()
+                expense_summary.columns = ['Category', 'Total', 'Count']
                 expense_summary['Average'] = expense_summary['Total'] / expense_summary['Count']
                 
                 fig = visualizer.plot_category_spending(expense_summary)
@@ -318,8 +314,8 @@ def render_home(transaction_model, category_model):
         with chart_col4:
             # Income vs Expense Comparison
             if not expense_df.empty or not income_df.empty:
-                total_expense = expense_df['amount'].sum() if not expense_df.empty else 0
-                total_income = income_df['amount'].sum() if not income_df.empty else 0
+                total_expense = stats['total_expense']
+                total_income = stats['total_income']
                 
                 fig = visualizer.plot_comparison_bar(total_income, total_expense)
                 if fig:
@@ -330,16 +326,13 @@ def render_home(transaction_model, category_model):
         # Row 3: Trend Line Chart
         st.subheader("📊 Xu Hướng Thu Chi Theo Thời Gian")
         
-        # Convert date to datetime if needed
-        if 'date' in df.columns:
-            df['transaction_date'] = pd.to_datetime(df['date'])
+        # Monthly totals are already bucketed by $dateTrunc on the server
+        monthly_df = pd.DataFrame(snapshot['monthly_totals'])
+        if not monthly_df.empty:
+            monthly_df['month'] = pd.to_datetime(monthly_df['month'])
+            monthly_data = monthly_df.groupby(['month', 'type'])['amount'].sum().unstack(fill_value=0)
         else:
-            df['transaction_date'] = pd.to_datetime(df.get('transaction_date', df.index))
-        
-        # Group by month for better visualization
-        df['month'] = df['transaction_date'].dt.to_period('M')
-        monthly_data = df.groupby(['month', 'type'])['amount'].sum().unstack(fill_value=0)
-        monthly_data.index = monthly_data.index.to_timestamp()
+            monthly_data = pd.DataFrame()
         
         if not monthly_data.empty:
             fig = visualizer.plot_monthly_trend(monthly_data)
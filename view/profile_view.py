@@ -0,0 +1,29 @@
+import streamlit as st
+import pandas as pd
+from language_manager import t
+
+
+def render_profile_overlay(summary: dict, memo_stats: dict = None):
+    """Collapsible per-rerun breakdown produced by profiler.finish_rerun() (+ request_memo.finish_run())"""
+    with st.expander(f"⏱️ {t('render_profile')}: {summary['page']} — {summary['wall_ms']:,.0f} ms"):
+        col1, col2, col3, col4, col5 = st.columns(5)
+        col1.metric("MongoDB", f"{summary['db_ms']:,.0f} ms")
+        col2.metric("pandas", f"{summary['pandas_ms']:,.0f} ms")
+        col3.metric("Plotly", f"{summary['plotly_ms']:,.0f} ms")
+        col4.metric(t('profile_other'), f"{summary['other_ms']:,.0f} ms")
+        col5.metric(t('profile_wall'), f"{summary['wall_ms']:,.0f} ms")
+
+        st.caption(
+            f"{summary['queries']} {t('profile_queries')} · {summary['rows']:,} {t('profile_rows')} · "
+            f"{summary['figures']} {t('profile_figures')}"
+            + (f" · {memo_stats['hits']} {t('profile_memo_hits')} · "
+               f"{memo_stats['cache_hits']} {t('profile_cache_hits')}" if memo_stats else "")
+        )
+
+        if summary['calls']:
+            calls = pd.DataFrame(summary['calls'])
+            calls['total_ms'] = calls['total_ms'].round(1)
+            st.dataframe(calls, width='stretch', hide_index=True)
+
+        if summary['dump_path']:
+            st.caption(f"📄 {summary['dump_path']}")
@@ -1,8 +1,14 @@
 import streamlit as st
 import config
+import io
+import os
+import tempfile
 from datetime import date
 import time
 from language_manager import t
+from metrics import track_render
+from dataset.statement_importer import StatementImporter
+from dataset.transaction_exporter import TransactionExporter, EXPORT_FORMATS, parquet_available
 
 def _render_add_transaction(transaction_model, category_model):
     st.markdown(f"""
@@ -116,6 +122,65 @@ def _render_add_transaction(transaction_model, category_model):
                         st.error(f"❌ {t('error')}: {str(e)}")
 
 
+def _render_import_statement(transaction_model, category_model):
+    with st.expander(t('import_statement')):
+        uploaded = st.file_uploader(t('statement_file'), type=["csv", "ofx", "qfx"], key="statement_upload")
+        date_format = st.text_input(t('date_format_hint'), key="statement_date_format")
+
+        if uploaded is None or not st.button(t('import_button'), key="statement_import"):
+            return
+
+        importer = StatementImporter(transaction_model, category_model, date_format=date_format or None)
+        file_format = os.path.splitext(uploaded.name)[1].lstrip(".").lower()
+
+        try:
+            # stream the upload instead of decoding the whole file at once
+            stream = io.TextIOWrapper(uploaded, encoding="utf-8-sig", errors="replace", newline="")
+            summary = importer.import_stream(stream, file_format)
+        except ValueError as e:
+            st.error(f"❌ {e}")
+            return
+
+        st.success("✅ " + t('import_result').format(**summary))
+        if summary['errors']:
+            st.warning(t('import_errors'))
+            st.dataframe(summary['errors'], width='stretch')
+
+
+def _render_export(transaction_model):
+    with st.expander(t('export_transactions')):
+        formats = [fmt for fmt in EXPORT_FORMATS if fmt != "parquet" or parquet_available()]
+        file_format = st.radio(t('export_format'), formats, horizontal=True, key="export_format")
+
+        if not st.button(t('prepare_export'), key="export_prepare"):
+            return
+
+        # Same filter as the transaction list
+        filter_type = st.session_state.get('transaction_page_filter', 'all')
+        advanced_filters = None if filter_type == 'all' else {"transaction_type": filter_type}
+
+        # Stream to a temp file on disk; only one batch is held by the exporter
+        exporter = TransactionExporter(transaction_model)
+        with tempfile.TemporaryFile() as export_file:
+            if file_format == "csv":
+                stream = io.TextIOWrapper(export_file, encoding="utf-8", newline="")
+                count = exporter.write_csv(stream, advanced_filters)
+                stream.flush()
+                stream.detach()
+            else:
+                count = exporter.write_parquet(export_file, advanced_filters)
+            export_file.seek(0)
+
+            # download_button reads the file here, so it can be closed right after
+            st.download_button(
+                f"⬇️ {t('download')} ({count:,} {t('transactions_label')})",
+                data=export_file,
+                file_name=f"transactions_{date.today().isoformat()}.{file_format}",
+                mime="text/csv" if file_format == "csv" else "application/octet-stream",
+                key="export_download"
+            )
+
+
 def _render_transaction_list(transaction_model):
     st.markdown(f"""
         <div style='background: white; padding: 1.5rem; border-radius: 15px; 
@@ -142,11 +207,27 @@ def _render_transaction_list(transaction_model):
         )
         filter_type = filter_values[filter_index]
     
-    # Get transactions based on filter
-    if filter_type == 'all':
-        transactions = transaction_model.get_all_transactions()
-    else:
-        transactions = transaction_model.get_transactions_by_type(filter_type)
+    # Reset paging when the filter changes
+    if st.session_state.get('transaction_page_filter') != filter_type:
+        st.session_state['transaction_page_filter'] = filter_type
+        st.session_state['transaction_page_cursors'] = [None]
+    
+    # Stack of continuation tokens, one per visited page
+    page_cursors = st.session_state['transaction_page_cursors']
+    
+    # Get one page of transactions based on filter
+    advanced_filters = None if filter_type == 'all' else {"transaction_type": filter_type}
+    page = transaction_model.get_transactions_page(
+        advanced_filters,
+        after=page_cursors[-1],
+        limit=config.TRANSACTIONS_PAGE_SIZE
+    )
+    transactions = page['transactions']
+    
+    # Page became empty (e.g. last item deleted) -> go back one page
+    if not transactions and len(page_cursors) > 1:
+        page_cursors.pop()
+        st.rerun()
     
     if not transactions:
         st.markdown(f"""
@@ -158,7 +239,7 @@ def _render_transaction_list(transaction_model):
         """, unsafe_allow_html=True)
         return
     
-    st.markdown(f"**{t('total')}:** {len(transactions)} {t('transactions_label')}")
+    st.markdown(f"**{t('page')} {len(page_cursors)}:** {len(transactions)} {t('transactions_label')}")
     st.markdown("<br>", unsafe_allow_html=True)
     
     # Display transactions in a nice format
@@ -227,8 +308,24 @@ def _render_transaction_list(transaction_model):
                     </div>
                 </div>
             """, unsafe_allow_html=True)
+    
+    # Pagination controls
+    col_prev, col_spacer, col_next = st.columns([1, 3, 1])
+    
+    with col_prev:
+        if len(page_cursors) > 1:
+            if st.button(t('previous_page'), key="transactions_prev_page", width='stretch'):
+                page_cursors.pop()
+                st.rerun()
+    
+    with col_next:
+        if page['next_cursor']:
+            if st.button(t('next_page'), key="transactions_next_page", width='stretch'):
+                page_cursors.append(page['next_cursor'])
+                st.rerun()
 
 
+@track_render("transactions")
 def render_transactions(transaction_model, category_model):
     # Modern header
     st.markdown("""
@@ -264,7 +361,13 @@ def render_transactions(transaction_model, category_model):
     # Add transaction form
     _render_add_transaction(transaction_model, category_model)
     
+    # Import bank statement
+    _render_import_statement(transaction_model, category_model)
+    
     st.markdown("---")
     
     # Display transaction list
-    _render_transaction_list(transaction_model)
\ No newline at end of file
+    _render_transaction_list(transaction_model)
+    
+    # Export transaction history
+    _render_export(transaction_model)
\ No newline at end of file
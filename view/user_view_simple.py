@@ -6,8 +6,10 @@ from dataset.user_model import UserModel
 import streamlit as st
 import time
 from language_manager import t
+from metrics import track_render
 
 
+@track_render("user_profile")
 def render_user_profile(user_model: UserModel, user: dict):
     """
     Render user profile using Streamlit native components (simplified)
@@ -100,19 +102,7 @@ def _render_user_settings_simple(user_model, user_id: str):
         """)
         
         # Count user data for stats
-        from dataset.transaction_model import TransactionModel
-        from dataset.budget_model import BudgetModel
-        from dataset.category_model import CategoryModel
-        
-        trans_model = TransactionModel()
-        budget_model = BudgetModel()
-        category_model = CategoryModel()
-        
-        user_oid = ObjectId(user_id)
-        
-        trans_count = trans_model.collection.count_documents({"user_id": user_oid})
-        budget_count = budget_model.collection.count_documents({"user_id": user_oid})
-        category_count = category_model.collection.count_documents({"user_id": user_oid})
+        trans_count, budget_count, category_count = user_model.get_data_counts(user_id)
         
         # Activity statistics
         st.markdown("### 📊 Thống Kê Hoạt Động")
@@ -143,20 +133,7 @@ def _render_user_settings_simple(user_model, user_id: str):
                 st.rerun()
         else:
             # Count user data
-            from dataset.transaction_model import TransactionModel
-            from dataset.budget_model import BudgetModel
-            from dataset.category_model import CategoryModel
-            from bson.objectid import ObjectId
-            
-            trans_model = TransactionModel()
-            budget_model = BudgetModel()
-            category_model = CategoryModel()
-            
-            user_oid = ObjectId(user_id)
-            
-            trans_count = trans_model.collection.count_documents({"user_id": user_oid})
-            budget_count = budget_model.collection.count_documents({"user_id": user_oid})
-            category_count = category_model.collection.count_documents({"user_id": user_oid})
+            trans_count, budget_count, category_count = user_model.get_data_counts(user_id)
             total_items = trans_count + budget_count + category_count + 1
             
             st.error(f"""